@@ -3,28 +3,168 @@ Backend API pour Lille Addict Bot
 FastAPI + Ollama + MCP
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, JSONResponse
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator
+from contextlib import asynccontextmanager
+import asyncio
 import uuid
+import json
 import logging
+import os
+import time
 
-from services.ollama_client import OllamaClient
+from services.ollama_client import OllamaClient, ModelNotLoadedError
 from services.mcp_client import MCPClient
+from services.tool_executor import ToolExecutor
+from services.health import HealthMonitor, DegradedError
+from services.conversation_store import create_conversation_store
+from services.answer_cache import AnswerCache, ToolDataVersions
+from services.events_preview import EventsPreview
+from services.intent_router import IntentRouter
+from services.chat_agent import ChatAgent
+from services.admission import AdmissionRejected
+from services.tool_catalog import ToolCatalog
+from services.tool_selector import ToolSelector
+from services.tracing import TraceBuffer
+from utils.metrics import (
+    HTTP_REQUEST_DURATION,
+    ACTIVE_CONVERSATIONS,
+    ADMISSION_ACTIVE,
+    ADMISSION_QUEUE_DEPTH,
+    metrics_payload
+)
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# ====================================
+# CLIENTS & STOCKAGE
+# ====================================
+
+# Versions des données des tools (invalidation du cache de réponses)
+tool_data_versions = ToolDataVersions()
+
+# Définitions des tools, rechargées depuis le manifeste du serveur MCP
+tool_catalog = ToolCatalog()
+
+# Clients
+ollama_client = OllamaClient(tool_catalog=tool_catalog)
+mcp_client = MCPClient(data_versions=tool_data_versions, catalog=tool_catalog)
+tool_executor = ToolExecutor(mcp_client)
+
+# Pré-routage des intentions évidentes (évite le tour de sélection de tools)
+intent_router = IntentRouter(tool_catalog.tools)
+tool_catalog.subscribe(lambda catalog: intent_router.set_tools(catalog.tools))
+
+# Sous-ensemble de tools envoyé à Ollama selon le message
+tool_selector = ToolSelector(tool_catalog, ollama_client.context_window)
+
+# Boucle tools -> génération dans l'échéance de chaque requête
+chat_agent = ChatAgent(ollama_client, mcp_client, tool_executor, intent_router, tool_selector)
+
+# Premier chargement du modèle réussi (ou préchargement désactivé)
+model_loaded_once = False
+
+async def probe_model():
+    """
+    Sonde "model": down tant que le premier chargement n'a pas eu lieu.
+    Ensuite, un modèle déchargé par Ollama (OLLAMA_KEEP_ALIVE écoulé) ne
+    rend la dépendance que dégradée: la prochaine requête le recharge, et
+    la readiness ne doit pas couper le trafic qui le rechargerait.
+    """
+    global model_loaded_once
+    
+    try:
+        await ollama_client.probe_model()
+    except ModelNotLoadedError as e:
+        if model_loaded_once:
+            raise DegradedError(str(e))
+        raise
+    
+    model_loaded_once = True
+
+# Sondes de santé en arrière-plan
+health_monitor = HealthMonitor()
+health_monitor.register("ollama", ollama_client.probe)
+health_monitor.register("mcp", mcp_client.probe)
+health_monitor.register("model", probe_model)
+health_monitor.register("tools", tool_catalog.probe)
+
+# Stockage des conversations (mémoire bornée ou SQLite, cf. CONVERSATION_STORE)
+conversations = create_conversation_store()
+
+# Réponse enregistrée quand un tour échoue (erreur, refus, client déconnecté)
+FAILED_TURN_RESPONSE = "Désolé, une erreur est survenue et je n'ai pas pu répondre à ce message."
+
+# Cache des réponses aux questions d'ouverture
+answer_cache = AnswerCache(tool_data_versions)
+
+# Aperçu des événements de la page d'accueil, rafraîchi en arrière-plan
+events_preview = EventsPreview(mcp_client)
+
+# Chronologie des dernières requêtes de chat (debug)
+traces = TraceBuffer()
+
 # ====================================
 # APPLICATION FASTAPI
 # ====================================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Ouvre les clients HTTP partagés au démarrage et les ferme à l'arrêt"""
+    await ollama_client.start()
+    await mcp_client.start()
+    await health_monitor.start()
+    await events_preview.start()
+    warm_up_task = asyncio.create_task(warm_up_model())
+    
+    yield
+    
+    warm_up_task.cancel()
+    await events_preview.stop()
+    await health_monitor.stop()
+    await conversations.close()
+    await ollama_client.close()
+    await mcp_client.close()
+
+async def warm_up_model():
+    """
+    Précharge le modèle Ollama au démarrage, en réessayant tant qu'Ollama
+    n'est pas joignable. La readiness reste à 503 tant que le modèle
+    n'a pas été chargé une première fois (sonde "model").
+    """
+    global model_loaded_once
+    
+    if os.getenv("OLLAMA_WARMUP", "true").strip().lower() not in ("1", "true", "yes", "on"):
+        model_loaded_once = True
+        return
+    
+    retry_delay = float(os.getenv("OLLAMA_WARMUP_RETRY_DELAY", "5"))
+    
+    while True:
+        try:
+            await ollama_client.warm_up()
+            break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Préchargement du modèle impossible ({str(e) or type(e).__name__}), nouvel essai dans {retry_delay}s")
+            await asyncio.sleep(retry_delay)
+    
+    model_loaded_once = True
+    
+    # Mettre à jour la readiness sans attendre la prochaine sonde
+    await health_monitor.probe_all()
+
 app = FastAPI(
     title="Lille Addict Bot API",
     description="API du chatbot intelligent pour découvrir Lille",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # ====================================
@@ -40,16 +180,25 @@ app.add_middleware(
 )
 
 # ====================================
-# CLIENTS & STOCKAGE
+# MÉTRIQUES
 # ====================================
 
-# Clients
-ollama_client = OllamaClient()
-mcp_client = MCPClient()
-
-# Stockage temporaire des conversations
-# En production: utiliser Redis ou une base de données
-conversations: Dict[str, List[Dict]] = {}
+@app.middleware("http")
+async def record_request_duration(request: Request, call_next):
+    """Latence par route (gabarit de la route, pas le chemin: pas d'explosion des labels)"""
+    started = time.monotonic()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_DURATION.labels(
+            request.method,
+            route.path if route is not None else "unmatched",
+            str(status)
+        ).observe(time.monotonic() - started)
 
 # ====================================
 # MODÈLES PYDANTIC
@@ -67,6 +216,59 @@ class EventsPreviewResponse(BaseModel):
     events: List[Dict[str, Any]]
     week_dates: str
 
+# ====================================
+# LOGIQUE DE CONVERSATION
+# ====================================
+
+async def start_turn(request: ChatRequest) -> str:
+    """
+    Initialise la conversation si besoin et ajoute le message utilisateur.
+    
+    Returns:
+        ID de la conversation
+    """
+    # Gérer l'ID de conversation
+    conv_id = request.conversation_id or str(uuid.uuid4())
+    
+    # Ajouter le message utilisateur (crée la conversation si nouvelle)
+    created = await conversations.append(conv_id, {
+        "role": "user",
+        "content": request.message
+    })
+    if created:
+        logger.info(f"Nouvelle conversation: {conv_id}")
+    
+    logger.info(f"[{conv_id}] User: {request.message}")
+    
+    return conv_id
+
+async def close_failed_turn(conv_id: str):
+    """
+    Termine un tour en échec par une réponse d'erreur: l'historique garde
+    l'alternance question/réponse et le tour suivant ne voit pas une
+    question restée sans réponse.
+    """
+    try:
+        await conversations.append(conv_id, {
+            "role": "assistant",
+            "content": FAILED_TURN_RESPONSE
+        })
+    except Exception as e:
+        logger.warning(f"[{conv_id}] Réponse d'erreur non enregistrée: {str(e)}")
+
+def admission_rejected_response(error: AdmissionRejected) -> JSONResponse:
+    """Réponse 429/503 avec Retry-After quand Ollama est saturé"""
+    logger.warning(f"Requête refusée ({error.status_code}): {error}")
+    return JSONResponse(
+        status_code=error.status_code,
+        content={"detail": str(error)},
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+def ndjson_event(event: Dict[str, Any]) -> str:
+    """Sérialise un événement de streaming en une ligne NDJSON"""
+    return json.dumps(event, ensure_ascii=False) + "\n"
+
 # ====================================
 # ROUTES API
 # ====================================
@@ -79,145 +281,333 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "chat": "/api/chat",
+            "chat_stream": "/api/chat/stream",
             "events": "/api/events/preview",
-            "health": "/health"
+            "health": "/health",
+            "liveness": "/health/live",
+            "readiness": "/health/ready"
         }
     }
 
 @app.get("/health")
 async def health_check():
-    """Health check de l'API"""
+    """
+    Health check de l'API.
+    
+    Répond depuis le cache des sondes en arrière-plan (aucun appel réseau).
+    """
+    snapshot = health_monitor.snapshot()
     return {
-        "status": "ok",
-        "ollama": ollama_client.is_available(),
-        "mcp": mcp_client.is_available()
+        **snapshot,
+        "ollama": health_monitor.status("ollama") in ("up", "degraded"),
+        "mcp": health_monitor.status("mcp") in ("up", "degraded")
     }
 
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness: le processus et sa boucle d'événements répondent"""
+    return {"status": "ok"}
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness: les dépendances requises sont joignables (sinon 503)"""
+    snapshot = health_monitor.snapshot()
+    ready = health_monitor.is_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, **snapshot}
+    )
+
+def trace_headers(trace) -> Dict[str, str]:
+    """En-têtes X-Request-ID et Server-Timing (résumé de la trace)"""
+    if trace is None:
+        return {}
+    return {"X-Request-ID": trace.request_id, "Server-Timing": trace.server_timing()}
+
 @app.post("/api/chat", response_model=ChatResponse)
-async def chat_endpoint(request: ChatRequest):
+async def chat_endpoint(request: ChatRequest, response: Response):
     """
     Endpoint principal du chatbot.
     
     Reçoit un message utilisateur, le traite avec Ollama,
     appelle les tools MCP si nécessaire, et retourne la réponse.
+    La chronologie de la requête est consultable via /api/debug/traces.
     """
+    conv_id = request.conversation_id or str(uuid.uuid4())
+    request.conversation_id = conv_id
+    trace = traces.start(conv_id, "/api/chat")
+    turn_open = False
+    
     try:
-        # Gérer l'ID de conversation
-        conv_id = request.conversation_id or str(uuid.uuid4())
-        
-        # Initialiser la conversation si nouvelle
-        if conv_id not in conversations:
-            conversations[conv_id] = []
-            logger.info(f"Nouvelle conversation: {conv_id}")
-        
-        # Ajouter le message utilisateur
-        conversations[conv_id].append({
-            "role": "user",
-            "content": request.message
-        })
-        
-        logger.info(f"[{conv_id}] User: {request.message}")
+        conv_id = await start_turn(request)
+        turn_open = True
+        history = await conversations.get(conv_id)
+        first_turn = len(history) == 1
         
-        # Obtenir les tools disponibles
-        available_tools = mcp_client.get_available_tools()
+        # Question d'ouverture déjà traitée avec les mêmes données
+        cached_response = answer_cache.get(request.message) if first_turn else None
         
-        # Envoyer à Ollama
-        ollama_response = await ollama_client.chat(
-            messages=conversations[conv_id],
-            tools=available_tools
-        )
-        
-        # Traiter les tool calls si présents
-        if "tool_calls" in ollama_response and ollama_response["tool_calls"]:
-            logger.info(f"[{conv_id}] Tool calls détectés: {len(ollama_response['tool_calls'])}")
-            
-            tool_results = []
+        if cached_response is not None:
+            logger.info(f"[{conv_id}] Réponse servie depuis le cache")
+            final_response = cached_response
+        else:
+            result = await chat_agent.run(history, conv_id, request.message)
             
-            for tool_call in ollama_response["tool_calls"]:
-                tool_name = tool_call.get("name")
-                tool_args = tool_call.get("arguments", {})
-                
-                logger.info(f"[{conv_id}] Appel tool: {tool_name} avec args: {tool_args}")
-                
-                # Appeler le tool MCP
-                try:
-                    tool_result = await mcp_client.call_tool(tool_name, tool_args)
-                    tool_results.append(tool_result)
-                    logger.info(f"[{conv_id}] Tool result: Success")
-                except Exception as e:
-                    logger.error(f"[{conv_id}] Erreur tool {tool_name}: {str(e)}")
-                    tool_results.append({
-                        "error": str(e),
-                        "tool": tool_name
-                    })
+            # Extraire la réponse finale
+            final_response = result["content"] or "Désolé, je n'ai pas pu générer de réponse."
             
-            # Re-soumettre à Ollama avec les résultats des tools
-            ollama_response = await ollama_client.chat(
-                messages=conversations[conv_id],
-                tool_results=tool_results
-            )
-        
-        # Extraire la réponse finale
-        final_response = ollama_response.get("content", "Désolé, je n'ai pas pu générer de réponse.")
+            if first_turn:
+                answer_cache.put(request.message, result["tool_results"], result["content"])
         
         # Ajouter la réponse du bot à l'historique
-        conversations[conv_id].append({
+        turn_open = False
+        await conversations.append(conv_id, {
             "role": "assistant",
             "content": final_response
         })
         
         logger.info(f"[{conv_id}] Bot response generated")
         
+        if trace is not None:
+            trace.finish()
+            response.headers.update(trace_headers(trace))
+        
         return ChatResponse(
             response=final_response,
             conversation_id=conv_id
         )
+    
+    except AdmissionRejected as e:
+        if trace is not None:
+            trace.finish()
+        if turn_open:
+            await close_failed_turn(conv_id)
+        return admission_rejected_response(e)
         
     except Exception as e:
+        if trace is not None:
+            trace.finish()
+        if turn_open:
+            await close_failed_turn(conv_id)
         logger.error(f"Erreur dans chat_endpoint: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Erreur lors du traitement: {str(e)}"
         )
 
-@app.get("/api/events/preview", response_model=EventsPreviewResponse)
-async def get_events_preview():
+@app.post("/api/chat/stream")
+async def chat_stream_endpoint(request: ChatRequest):
     """
-    Récupère un aperçu des événements du week-end
-    pour affichage sur la page d'accueil.
+    Variante streaming du chatbot (NDJSON).
+    
+    Les tours de tools sont exécutés d'abord, puis la réponse finale est
+    transmise token par token au fur et à mesure de sa génération.
+    Chaque ligne est un objet JSON:
+    - {"type": "start", "conversation_id": ...}
+    - {"type": "token", "content": ...}
+    - {"type": "done", "conversation_id": ..., "timing": {...}}
+    - {"type": "error", "detail": ...}
+    
+    Les en-têtes partent avant la génération: le résumé des durées est
+    dans l'événement "done" plutôt que dans Server-Timing.
     """
+    conv_id = request.conversation_id or str(uuid.uuid4())
+    request.conversation_id = conv_id
+    trace = traces.start(conv_id, "/api/chat/stream")
+    turn_open = False
+    
     try:
-        # Appeler directement le tool MCP
-        result = await mcp_client.call_tool("get_weekend_events", {})
+        conv_id = await start_turn(request)
+        turn_open = True
+        history = await conversations.get(conv_id)
+        first_turn = len(history) == 1
+        cached_response = answer_cache.get(request.message) if first_turn else None
         
-        if result.get("success"):
-            data = result.get("data", {})
-            return EventsPreviewResponse(
-                events=data.get("events", []),
-                week_dates=data.get("week_dates", "")
-            )
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail="Erreur lors de la récupération des événements"
-            )
-            
+        # Refus immédiat (429) plutôt qu'un flux ouvert qui attendrait Ollama
+        if cached_response is None:
+            ollama_client.admission.check(chat_agent.priority_for(first_turn, request.message))
+    
+    except AdmissionRejected as e:
+        if trace is not None:
+            trace.finish()
+        await close_failed_turn(conv_id)
+        return admission_rejected_response(e)
+    
     except Exception as e:
-        logger.error(f"Erreur dans get_events_preview: {str(e)}")
-        # Retourner une liste vide plutôt qu'une erreur
-        return EventsPreviewResponse(
-            events=[],
-            week_dates=""
+        if trace is not None:
+            trace.finish()
+        if turn_open:
+            await close_failed_turn(conv_id)
+        logger.error(f"Erreur dans chat_stream_endpoint: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erreur lors du traitement: {str(e)}"
+        )
+    
+    async def event_stream() -> AsyncIterator[str]:
+        yield ndjson_event({"type": "start", "conversation_id": conv_id})
+        turn_open = True
+        
+        try:
+            chunks: List[str] = []
+            
+            if cached_response is not None:
+                logger.info(f"[{conv_id}] Réponse servie depuis le cache")
+                chunks.append(cached_response)
+                yield ndjson_event({"type": "token", "content": cached_response})
+            else:
+                async for event in chat_agent.stream(history, conv_id, request.message):
+                    if event["type"] == "token":
+                        chunks.append(event["content"])
+                        yield ndjson_event(event)
+                    elif first_turn and event["content"]:
+                        answer_cache.put(request.message, event["tool_results"], event["content"])
+            
+            final_response = "".join(chunks) or "Désolé, je n'ai pas pu générer de réponse."
+            if not chunks:
+                yield ndjson_event({"type": "token", "content": final_response})
+            
+            # Ajouter la réponse complète du bot à l'historique
+            turn_open = False
+            await conversations.append(conv_id, {
+                "role": "assistant",
+                "content": final_response
+            })
+            
+            logger.info(f"[{conv_id}] Bot response streamed")
+            
+            done = {"type": "done", "conversation_id": conv_id}
+            if trace is not None:
+                trace.finish()
+                done["timing"] = trace.summary()
+            yield ndjson_event(done)
+        
+        except AdmissionRejected as e:
+            logger.warning(f"[{conv_id}] Requête refusée en cours de flux ({e.status_code}): {e}")
+            yield ndjson_event({"type": "error", "detail": str(e), "retry_after": e.retry_after})
+            
+        except Exception as e:
+            logger.error(f"Erreur dans chat_stream_endpoint: {str(e)}", exc_info=True)
+            yield ndjson_event({"type": "error", "detail": f"Erreur lors du traitement: {str(e)}"})
+        
+        finally:
+            if trace is not None:
+                trace.finish()
+            # Erreur ou client déconnecté avant la fin de la réponse
+            if turn_open:
+                await close_failed_turn(conv_id)
+    
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    if trace is not None:
+        headers["X-Request-ID"] = trace.request_id
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="application/x-ndjson",
+        headers=headers
+    )
+
+@app.get("/api/events/preview", response_model=EventsPreviewResponse)
+async def get_events_preview(request: Request):
+    """
+    Récupère un aperçu des événements du week-end
+    pour affichage sur la page d'accueil.
+    
+    Servi depuis la version matérialisée en mémoire (jamais d'attente du
+    serveur MCP), avec ETag fort et réponse 304 si If-None-Match correspond.
+    """
+    snapshot = events_preview.get()
+    
+    if snapshot is None:
+        # Premier chargement pas encore terminé: liste vide non cachable
+        return JSONResponse(
+            content=EventsPreviewResponse(events=[], week_dates="").model_dump(),
+            headers={"Cache-Control": "no-store"}
         )
+    
+    headers = {
+        "ETag": snapshot["etag"],
+        "Cache-Control": events_preview.cache_control
+    }
+    
+    if events_preview.etag_matches(request.headers.get("if-none-match"), snapshot["etag"]):
+        return Response(status_code=304, headers=headers)
+    
+    return Response(
+        content=snapshot["body"],
+        media_type="application/json",
+        headers=headers
+    )
 
 @app.delete("/api/conversations/{conversation_id}")
 async def delete_conversation(conversation_id: str):
     """Supprime une conversation"""
-    if conversation_id in conversations:
-        del conversations[conversation_id]
+    if await conversations.delete(conversation_id):
         return {"message": "Conversation supprimée"}
     raise HTTPException(status_code=404, detail="Conversation non trouvée")
 
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Compteurs du cache de réponses et du cache de résultats de tools"""
+    return {
+        "answers": answer_cache.stats(),
+        "tools": mcp_client.cache_stats()
+    }
+
+@app.get("/api/router/stats")
+async def router_stats():
+    """Compteurs du pré-routage des intentions (routé / repli sur Ollama)"""
+    return intent_router.stats
+
+@app.get("/api/admission/stats")
+async def admission_stats():
+    """Occupation d'Ollama: générations en cours, file d'attente, temps d'attente"""
+    return ollama_client.admission.stats()
+
+@app.get("/api/ollama/endpoints")
+async def ollama_endpoints():
+    """Instances Ollama: disponibilité, requêtes en cours, latence lissée"""
+    return ollama_client.pool.stats()
+
+@app.get("/api/tools/selection/stats")
+async def tool_selection_stats():
+    """Compteurs de la sélection des tools (sous-ensemble, aucun, liste complète)"""
+    return tool_selector.stats
+
+@app.get("/api/agent/stats")
+async def agent_stats():
+    """Compteurs de la boucle d'agent (tours de tools, coupures de budget)"""
+    return chat_agent.stats
+
+@app.get("/api/conversations/stats")
+async def conversations_stats():
+    """Occupation et compteurs d'éviction du stockage des conversations"""
+    return await conversations.stats()
+
+@app.get("/api/debug/traces")
+async def recent_traces(limit: int = 20):
+    """Dernières requêtes de chat avec le résumé de leurs durées"""
+    return traces.recent(limit)
+
+@app.get("/api/debug/traces/{identifier}")
+async def get_traces(identifier: str):
+    """Chronologie détaillée d'une requête (X-Request-ID) ou de toutes les requêtes d'une conversation"""
+    found = traces.find(identifier)
+    if not found:
+        raise HTTPException(status_code=404, detail="Aucune trace pour cet identifiant")
+    return found
+
+@app.get("/metrics")
+async def metrics():
+    """Métriques au format Prometheus"""
+    ACTIVE_CONVERSATIONS.set((await conversations.stats())["conversations"])
+    admission = ollama_client.admission.stats()
+    ADMISSION_ACTIVE.set(admission["active"])
+    ADMISSION_QUEUE_DEPTH.set(admission["queue_depth"])
+    
+    payload, content_type = metrics_payload()
+    return Response(content=payload, media_type=content_type)
+
 # ====================================
 # LANCEMENT
 # ====================================
@@ -229,9 +619,15 @@ if __name__ == "__main__":
     logger.info("📡 API disponible sur http://localhost:8000")
     logger.info("📚 Documentation sur http://localhost:8000/docs")
     
+    # Plusieurs workers nécessitent un stockage partagé (CONVERSATION_STORE=sqlite)
+    workers = int(os.getenv("BACKEND_WORKERS", "1"))
+    if workers > 1 and os.getenv("CONVERSATION_STORE", "memory") == "memory":
+        logger.warning("BACKEND_WORKERS > 1 avec le stockage mémoire: le contexte ne sera pas partagé entre workers")
+    
     uvicorn.run(
-        app,
+        "main:app",
         host="0.0.0.0",
         port=8000,
+        workers=workers,
         log_level="info"
     )
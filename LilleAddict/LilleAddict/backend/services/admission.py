@@ -0,0 +1,193 @@
+"""
+Contrôle d'admission - Limite les générations simultanées envoyées à Ollama
+avec une file d'attente bornée et priorisée
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Tuple, AsyncIterator
+import logging
+import os
+
+from services import tracing
+
+logger = logging.getLogger(__name__)
+
+# Priorités (la plus petite passe en premier)
+PRIORITY_CONTINUATION = 0  # Requête déjà engagée (génération après un tour de tools)
+PRIORITY_SHORT = 1         # Question d'ouverture courte (page d'accueil)
+PRIORITY_DEFAULT = 2
+
+class AdmissionRejected(Exception):
+    """
+    Requête refusée par le contrôle d'admission
+
+    status_code vaut 429 si la file est pleine, 503 si l'attente a dépassé
+    le délai maximal; retry_after est le délai conseillé en secondes.
+    """
+
+    def __init__(self, status_code: int, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """
+    Sémaphore priorisé devant Ollama.
+
+    Au plus max_concurrency générations tournent en même temps (à aligner
+    sur OLLAMA_NUM_PARALLEL). Les suivantes attendent dans une file bornée,
+    servie par priorité puis par ordre d'arrivée. Une nouvelle requête est
+    refusée immédiatement si la file est pleine, et au bout de
+    queue_timeout si elle n'a pas obtenu de place, pour éviter que toutes
+    les requêtes ralentissent ensemble jusqu'au timeout HTTP.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = None,
+        max_queue: int = None,
+        queue_timeout: float = None
+    ):
+        self.max_concurrency = max_concurrency or int(os.getenv("OLLAMA_MAX_CONCURRENCY", "2"))
+        self.max_queue = max_queue or int(os.getenv("OLLAMA_MAX_QUEUE", "16"))
+        self.queue_timeout = queue_timeout or float(os.getenv("OLLAMA_QUEUE_TIMEOUT", "20"))
+
+        self.active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+        # Durée moyenne d'occupation d'une place (estimation de Retry-After)
+        self._service_time = 5.0
+        self._wait_times: deque = deque(maxlen=1000)
+
+        self.counters = {
+            "admitted": 0,
+            "queued": 0,
+            "rejected_queue_full": 0,
+            "rejected_timeout": 0
+        }
+
+        logger.info(
+            f"Contrôle d'admission Ollama - concurrence: {self.max_concurrency}, "
+            f"file: {self.max_queue}, attente max: {self.queue_timeout}s"
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        """Nombre de requêtes en attente d'une place"""
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def retry_after(self) -> int:
+        """Délai estimé (secondes) avant qu'une place se libère pour un nouvel arrivant"""
+        backlog = self.queue_depth + 1
+        return max(1, math.ceil(self._service_time * backlog / self.max_concurrency))
+
+    def check(self, priority: int = PRIORITY_DEFAULT):
+        """
+        Refus rapide, avant d'engager la requête (utile avant d'ouvrir un
+        flux de streaming)
+
+        Raises:
+            AdmissionRejected: si la requête serait refusée faute de place
+        """
+        if (
+            priority > PRIORITY_CONTINUATION
+            and self.active >= self.max_concurrency
+            and self.queue_depth >= self.max_queue
+        ):
+            self.counters["rejected_queue_full"] += 1
+            raise AdmissionRejected(429, self.retry_after(), "File d'attente Ollama pleine")
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_DEFAULT) -> AsyncIterator[None]:
+        """Occupe une place de génération pendant la durée du bloc"""
+        await self.acquire(priority)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._service_time = 0.8 * self._service_time + 0.2 * (time.monotonic() - started)
+            self.release()
+
+    async def acquire(self, priority: int = PRIORITY_DEFAULT):
+        """
+        Attend une place de génération
+
+        Les requêtes déjà engagées (PRIORITY_CONTINUATION) ne sont jamais
+        refusées pour file pleine: les rejeter gaspillerait le travail déjà fait.
+
+        Raises:
+            AdmissionRejected: file pleine (429) ou attente trop longue (503)
+        """
+        if self.active < self.max_concurrency and not self.queue_depth:
+            self.active += 1
+            self.counters["admitted"] += 1
+            self._wait_times.append(0.0)
+            return
+
+        self.check(priority)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self.counters["queued"] += 1
+        enqueued = time.monotonic()
+
+        try:
+            # La place est transférée par release() (active déjà compté)
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # Place obtenue au moment même du timeout: on la garde
+                pass
+            else:
+                future.cancel()
+                self.counters["rejected_timeout"] += 1
+                raise AdmissionRejected(503, self.retry_after(), "Ollama saturé, attente trop longue")
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                future.cancel()
+            raise
+
+        self.counters["admitted"] += 1
+        self._wait_times.append(time.monotonic() - enqueued)
+        tracing.record("queue.admission", enqueued, priority=priority)
+
+    def release(self):
+        """Libère une place, transmise directement au prochain en file"""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Occupation, profondeur de file et temps d'attente (ms)"""
+        waits = sorted(self._wait_times)
+
+        def percentile(p: float) -> float:
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))] * 1000, 1)
+
+        return {
+            "active": self.active,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            **self.counters,
+            "wait_ms": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "max": percentile(1.0)
+            },
+            "retry_after": self.retry_after()
+        }
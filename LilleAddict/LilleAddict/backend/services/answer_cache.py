@@ -0,0 +1,165 @@
+"""
+Cache de réponses - Réponses aux premières questions, invalidées quand
+les données des tools changent
+"""
+
+import hashlib
+import json
+from typing import Dict, Any, List, Optional, Callable, Iterable, Set
+import logging
+import os
+
+from utils.cache import TTLCache
+from utils.text import normalize_text
+
+logger = logging.getLogger(__name__)
+
+class ToolDataVersions:
+    """
+    Empreinte courante des données renvoyées par chaque tool MCP.
+
+    Mise à jour à chaque résultat de tool réussi; les abonnés sont
+    prévenus quand les données d'un tool changent.
+    """
+
+    def __init__(self):
+        self._versions: Dict[str, str] = {}
+        self._listeners: List[Callable[[str], None]] = []
+
+    def subscribe(self, listener: Callable[[str], None]):
+        """Enregistre un callback appelé avec le nom du tool modifié"""
+        self._listeners.append(listener)
+
+    def observe(self, tool_name: str, data: Any) -> bool:
+        """
+        Enregistre les données renvoyées par un tool
+
+        Returns:
+            True si les données ont changé depuis la dernière observation
+        """
+        canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+        version = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+        previous = self._versions.get(tool_name)
+        self._versions[tool_name] = version
+
+        if previous is None or previous == version:
+            return previous is None
+
+        logger.info(f"Données du tool {tool_name} modifiées ({previous} -> {version})")
+        for listener in self._listeners:
+            listener(tool_name)
+        return True
+
+    def get(self, tool_name: str) -> Optional[str]:
+        """Version courante des données d'un tool (None si jamais observé)"""
+        return self._versions.get(tool_name)
+
+    def fingerprint(self, tool_names: Iterable[str]) -> Optional[str]:
+        """
+        Empreinte combinée des données de plusieurs tools, None si l'un
+        d'eux n'a pas encore de version connue
+        """
+        parts = []
+        for name in sorted(set(tool_names)):
+            version = self._versions.get(name)
+            if version is None:
+                return None
+            parts.append(f"{name}={version}")
+        return ",".join(parts)
+
+class AnswerCache:
+    """
+    Cache des réponses aux questions d'ouverture de conversation.
+
+    La clé combine la question normalisée (casse, accents, ponctuation) et
+    l'empreinte des données des tools utilisés pour y répondre: une réponse
+    n'est resservie que si ces données n'ont pas changé. Les entrées sont
+    bornées (LRU) et expirent après un TTL.
+    """
+
+    def __init__(
+        self,
+        versions: ToolDataVersions,
+        max_entries: int = None,
+        ttl: float = None
+    ):
+        self.versions = versions
+        max_entries = max_entries or int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "500"))
+        ttl = ttl or float(os.getenv("ANSWER_CACHE_TTL", "600"))
+        self.enabled = os.getenv("ANSWER_CACHE_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+
+        # question normalisée -> tools utilisés
+        self._tools_for = TTLCache(max_entries, ttl)
+        # question normalisée + empreinte des données -> réponse
+        self._answers = TTLCache(max_entries, ttl)
+        # tool -> clés de réponses qui en dépendent
+        self._dependents: Dict[str, Set[str]] = {}
+        self.invalidations = 0
+
+        versions.subscribe(self._on_tool_data_changed)
+
+        logger.info(f"Cache de réponses - activé: {self.enabled}, entrées: {max_entries}, TTL: {ttl}s")
+
+    def get(self, message: str) -> Optional[str]:
+        """Réponse en cache pour cette question, si les données sont inchangées"""
+        if not self.enabled:
+            return None
+
+        question = normalize_text(message)
+        tool_names = self._tools_for.get(question)
+        if tool_names is None:
+            self._answers.record_miss()
+            return None
+
+        fingerprint = self.versions.fingerprint(tool_names)
+        if fingerprint is None:
+            self._answers.record_miss()
+            return None
+
+        return self._answers.get(f"{question}|{fingerprint}")
+
+    def put(self, message: str, tool_results: List[Dict[str, Any]], answer: str):
+        """
+        Met en cache une réponse, sauf si l'un des tools a échoué
+
+        Args:
+            message: Question de l'utilisateur
+            tool_results: Résultats des tools utilisés pour répondre
+            answer: Réponse générée
+        """
+        if not self.enabled or not answer:
+            return
+        if any(not result.get("success") for result in tool_results):
+            return
+
+        tool_names = tuple(sorted({result["tool"] for result in tool_results}))
+        fingerprint = self.versions.fingerprint(tool_names)
+        if fingerprint is None:
+            return
+
+        question = normalize_text(message)
+        key = f"{question}|{fingerprint}"
+
+        self._tools_for.set(question, tool_names)
+        self._answers.set(key, answer)
+        for name in tool_names:
+            dependents = self._dependents.setdefault(name, set())
+            dependents.add(key)
+            # Oublier les clés déjà évincées du cache
+            if len(dependents) > self._answers.max_entries:
+                self._dependents[name] = {k for k in dependents if k in self._answers}
+
+    def _on_tool_data_changed(self, tool_name: str):
+        """Supprime les réponses construites avec les anciennes données du tool"""
+        for key in self._dependents.pop(tool_name, set()):
+            if self._answers.delete(key):
+                self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Compteurs du cache de réponses"""
+        return {
+            "enabled": self.enabled,
+            **self._answers.stats(),
+            "invalidations": self.invalidations
+        }
@@ -0,0 +1,238 @@
+"""
+Boucle d'agent - Tours de tools successifs dans un budget de temps par requête
+"""
+
+import time
+from typing import Dict, Any, List, Optional, AsyncIterator
+import logging
+import os
+
+from services.ollama_client import OllamaClient
+from services.mcp_client import MCPClient
+from services.tool_executor import ToolExecutor
+from services.intent_router import IntentRouter
+from services.tool_selector import ToolSelector
+from services.admission import PRIORITY_CONTINUATION, PRIORITY_SHORT, PRIORITY_DEFAULT
+
+logger = logging.getLogger(__name__)
+
+class ChatAgent:
+    """
+    Enchaîne les tours "sélection de tools -> exécution" puis la génération
+    finale, dans une limite de tours et une échéance par requête.
+
+    Une part du budget est réservée à la génération finale: un nouveau tour
+    de tools n'est lancé que s'il reste de quoi l'exécuter ET répondre
+    ensuite. Sinon la réponse est générée avec les résultats déjà obtenus.
+    """
+
+    def __init__(
+        self,
+        ollama_client: OllamaClient,
+        mcp_client: MCPClient,
+        tool_executor: ToolExecutor,
+        intent_router: IntentRouter,
+        tool_selector: ToolSelector = None,
+        deadline: float = None,
+        max_rounds: int = None,
+        generation_reserve: float = None
+    ):
+        self.ollama_client = ollama_client
+        self.mcp_client = mcp_client
+        self.tool_executor = tool_executor
+        self.intent_router = intent_router
+        self.tool_selector = tool_selector
+
+        self.deadline = deadline or float(os.getenv("CHAT_DEADLINE", "50"))
+        self.max_rounds = max_rounds or int(os.getenv("AGENT_MAX_ROUNDS", "2"))
+        self.generation_reserve = generation_reserve or float(os.getenv("AGENT_GENERATION_RESERVE", "15"))
+        self.short_message_chars = int(os.getenv("ADMISSION_SHORT_MESSAGE_CHARS", "80"))
+
+        self.stats = {
+            "requests": 0,
+            "tool_rounds": 0,
+            "routed": 0,
+            "budget_cutoffs": 0
+        }
+
+        logger.info(
+            f"Agent - échéance: {self.deadline}s, tours max: {self.max_rounds}, "
+            f"réserve de génération: {self.generation_reserve}s"
+        )
+
+    def priority_for(self, first_turn: bool, message: str) -> int:
+        """
+        Priorité d'admission d'une nouvelle requête: les questions d'ouverture
+        courtes (type page d'accueil) passent avant les conversations longues
+        """
+        if first_turn and len(message) <= self.short_message_chars:
+            return PRIORITY_SHORT
+        return PRIORITY_DEFAULT
+
+    async def run(self, history: List[Dict[str, Any]], conv_id: str, message: str) -> Dict[str, Any]:
+        """
+        Traite un tour de conversation
+
+        Args:
+            history: Historique de la conversation (question courante incluse)
+            conv_id: ID de conversation (logs, affinité d'instance Ollama)
+            message: Question de l'utilisateur (pour le pré-routage)
+
+        Returns:
+            {"content": réponse, "tool_results": résultats des tools utilisés}
+        """
+        result: Dict[str, Any] = {}
+        async for event in self._loop(history, conv_id, message, stream=False):
+            result = event
+        return result
+
+    async def stream(self, history: List[Dict[str, Any]], conv_id: str, message: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Variante streaming de run()
+
+        Yields:
+            {"type": "token", "content"} au fil de la génération, puis
+            {"type": "result", "content", "tool_results"} en dernier
+        """
+        async for event in self._loop(history, conv_id, message, stream=True):
+            yield event
+
+    async def _loop(
+        self,
+        history: List[Dict[str, Any]],
+        conv_id: str,
+        message: str,
+        stream: bool
+    ) -> AsyncIterator[Dict[str, Any]]:
+        deadline = time.monotonic() + self.deadline
+        priority = self.priority_for(len(history) <= 1, message)
+        self.stats["requests"] += 1
+
+        # Messages du tour en cours: appels de tools de l'assistant et résultats
+        scratch: List[Dict[str, Any]] = []
+        tool_results: List[Dict[str, Any]] = []
+        chunks: List[str] = []
+
+        # Intention évidente: tools choisis sans le tour de sélection d'Ollama
+        routed_calls = self.intent_router.route(message)
+
+        if routed_calls:
+            self.stats["routed"] += 1
+            results = await self._run_tools(routed_calls, conv_id, deadline)
+            if results is not None:
+                self._record_round(scratch, routed_calls, "", results, message)
+                tool_results.extend(results)
+        else:
+            # Seuls les tools pertinents pour le message sont envoyés
+            tools = (
+                self.tool_selector.select(message, history) if self.tool_selector
+                else self.mcp_client.get_available_tools()
+            )
+            rounds = 0
+            while tools and rounds < self.max_rounds:
+                remaining = deadline - time.monotonic()
+                if remaining < 2 * self.generation_reserve:
+                    self.stats["budget_cutoffs"] += 1
+                    logger.info(f"[{conv_id}] Budget bas ({remaining:.1f}s), réponse avec les résultats obtenus")
+                    break
+
+                rounds += 1
+                self.stats["tool_rounds"] += 1
+                tool_calls: List[Dict[str, Any]] = []
+                round_chunks: List[str] = []
+
+                # La réponse est transmise directement si Ollama répond sans tool
+                async for chunk in self._generate(
+                    history + scratch,
+                    tools=tools,
+                    timeout=remaining - self.generation_reserve,
+                    priority=PRIORITY_CONTINUATION if scratch else priority,
+                    conv_id=conv_id,
+                    stream=stream
+                ):
+                    if chunk["tool_calls"]:
+                        tool_calls.extend(chunk["tool_calls"])
+                    if chunk["content"]:
+                        round_chunks.append(chunk["content"])
+                        if stream:
+                            yield {"type": "token", "content": chunk["content"]}
+
+                chunks.extend(round_chunks)
+
+                if not tool_calls:
+                    yield {"type": "result", "content": "".join(chunks), "tool_results": tool_results}
+                    return
+
+                results = await self._run_tools(tool_calls, conv_id, deadline)
+                if results is None:
+                    break
+                self._record_round(scratch, tool_calls, "".join(round_chunks), results, message)
+                tool_results.extend(results)
+
+        # Génération finale, sans tools, avec les résultats obtenus
+        async for chunk in self._generate(
+            history + scratch,
+            tools=None,
+            timeout=max(deadline - time.monotonic(), 1.0),
+            priority=PRIORITY_CONTINUATION if scratch else priority,
+            conv_id=conv_id,
+            stream=stream
+        ):
+            if chunk["content"]:
+                chunks.append(chunk["content"])
+                if stream:
+                    yield {"type": "token", "content": chunk["content"]}
+
+        yield {"type": "result", "content": "".join(chunks), "tool_results": tool_results}
+
+    async def _generate(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict]],
+        timeout: float,
+        priority: int,
+        conv_id: str,
+        stream: bool
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Appel à Ollama, fragment par fragment en streaming, en un bloc sinon"""
+        if stream:
+            async for chunk in self.ollama_client.chat_stream(
+                messages=messages, tools=tools, timeout=timeout, priority=priority, conv_id=conv_id
+            ):
+                yield chunk
+        else:
+            response = await self.ollama_client.chat(
+                messages=messages, tools=tools, timeout=timeout, priority=priority, conv_id=conv_id
+            )
+            yield {"content": response.get("content", ""), "tool_calls": response.get("tool_calls") or []}
+
+    async def _run_tools(
+        self,
+        tool_calls: List[Dict[str, Any]],
+        conv_id: str,
+        deadline: float
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Exécute les tool calls dans le temps restant hors réserve de génération
+
+        Returns:
+            Résultats des tools, ou None si le budget ne permet plus de les lancer
+        """
+        timeout = deadline - time.monotonic() - self.generation_reserve
+        if timeout <= 0:
+            self.stats["budget_cutoffs"] += 1
+            logger.info(f"[{conv_id}] Budget épuisé, tools ignorés")
+            return None
+        return await self.tool_executor.run(tool_calls, conv_id, timeout=timeout)
+
+    def _record_round(
+        self,
+        scratch: List[Dict[str, Any]],
+        tool_calls: List[Dict[str, Any]],
+        content: str,
+        results: List[Dict[str, Any]],
+        query: str
+    ):
+        """Ajoute les appels de tools et leurs résultats aux messages du tour"""
+        scratch.append({"role": "assistant", "content": content, "tool_calls": tool_calls})
+        scratch.extend(self.ollama_client.tool_messages(results, query))
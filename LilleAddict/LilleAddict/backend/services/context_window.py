@@ -0,0 +1,158 @@
+"""
+Fenêtre de contexte - Limite l'historique envoyé à Ollama à un budget de tokens
+"""
+
+import math
+import re
+from typing import Dict, List, Any
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Tokens ajoutés par le template de chat pour chaque message (rôle, séparateurs)
+MESSAGE_TOKEN_OVERHEAD = 4
+
+class ContextWindow:
+    """
+    Garde une fenêtre glissante des messages récents dans un budget de tokens.
+
+    Le nombre de tokens est estimé à partir du nombre de caractères, avec un
+    ratio caractères/token recalibré grâce au prompt_eval_count renvoyé par
+    Ollama. Les messages trop anciens peuvent être résumés en un message
+    système compact (résumé extractif, sans appel au modèle).
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = None,
+        summarize: bool = None,
+        summary_tokens: int = None,
+        chars_per_token: float = 3.5
+    ):
+        self.max_tokens = max_tokens or int(os.getenv("CONTEXT_MAX_TOKENS", "3000"))
+        self.summary_tokens = summary_tokens or int(os.getenv("CONTEXT_SUMMARY_TOKENS", "200"))
+        if summarize is None:
+            summarize = os.getenv("CONTEXT_SUMMARIZE", "true").strip().lower() in ("1", "true", "yes", "on")
+        self.summarize = summarize
+        self.chars_per_token = chars_per_token
+
+        self.stats = {
+            "requests": 0,
+            "trimmed_requests": 0,
+            "dropped_messages": 0,
+            "calibrations": 0
+        }
+
+        logger.info(f"Fenêtre de contexte - budget: {self.max_tokens} tokens, résumé: {self.summarize}")
+
+    def estimate_tokens(self, text: str) -> int:
+        """Estime le nombre de tokens d'un texte"""
+        return self.tokens_for_chars(len(text))
+
+    def tokens_for_chars(self, chars: int) -> int:
+        """Estime le nombre de tokens correspondant à un nombre de caractères"""
+        return math.ceil(chars / self.chars_per_token)
+
+    def estimate_messages(self, messages: List[Dict[str, Any]]) -> int:
+        """Estime le nombre de tokens d'une liste de messages (tool calls compris)"""
+        return sum(
+            self.estimate_tokens(str(message.get("content", "")) + str(message.get("tool_calls") or ""))
+            + MESSAGE_TOKEN_OVERHEAD
+            for message in messages
+        )
+
+    def observe(self, prompt_chars: int, prompt_eval_count: int):
+        """
+        Recalibre le ratio caractères/token avec le retour d'Ollama
+
+        Ollama ne compte que les tokens réellement évalués: quand une partie du
+        prompt est déjà dans son cache, le ratio observé est surestimé. On
+        lisse donc la mesure et on la borne à des valeurs plausibles.
+        """
+        if not prompt_eval_count or prompt_chars <= 0:
+            return
+
+        observed = min(max(prompt_chars / prompt_eval_count, 2.0), 6.0)
+        self.chars_per_token = 0.8 * self.chars_per_token + 0.2 * observed
+        self.stats["calibrations"] += 1
+
+    def fit(self, history: List[Dict[str, Any]], reserved_tokens: int = 0) -> List[Dict[str, Any]]:
+        """
+        Sélectionne les messages récents qui tiennent dans le budget
+
+        Args:
+            history: Historique de la conversation (le dernier message est la
+                question courante, sans les messages de tools du tour)
+            reserved_tokens: Tokens déjà consommés (system prompt, tools, messages du tour)
+
+        Returns:
+            Messages retenus, précédés si besoin d'un résumé des plus anciens
+        """
+        self.stats["requests"] += 1
+
+        budget = self.max_tokens - reserved_tokens
+        costs = [self.estimate_messages([message]) for message in history]
+
+        if sum(costs) <= budget:
+            return list(history)
+
+        # Place réservée au résumé des messages retirés
+        window_budget = budget - self.summary_tokens if self.summarize else budget
+        kept: List[Dict[str, Any]] = []
+        used = 0
+
+        # Parcours du plus récent au plus ancien, la question courante est toujours gardée
+        for index in range(len(history) - 1, -1, -1):
+            if kept and used + costs[index] > window_budget:
+                break
+            kept.append(history[index])
+            used += costs[index]
+
+        kept.reverse()
+        dropped = history[:len(history) - len(kept)]
+
+        self.stats["trimmed_requests"] += 1
+        self.stats["dropped_messages"] += len(dropped)
+        logger.debug(f"Contexte réduit: {len(dropped)} messages anciens retirés ({used} tokens gardés)")
+
+        if self.summarize:
+            summary = self._summarize(dropped, max(budget - used, 0))
+            if summary:
+                return [summary] + kept
+
+        return kept
+
+    def _summarize(self, messages: List[Dict[str, Any]], available_tokens: int) -> Dict[str, str]:
+        """
+        Résumé extractif des messages retirés: une ligne courte par message,
+        en partant des plus récents, dans la limite du budget restant
+        """
+        budget = min(self.summary_tokens, available_tokens)
+        header = "Résumé du début de la conversation:"
+        used = self.estimate_tokens(header) + MESSAGE_TOKEN_OVERHEAD
+        lines: List[str] = []
+
+        for message in reversed(messages):
+            content = re.sub(r"\s+", " ", str(message.get("content", ""))).strip()
+            if not content:
+                continue
+            # Première phrase, tronquée
+            first_sentence = re.split(r"(?<=[.!?])\s", content, maxsplit=1)[0][:120]
+            prefix = "Utilisateur" if message.get("role") == "user" else "Assistant"
+            line = f"- {prefix}: {first_sentence}"
+
+            cost = self.estimate_tokens(line) + 1
+            if used + cost > budget:
+                break
+            lines.append(line)
+            used += cost
+
+        if not lines:
+            return {}
+
+        lines.reverse()
+        return {
+            "role": "system",
+            "content": header + "\n" + "\n".join(lines)
+        }
@@ -0,0 +1,407 @@
+"""
+Stockage des conversations - Interface commune, implémentations mémoire
+(bornée, éviction LRU/TTL) et SQLite (partagée entre workers)
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Any, Tuple
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Surcoût estimé par message (dict, clés, rôle) en plus du contenu
+MESSAGE_OVERHEAD_BYTES = 64
+
+def message_size(message: Dict[str, Any]) -> int:
+    """Estime l'empreinte mémoire d'un message en octets"""
+    return len(str(message.get("content", "")).encode("utf-8")) + MESSAGE_OVERHEAD_BYTES
+
+class ConversationStore(ABC):
+    """Interface de stockage des conversations utilisée par les routes de chat"""
+
+    @abstractmethod
+    async def get(self, conv_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Retourne l'historique d'une conversation ou None si inconnue"""
+
+    @abstractmethod
+    async def append(self, conv_id: str, message: Dict[str, Any]) -> bool:
+        """Ajoute un message (crée la conversation si besoin), True si créée"""
+
+    @abstractmethod
+    async def delete(self, conv_id: str) -> bool:
+        """Supprime une conversation, False si elle n'existe pas"""
+
+    @abstractmethod
+    async def stats(self) -> Dict[str, Any]:
+        """Statistiques d'occupation du stockage"""
+
+    async def close(self):
+        """Libère les ressources du stockage"""
+
+class InMemoryConversationStore(ConversationStore):
+    """
+    Conversations en mémoire avec limites:
+    - nombre max de conversations (éviction LRU)
+    - nombre max de messages par conversation (les plus anciens sont retirés)
+    - TTL d'inactivité
+    - budget mémoire global en octets (éviction LRU)
+    """
+
+    def __init__(
+        self,
+        max_conversations: int = None,
+        max_turns: int = None,
+        idle_ttl: float = None,
+        max_bytes: int = None
+    ):
+        self.max_conversations = max_conversations or int(os.getenv("CONVERSATION_MAX_COUNT", "1000"))
+        self.max_turns = max_turns or int(os.getenv("CONVERSATION_MAX_TURNS", "40"))
+        self.idle_ttl = idle_ttl or float(os.getenv("CONVERSATION_IDLE_TTL", "3600"))
+        self.max_bytes = max_bytes or int(os.getenv("CONVERSATION_MAX_BYTES", str(50 * 1024 * 1024)))
+
+        # conv_id -> {"messages", "bytes", "last_access"}, ordre = LRU
+        self._conversations: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._bytes = 0
+
+        self.evictions = {
+            "lru_count": 0,
+            "lru_bytes": 0,
+            "idle_ttl": 0,
+            "turns_trimmed": 0
+        }
+
+        logger.info(
+            f"Conversation store (mémoire) - max: {self.max_conversations}, "
+            f"messages: {self.max_turns}, TTL: {self.idle_ttl}s, budget: {self.max_bytes} octets"
+        )
+
+    async def get(self, conv_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Retourne l'historique d'une conversation (copie) ou None
+        """
+        entry = self._touch(conv_id)
+        if entry is None:
+            return None
+        return list(entry["messages"])
+
+    async def append(self, conv_id: str, message: Dict[str, Any]) -> bool:
+        """
+        Ajoute un message, en créant la conversation si besoin
+
+        Returns:
+            True si la conversation vient d'être créée
+        """
+        self._evict_expired()
+
+        entry = self._touch(conv_id)
+        created = entry is None
+        if created:
+            entry = {"messages": [], "bytes": 0, "last_access": time.monotonic()}
+            self._conversations[conv_id] = entry
+
+        size = message_size(message)
+        entry["messages"].append(message)
+        entry["bytes"] += size
+        self._bytes += size
+
+        # Limiter le nombre de messages (on retire les plus anciens)
+        while len(entry["messages"]) > self.max_turns:
+            removed = entry["messages"].pop(0)
+            removed_size = message_size(removed)
+            entry["bytes"] -= removed_size
+            self._bytes -= removed_size
+            self.evictions["turns_trimmed"] += 1
+
+        self._enforce_limits()
+        return created
+
+    async def delete(self, conv_id: str) -> bool:
+        """Supprime une conversation, retourne False si elle n'existe pas"""
+        return self._remove(conv_id)
+
+    def _remove(self, conv_id: str) -> bool:
+        """Retire une conversation et met à jour le compteur d'octets"""
+        entry = self._conversations.pop(conv_id, None)
+        if entry is None:
+            return False
+        self._bytes -= entry["bytes"]
+        return True
+
+    async def stats(self) -> Dict[str, Any]:
+        """Compteurs d'éviction et occupation mémoire courante"""
+        return {
+            "backend": "memory",
+            "conversations": len(self._conversations),
+            "messages": sum(len(entry["messages"]) for entry in self._conversations.values()),
+            "bytes": self._bytes,
+            "max_conversations": self.max_conversations,
+            "max_bytes": self.max_bytes,
+            "evictions": dict(self.evictions)
+        }
+
+    def _touch(self, conv_id: str) -> Optional[Dict[str, Any]]:
+        """Récupère une conversation non expirée et la marque récente"""
+        entry = self._conversations.get(conv_id)
+        if entry is None:
+            return None
+
+        now = time.monotonic()
+        if now - entry["last_access"] > self.idle_ttl:
+            self._remove(conv_id)
+            self.evictions["idle_ttl"] += 1
+            return None
+
+        entry["last_access"] = now
+        self._conversations.move_to_end(conv_id)
+        return entry
+
+    def _evict_expired(self):
+        """Retire les conversations inactives (les plus anciennes sont en tête)"""
+        now = time.monotonic()
+        while self._conversations:
+            conv_id, entry = next(iter(self._conversations.items()))
+            if now - entry["last_access"] <= self.idle_ttl:
+                break
+            self._remove(conv_id)
+            self.evictions["idle_ttl"] += 1
+
+    def _enforce_limits(self):
+        """
+        Évince en LRU jusqu'à respecter le nombre max et le budget mémoire
+        (la conversation courante, la plus récente, est toujours conservée)
+        """
+        while len(self._conversations) > self.max_conversations:
+            oldest = next(iter(self._conversations))
+            self._remove(oldest)
+            self.evictions["lru_count"] += 1
+
+        while self._bytes > self.max_bytes and len(self._conversations) > 1:
+            oldest = next(iter(self._conversations))
+            self._remove(oldest)
+            self.evictions["lru_bytes"] += 1
+
+class SQLiteConversationStore(ConversationStore):
+    """
+    Conversations persistées dans SQLite, partageables entre plusieurs
+    workers uvicorn d'une même machine:
+    - mode WAL (lectures concurrentes pendant les écritures)
+    - messages en lignes indexées par ID de conversation, les plus anciens
+      au-delà de max_turns supprimés à chaque ajout
+    - TTL d'inactivité appliqué à la lecture et purgé périodiquement
+
+    Les requêtes sqlite3 (bloquantes) sont exécutées dans un thread, avec
+    une connexion par thread; les compteurs sont mis à jour sur la boucle
+    d'événements, au retour du thread.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS conversations (
+            id TEXT PRIMARY KEY,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS turns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            conversation_id TEXT NOT NULL,
+            role TEXT NOT NULL,
+            content TEXT NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_turns_conversation ON turns (conversation_id, id);
+        CREATE INDEX IF NOT EXISTS idx_conversations_updated ON conversations (updated_at);
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        max_turns: int = None,
+        idle_ttl: float = None,
+        prune_every: int = 200
+    ):
+        self.path = path or os.getenv("CONVERSATION_DB_PATH", "conversations.db")
+        self.max_turns = max_turns or int(os.getenv("CONVERSATION_MAX_TURNS", "40"))
+        self.idle_ttl = idle_ttl or float(os.getenv("CONVERSATION_IDLE_TTL", "3600"))
+        self.prune_every = prune_every
+
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._appends = 0
+        self.evictions = {"idle_ttl": 0, "turns_trimmed": 0}
+
+        self._connect().executescript(self.SCHEMA)
+
+        logger.info(f"Conversation store (SQLite) - fichier: {self.path}, messages: {self.max_turns}, TTL: {self.idle_ttl}s")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Connexion SQLite propre au thread courant"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    async def get(self, conv_id: str) -> Optional[List[Dict[str, Any]]]:
+        return await asyncio.to_thread(self._get, conv_id)
+
+    def _get(self, conv_id: str) -> Optional[List[Dict[str, Any]]]:
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT updated_at FROM conversations WHERE id = ?", (conv_id,)
+        ).fetchone()
+        if row is None or time.time() - row[0] > self.idle_ttl:
+            return None
+
+        rows = conn.execute(
+            "SELECT role, content FROM turns WHERE conversation_id = ? ORDER BY id DESC LIMIT ?",
+            (conv_id, self.max_turns)
+        ).fetchall()
+        return [{"role": role, "content": content} for role, content in reversed(rows)]
+
+    async def append(self, conv_id: str, message: Dict[str, Any]) -> bool:
+        created, expired, trimmed = await asyncio.to_thread(self._append, conv_id, message)
+        self.evictions["idle_ttl"] += expired
+        self.evictions["turns_trimmed"] += trimmed
+
+        self._appends += 1
+        if self._appends % self.prune_every == 0:
+            await self.prune_expired()
+
+        return created
+
+    def _append(self, conv_id: str, message: Dict[str, Any]) -> Tuple[bool, int, int]:
+        """
+        Ajoute le message et retire les plus anciens au-delà de max_turns,
+        dans la même transaction
+
+        Returns:
+            (conversation créée, conversation expirée remplacée (0/1), messages retirés)
+        """
+        conn = self._connect()
+        now = time.time()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT updated_at FROM conversations WHERE id = ?", (conv_id,)
+            ).fetchone()
+
+            created = row is None or now - row[0] > self.idle_ttl
+            expired = int(row is not None and created)
+            if expired:
+                # Conversation expirée: on repart d'un historique vide
+                conn.execute("DELETE FROM turns WHERE conversation_id = ?", (conv_id,))
+
+            conn.execute(
+                "INSERT INTO conversations (id, created_at, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET updated_at = excluded.updated_at",
+                (conv_id, now, now)
+            )
+            conn.execute(
+                "INSERT INTO turns (conversation_id, role, content, created_at) VALUES (?, ?, ?, ?)",
+                (conv_id, message.get("role", "user"), str(message.get("content", "")), now)
+            )
+            trimmed = conn.execute(
+                "DELETE FROM turns WHERE conversation_id = ? AND id <= "
+                "(SELECT id FROM turns WHERE conversation_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (conv_id, conv_id, self.max_turns)
+            ).rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return created, expired, trimmed
+
+    async def delete(self, conv_id: str) -> bool:
+        return await asyncio.to_thread(self._delete, conv_id)
+
+    def _delete(self, conv_id: str) -> bool:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM turns WHERE conversation_id = ?", (conv_id,))
+            deleted = conn.execute("DELETE FROM conversations WHERE id = ?", (conv_id,)).rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return deleted > 0
+
+    async def prune_expired(self) -> int:
+        """Supprime les conversations inactives depuis plus que le TTL"""
+        pruned = await asyncio.to_thread(self._prune_expired)
+        self.evictions["idle_ttl"] += pruned
+        if pruned:
+            logger.info(f"{pruned} conversations expirées purgées")
+        return pruned
+
+    def _prune_expired(self) -> int:
+        conn = self._connect()
+        cutoff = time.time() - self.idle_ttl
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM turns WHERE conversation_id IN "
+                "(SELECT id FROM conversations WHERE updated_at < ?)",
+                (cutoff,)
+            )
+            pruned = conn.execute("DELETE FROM conversations WHERE updated_at < ?", (cutoff,)).rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return pruned
+
+    async def stats(self) -> Dict[str, Any]:
+        stats = await asyncio.to_thread(self._stats)
+        stats["evictions"] = dict(self.evictions)
+        return stats
+
+    def _stats(self) -> Dict[str, Any]:
+        conn = self._connect()
+        cutoff = time.time() - self.idle_ttl
+        conversations = conn.execute(
+            "SELECT COUNT(*) FROM conversations WHERE updated_at >= ?", (cutoff,)
+        ).fetchone()[0]
+        messages = conn.execute("SELECT COUNT(*) FROM turns").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+
+        return {
+            "backend": "sqlite",
+            "conversations": conversations,
+            "messages": messages,
+            "bytes": page_count * page_size
+        }
+
+    async def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+def create_conversation_store() -> ConversationStore:
+    """
+    Crée le stockage configuré par CONVERSATION_STORE ("memory" ou "sqlite")
+    """
+    backend = os.getenv("CONVERSATION_STORE", "memory").strip().lower()
+
+    if backend == "sqlite":
+        return SQLiteConversationStore()
+    if backend != "memory":
+        logger.warning(f"CONVERSATION_STORE inconnu: {backend}, utilisation du stockage mémoire")
+
+    return InMemoryConversationStore()
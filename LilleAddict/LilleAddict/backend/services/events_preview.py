@@ -0,0 +1,127 @@
+"""
+Aperçu des événements - Matérialisé en mémoire et rafraîchi en arrière-plan
+(stale-while-revalidate)
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import Dict, Any, Optional
+import logging
+import os
+
+from services.mcp_client import MCPClient
+
+logger = logging.getLogger(__name__)
+
+class EventsPreview:
+    """
+    Garde l'aperçu des événements du week-end prêt à servir (corps JSON
+    sérialisé + ETag fort). Une tâche de fond le revalide périodiquement
+    auprès du serveur MCP; en cas d'échec la dernière version reste servie.
+    """
+
+    def __init__(
+        self,
+        mcp_client: MCPClient,
+        refresh_interval: float = None,
+        max_age: int = None
+    ):
+        self.mcp_client = mcp_client
+        self.refresh_interval = refresh_interval or float(os.getenv("EVENTS_PREVIEW_REFRESH_INTERVAL", "300"))
+        self.max_age = max_age or int(os.getenv("EVENTS_PREVIEW_MAX_AGE", "60"))
+
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    @property
+    def cache_control(self) -> str:
+        """En-tête Cache-Control pour les navigateurs et le CDN"""
+        return f"public, max-age={self.max_age}, stale-while-revalidate={int(self.refresh_interval)}"
+
+    async def start(self):
+        """Démarre la boucle de rafraîchissement (premier chargement immédiat)"""
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Arrête la boucle de rafraîchissement"""
+        for task in (self._loop_task, self._refresh_task):
+            if task is not None:
+                task.cancel()
+        self._loop_task = None
+        self._refresh_task = None
+
+    async def _run(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.refresh_interval)
+
+    def get(self) -> Optional[Dict[str, Any]]:
+        """
+        Dernière version matérialisée ({"body", "etag", "refreshed_at"}),
+        ou None si aucune n'a encore été chargée. Ne bloque jamais: si la
+        version est plus vieille que l'intervalle, une revalidation est
+        lancée en arrière-plan.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or time.time() - snapshot["refreshed_at"] > self.refresh_interval:
+            self.trigger_refresh()
+        return snapshot
+
+    def trigger_refresh(self):
+        """Lance une revalidation en arrière-plan s'il n'y en a pas déjà une"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.refresh())
+
+    async def refresh(self) -> bool:
+        """
+        Recharge les événements depuis le serveur MCP
+
+        Returns:
+            True si l'aperçu a été mis à jour
+        """
+        try:
+            result = await self.mcp_client.call_tool("get_weekend_events", {}, use_cache=False)
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+
+        if not result.get("success"):
+            self.refresh_errors += 1
+            logger.warning(f"Rafraîchissement de l'aperçu des événements impossible: {result.get('error')}")
+            return False
+
+        data = result.get("data") or {}
+        payload = {
+            "events": data.get("events", []),
+            "week_dates": data.get("week_dates", "")
+        }
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+        now = time.time()
+        if self._snapshot is not None and self._snapshot["etag"] == etag:
+            # Données inchangées: on garde le même ETag
+            self._snapshot["refreshed_at"] = now
+        else:
+            self._snapshot = {"body": body, "etag": etag, "refreshed_at": now}
+            logger.info(f"Aperçu des événements mis à jour ({len(payload['events'])} événements, ETag {etag})")
+
+        self.refreshes += 1
+        return True
+
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        """Vérifie un en-tête If-None-Match (liste d'ETags ou *)"""
+        if not if_none_match:
+            return False
+        candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+        # Comparaison faible autorisée pour If-None-Match (préfixe W/ ignoré)
+        return "*" in candidates or any(
+            candidate.removeprefix("W/") == etag for candidate in candidates
+        )
@@ -0,0 +1,167 @@
+"""
+Health checks - Sondes asynchrones en arrière-plan avec états en cache
+"""
+
+import asyncio
+import time
+from typing import Dict, Any, Callable, Awaitable, Optional
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# États possibles d'une dépendance
+STATUS_UNKNOWN = "unknown"
+STATUS_UP = "up"
+STATUS_DEGRADED = "degraded"
+STATUS_DOWN = "down"
+
+Probe = Callable[[], Awaitable[None]]
+
+class DegradedError(Exception):
+    """Levée par une sonde: dépendance utilisable mais pas dans son état nominal"""
+
+class HealthMonitor:
+    """
+    Sonde périodiquement les dépendances (Ollama, MCP...) et garde leur
+    dernier état en mémoire, pour que /health réponde sans I/O.
+
+    Une sonde est une coroutine qui lève une exception en cas d'échec,
+    ou DegradedError si la dépendance reste utilisable (readiness conservée).
+    """
+
+    def __init__(
+        self,
+        interval: float = None,
+        timeout: float = None,
+        degraded_latency: float = None,
+        failure_threshold: int = None
+    ):
+        self.interval = interval or float(os.getenv("HEALTH_PROBE_INTERVAL", "10"))
+        self.timeout = timeout or float(os.getenv("HEALTH_PROBE_TIMEOUT", "2"))
+        self.degraded_latency = degraded_latency or float(os.getenv("HEALTH_DEGRADED_LATENCY_MS", "1000"))
+        self.failure_threshold = failure_threshold or int(os.getenv("HEALTH_FAILURE_THRESHOLD", "2"))
+
+        self._probes: Dict[str, Probe] = {}
+        self._required: Dict[str, bool] = {}
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.started_at = time.time()
+
+    def register(self, name: str, probe: Probe, required: bool = True):
+        """
+        Enregistre une dépendance à sonder
+
+        Args:
+            name: Nom de la dépendance (ex: "ollama")
+            probe: Coroutine qui lève une exception si la dépendance est KO
+            required: Si False, la dépendance n'entre pas dans la readiness
+        """
+        self._probes[name] = probe
+        self._required[name] = required
+        self._states[name] = {
+            "status": STATUS_UNKNOWN,
+            "latency_ms": None,
+            "last_error": None,
+            "last_check": None,
+            "consecutive_failures": 0
+        }
+
+    async def start(self):
+        """Démarre la boucle de sondes en arrière-plan"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Arrête la boucle de sondes"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        """Boucle de sondes (la première passe est immédiate)"""
+        while True:
+            await self.probe_all()
+            await asyncio.sleep(self.interval)
+
+    async def probe_all(self):
+        """Exécute toutes les sondes en parallèle et met à jour le cache"""
+        await asyncio.gather(*(self._probe_one(name) for name in self._probes))
+
+    async def _probe_one(self, name: str):
+        """Exécute une sonde et met à jour l'état de la dépendance"""
+        state = self._states[name]
+        start = time.perf_counter()
+
+        try:
+            await asyncio.wait_for(self._probes[name](), timeout=self.timeout)
+            latency_ms = (time.perf_counter() - start) * 1000
+
+            state["consecutive_failures"] = 0
+            state["last_error"] = None
+            state["latency_ms"] = round(latency_ms, 1)
+            state["status"] = STATUS_DEGRADED if latency_ms > self.degraded_latency else STATUS_UP
+
+        except DegradedError as e:
+            state["consecutive_failures"] = 0
+            state["last_error"] = str(e) or type(e).__name__
+            state["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            state["status"] = STATUS_DEGRADED
+
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            state["consecutive_failures"] += 1
+            state["last_error"] = error
+            state["latency_ms"] = None
+
+            # Un échec isolé après un succès = dégradé, puis down
+            was_reachable = state["status"] in (STATUS_UP, STATUS_DEGRADED)
+            if was_reachable and state["consecutive_failures"] < self.failure_threshold:
+                state["status"] = STATUS_DEGRADED
+            else:
+                state["status"] = STATUS_DOWN
+
+            logger.warning(f"Health {name}: {state['status']} ({error})")
+
+        state["last_check"] = time.time()
+
+    def status(self, name: str) -> str:
+        """Dernier état connu d'une dépendance"""
+        return self._states[name]["status"]
+
+    def is_ready(self) -> bool:
+        """Toutes les dépendances requises sont joignables (up ou dégradées)"""
+        return all(
+            state["status"] in (STATUS_UP, STATUS_DEGRADED)
+            for name, state in self._states.items()
+            if self._required[name]
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Vue complète depuis le cache (aucun appel réseau)
+
+        Returns:
+            {"status": "ok|degraded|down", "dependencies": {...}}
+        """
+        statuses = [state["status"] for state in self._states.values()]
+
+        if all(status == STATUS_UP for status in statuses):
+            overall = "ok"
+        elif self.is_ready():
+            overall = "degraded"
+        else:
+            overall = "down"
+
+        return {
+            "status": overall,
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "dependencies": {
+                name: dict(state, required=self._required[name])
+                for name, state in self._states.items()
+            }
+        }
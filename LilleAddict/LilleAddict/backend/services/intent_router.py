@@ -0,0 +1,199 @@
+"""
+Pré-routage des intentions - Choix direct du tool pour les questions évidentes,
+sans passer par le tour de sélection d'Ollama
+"""
+
+import re
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+import os
+
+from services.tool_catalog import PARAMETER_EXAMPLES
+from utils.text import normalize_text
+
+logger = logging.getLogger(__name__)
+
+WEATHER = re.compile(r"\b(meteo|quel temps|temps qu il (fait|fera)|pleuvoir|pleut|pluie|soleil|temperature|previsions?)\b")
+RAIN_PLAN = re.compile(r"\b(s il pleut|quand il pleut|en cas de pluie|a l abri|en interieur|activites? interieures?)\b")
+OUTDOOR = re.compile(r"\b(plein air|en exterieur|activites? exterieures?|s il fait beau|quand il fait beau|parcs?)\b")
+WEEKEND = re.compile(r"\b(ce week end|ce weekend|cette semaine|evenements?|sorties?)\b")
+WHAT_TO_DO = re.compile(r"\b(que faire|quoi faire|on fait quoi)\b")
+RESTAURANT = re.compile(r"\b(restaurants?|resto|restos|manger|diner|dejeuner|cuisine)\b")
+BAR = re.compile(r"\b(bars?|boire un verre|prendre un verre|cocktails?|bieres?|pub)\b")
+CHEAP = re.compile(r"\b(pas cher|petit prix|bon marche|economique)\b")
+EXPENSIVE = re.compile(r"\b(gastronomique|haut de gamme|chic)\b")
+DAYS = re.compile(r"\b([1-7]) (jours?|prochains jours)\b")
+
+class IntentRouter:
+    """
+    Classifieur à base de mots-clés qui propose directement les tool calls
+    pour les intentions évidentes (météo, week-end, pluie, restaurant d'une
+    cuisine donnée...). Chaque intention a une confiance: si l'une des
+    intentions détectées est sous le seuil, on laisse Ollama choisir.
+    """
+
+    def __init__(
+        self,
+        tools: List[Dict[str, Any]],
+        threshold: float = None,
+        enabled: bool = None
+    ):
+        self.threshold = threshold or float(os.getenv("INTENT_ROUTER_THRESHOLD", "0.8"))
+        if enabled is None:
+            enabled = os.getenv("INTENT_ROUTER_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+        self.enabled = enabled
+
+        self.stats: Dict[str, Any] = {
+            "routed": 0,
+            "fallback_low_confidence": 0,
+            "fallback_no_intent": 0,
+            "by_tool": {}
+        }
+
+        self.set_tools(tools)
+
+        logger.info(f"Pré-routeur d'intentions - activé: {self.enabled}, seuil: {self.threshold}")
+
+    def set_tools(self, tools: List[Dict[str, Any]]):
+        """
+        Charge le schéma des tools: noms disponibles, paramètres acceptés
+        et vocabulaire extrait des exemples des descriptions
+        """
+        self.parameters: Dict[str, set] = {}
+        self.vocabulary: Dict[str, Dict[str, List[Tuple[str, str]]]] = {}
+
+        for tool in tools:
+            function = tool.get("function", {})
+            properties = function.get("parameters", {}).get("properties", {})
+            self.parameters[function.get("name")] = set(properties)
+            self.vocabulary[function.get("name")] = {
+                name: self._examples(spec.get("description", ""))
+                for name, spec in properties.items()
+            }
+
+    @staticmethod
+    def _examples(description: str) -> List[Tuple[str, str]]:
+        """
+        Exemples d'une description sous forme (forme normalisée, forme
+        d'origine), les plus longs d'abord
+        """
+        match = PARAMETER_EXAMPLES.search(description)
+        if not match:
+            return []
+        examples = {}
+        for example in match.group(1).split(","):
+            normalized = normalize_text(example)
+            if normalized and normalized != "etc":
+                examples[normalized] = example.strip()
+        return sorted(examples.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def _find(self, text: str, tool: str, parameter: str) -> Optional[str]:
+        """
+        Terme du vocabulaire d'un paramètre cité en premier dans le texte
+        (accords féminin/pluriel acceptés: -e, -s, -es, -ne, -nes), renvoyé
+        sous sa forme d'origine car le serveur MCP filtre sur les libellés
+        accentués
+        """
+        best: Optional[Tuple[int, str]] = None
+        for normalized, original in self.vocabulary.get(tool, {}).get(parameter, []):
+            match = re.search(rf"\b{re.escape(normalized)}(e|s|es|ne|nes)?\b", text)
+            # À position égale, le terme le plus long (listé en premier) l'emporte
+            if match and (best is None or match.start() < best[0]):
+                best = (match.start(), original)
+        return best[1] if best else None
+
+    def route(self, message: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Propose les tool calls pour un message
+
+        Returns:
+            Tool calls au format Ollama ({"function": {"name", "arguments"}}),
+            ou None pour laisser Ollama décider
+        """
+        if not self.enabled:
+            return None
+
+        text = normalize_text(message)
+        candidates = self._classify(text)
+
+        # Ne garder que les tools réellement exposés
+        candidates = [c for c in candidates if c["name"] in self.parameters]
+
+        if not candidates:
+            self.stats["fallback_no_intent"] += 1
+            return None
+
+        if min(c["confidence"] for c in candidates) < self.threshold:
+            self.stats["fallback_low_confidence"] += 1
+            logger.debug(f"Pré-routage incertain ({candidates}), sélection par Ollama")
+            return None
+
+        self.stats["routed"] += 1
+        calls = []
+        for candidate in candidates:
+            name = candidate["name"]
+            self.stats["by_tool"][name] = self.stats["by_tool"].get(name, 0) + 1
+            arguments = {
+                key: value for key, value in candidate["arguments"].items()
+                if key in self.parameters[name] and value is not None
+            }
+            calls.append({"function": {"name": name, "arguments": arguments}})
+
+        logger.info(f"Pré-routage: {[call['function']['name'] for call in calls]}")
+        return calls
+
+    def _classify(self, text: str) -> List[Dict[str, Any]]:
+        """Intentions détectées avec leurs arguments et leur confiance"""
+        candidates: List[Dict[str, Any]] = []
+
+        def add(name: str, confidence: float, **arguments):
+            candidates.append({"name": name, "confidence": confidence, "arguments": arguments})
+
+        rain_plan = RAIN_PLAN.search(text)
+
+        # Météo explicite (pas seulement "s'il pleut" dans un plan d'activités)
+        if WEATHER.search(text) and not rain_plan:
+            days = DAYS.search(text)
+            if days:
+                add("get_weather_forecast", 0.9, days=int(days.group(1)))
+            elif "demain" in text:
+                add("get_weather_forecast", 0.9, days=2)
+            else:
+                add("get_weather_forecast", 0.9, days=3)
+
+        if rain_plan:
+            add("get_indoor_activities", 0.9)
+            add("get_weather_forecast", 0.85, days=3)
+
+        if OUTDOOR.search(text):
+            add("get_outdoor_activities", 0.85)
+
+        if WEEKEND.search(text):
+            add("get_weekend_events", 0.9)
+        elif WHAT_TO_DO.search(text) and not rain_plan and not OUTDOOR.search(text):
+            add("get_weekend_events", 0.7)
+
+        if RESTAURANT.search(text):
+            cuisine = self._find(text, "search_restaurants", "cuisine")
+            diet = self._find(text, "search_restaurants", "diet")
+            price_range = "€" if CHEAP.search(text) else ("€€€" if EXPENSIVE.search(text) else None)
+            location = self._find(text, "search_restaurants", "location")
+            # Sans critère, Ollama est plus à même de compléter les arguments
+            confidence = 0.9 if (cuisine or diet) else 0.6
+            add(
+                "search_restaurants", confidence,
+                cuisine=cuisine, diet=diet, price_range=price_range, location=location
+            )
+
+        if BAR.search(text):
+            drink_type = self._find(text, "search_bars", "drink_type")
+            activity = self._find(text, "search_bars", "activity")
+            atmosphere = self._find(text, "search_bars", "atmosphere")
+            location = self._find(text, "search_bars", "location")
+            confidence = 0.85 if (drink_type or activity or atmosphere) else 0.7
+            add(
+                "search_bars", confidence,
+                drink_type=drink_type, activity=activity, atmosphere=atmosphere, location=location
+            )
+
+        return candidates
@@ -2,182 +2,452 @@
 Client MCP - Gestion des appels aux tools du serveur MCP
 """
 
+import asyncio
 import httpx
-from typing import Dict, Any, List, Optional
+import json
+from typing import Dict, Any, List, Optional, Tuple, Union
 import logging
 import os
+import time
+
+from utils.http import create_async_client
+from utils.cache import TTLCache
+from services.answer_cache import ToolDataVersions
+from services.tool_catalog import ToolCatalog
+from utils.metrics import MCP_TOOL_CALLS, MCP_TOOL_DURATION
 
 logger = logging.getLogger(__name__)
 
+# TTL par défaut (secondes) du cache de résultats, selon la fraîcheur des données
+DEFAULT_TOOL_TTLS = {
+    "get_weekend_events": 600,
+    "get_weather_forecast": 300,
+    "search_restaurants": 1800,
+    "search_bars": 1800,
+    "get_indoor_activities": 3600,
+    "get_outdoor_activities": 3600
+}
+
+# Marge ajoutée côté client au timeout par appel transmis au serveur
+# (/tools/batch), pour recevoir sa réponse plutôt que couper la requête
+BATCH_TIMEOUT_GRACE = 1.0
+
 class MCPClient:
     """Client pour communiquer avec le serveur MCP"""
     
-    def __init__(self, base_url: str = None):
+    def __init__(
+        self,
+        base_url: str = None,
+        data_versions: ToolDataVersions = None,
+        catalog: ToolCatalog = None
+    ):
         self.base_url = base_url or os.getenv("MCP_URL", "http://localhost:8001")
+        
+        # Définitions des tools: manifeste du serveur MCP, dernière copie sur disque en attendant
+        # (catalogue vide sinon: la readiness reste à 503 jusqu'au premier manifeste)
+        self.catalog = catalog or ToolCatalog()
+        self.manifest_refresh_interval = float(os.getenv("MCP_MANIFEST_REFRESH_INTERVAL", "300"))
+        self._manifest_etag: Optional[str] = None
+        self._manifest_task: Optional[asyncio.Task] = None
+        
+        # Versions des données des tools (invalidation du cache de réponses)
+        self.data_versions = data_versions
+        
+        # Cache des résultats + requêtes en cours (single-flight)
+        self.cache_enabled = os.getenv("MCP_CACHE_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+        self.default_ttl = float(os.getenv("MCP_CACHE_TTL", "300"))
+        self._cache = TTLCache(int(os.getenv("MCP_CACHE_MAX_ENTRIES", "256")), self.default_ttl)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+        
+        # /tools/batch inconnu du serveur (404, serveur MCP plus ancien): appels
+        # un par un jusqu'à cette date, puis nouvel essai (déploiement progressif)
+        self.batch_retry_interval = float(os.getenv("MCP_BATCH_RETRY_INTERVAL", "300"))
+        self._batch_unsupported_until = 0.0
+        
+        # Client HTTP partagé (créé au démarrage de l'application)
+        self._http: Optional[httpx.AsyncClient] = None
+        
         logger.info(f"MCP client initialisé - URL: {self.base_url}")
     
-    def is_available(self) -> bool:
-        """Vérifie si le serveur MCP est disponible"""
-        try:
-            import httpx
-            response = httpx.get(f"{self.base_url}/health", timeout=5.0)
-            return response.status_code == 200
-        except:
-            return False
+    async def start(self):
+        """
+        Crée le client HTTP partagé (pool de connexions keep-alive) et lance
+        le suivi du manifeste des tools (premier chargement immédiat)
+        """
+        if self._http is None:
+            self._http = create_async_client("MCP", timeout=30.0)
+        if self._manifest_task is None:
+            self._manifest_task = asyncio.create_task(self._watch_manifest())
+    
+    async def close(self):
+        """Arrête le suivi du manifeste, ferme le client HTTP partagé et ses connexions"""
+        if self._manifest_task is not None:
+            self._manifest_task.cancel()
+            self._manifest_task = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+    
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Client HTTP partagé, créé à la demande si start() n'a pas été appelé"""
+        if self._http is None:
+            self._http = create_async_client("MCP", timeout=30.0)
+        return self._http
+    
+    async def probe(self):
+        """
+        Sonde de santé: lève une exception si le serveur MCP ne répond pas
+        """
+        response = await self.http.get(f"{self.base_url}/health", timeout=5.0)
+        response.raise_for_status()
     
     def get_available_tools(self) -> List[Dict[str, Any]]:
         """
         Retourne la liste des tools disponibles au format Ollama
         
         Returns:
-            Liste des définitions de tools
-        """
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_weekend_events",
-                    "description": "Récupère la liste des événements à faire à Lille ce week-end. Utilise ce tool quand l'utilisateur demande ce qu'il peut faire ce week-end, les événements de la semaine, ou les sorties à Lille.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "search_restaurants",
-                    "description": "Recherche des restaurants à Lille selon des critères spécifiques. Utilise ce tool quand l'utilisateur cherche un restaurant avec des préférences de cuisine, régime alimentaire ou gamme de prix.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "cuisine": {
-                                "type": "string",
-                                "description": "Type de cuisine recherchée (ex: italien, japonais, français, mexicain, indien, chinois, thaï, coréen, végétarien, etc.)"
-                            },
-                            "diet": {
-                                "type": "string",
-                                "description": "Régime alimentaire spécifique (ex: végétarien, vegan, sans gluten, halal)"
-                            },
-                            "price_range": {
-                                "type": "string",
-                                "description": "Gamme de prix (€ pour pas cher, €€ pour moyen, €€€ pour cher)"
-                            },
-                            "atmosphere": {
-                                "type": "string",
-                                "description": "Type d'ambiance recherchée (ex: terrasse, romantique, groupe, familial, branché)"
-                            },
-                            "location": {
-                                "type": "string",
-                                "description": "Quartier ou ville spécifique (ex: Vieux-Lille, Wazemmes, Roubaix)"
-                            }
-                        }
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "search_bars",
-                    "description": "Recherche des bars à Lille selon des critères. Utilise ce tool quand l'utilisateur cherche un bar, un endroit pour boire un verre, ou une activité de soirée.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "drink_type": {
-                                "type": "string",
-                                "description": "Type de boisson (ex: cocktail, bière, vin, café, thé, chocolat chaud)"
-                            },
-                            "activity": {
-                                "type": "string",
-                                "description": "Activité disponible (ex: billard, babyfoot, fléchettes, jeux de société, karaoké, concert, quiz)"
-                            },
-                            "atmosphere": {
-                                "type": "string",
-                                "description": "Ambiance recherchée (ex: calme, animé, terrasse, cosy, branché, jazz, rock)"
-                            },
-                            "location": {
-                                "type": "string",
-                                "description": "Quartier ou ville (ex: centre Lille, Vieux-Lille, Wazemmes)"
-                            }
-                        }
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_weather_forecast",
-                    "description": "Récupère les prévisions météo pour Lille. Utilise ce tool quand l'utilisateur pose une question sur la météo ou demande des activités adaptées au temps qu'il va faire.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "days": {
-                                "type": "integer",
-                                "description": "Nombre de jours de prévisions (1-7)",
-                                "default": 3
-                            }
-                        }
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_indoor_activities",
-                    "description": "Récupère les activités en intérieur à Lille. Utilise ce tool quand l'utilisateur demande quoi faire s'il pleut, ou des activités à l'abri.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_outdoor_activities",
-                    "description": "Récupère les activités en extérieur à Lille. Utilise ce tool quand l'utilisateur demande des activités de plein air, parcs, terrasses.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                }
-            }
-        ]
+            Liste des définitions de tools (partagée: ne pas la modifier)
+        """
+        return self.catalog.tools
     
-    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    async def _watch_manifest(self):
+        """Recharge le manifeste au démarrage puis le revalide périodiquement"""
+        while True:
+            await self.refresh_manifest()
+            await asyncio.sleep(self.manifest_refresh_interval)
+    
+    async def refresh_manifest(self) -> bool:
+        """
+        Revalide le manifeste des tools auprès du serveur MCP (requête
+        conditionnelle: 304 tant que sa version ne change pas). En cas
+        d'échec, les définitions courantes restent en place.
+        
+        Returns:
+            True si les définitions ont changé
+        """
+        headers = {"If-None-Match": self._manifest_etag} if self._manifest_etag else {}
+        
+        try:
+            response = await self.http.get(f"{self.base_url}/tools/manifest", headers=headers, timeout=5.0)
+            
+            if response.status_code == 304:
+                return False
+            response.raise_for_status()
+            
+            manifest = response.json()
+            self._manifest_etag = response.headers.get("ETag")
+            return self.catalog.update(manifest["tools"], manifest["version"])
+            
+        except Exception as e:
+            logger.warning(f"Manifeste des tools indisponible ({str(e) or type(e).__name__}), tools {self.catalog.version} conservés")
+            return False
+    
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
         """
         Appelle un tool MCP
         
+        Les résultats réussis sont gardés en cache pendant le TTL du tool, et
+        les appels identiques simultanés partagent une seule requête HTTP.
+        Le résultat renvoyé peut être partagé: ne pas le modifier.
+        
         Args:
             tool_name: Nom du tool à appeler
             arguments: Arguments du tool
+            use_cache: False pour forcer un appel au serveur (rafraîchissement)
             
         Returns:
             Résultat du tool
         """
+        key = self._cache_key(tool_name, arguments)
+        
+        if use_cache and self.cache_enabled:
+            cached = self._cache.get(key)
+            if cached is not None:
+                logger.debug(f"MCP tool {tool_name} - Cache hit")
+                MCP_TOOL_CALLS.labels(tool_name, "cache").inc()
+                return cached
+        
+        # Requête identique déjà en cours: on attend son résultat
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            logger.debug(f"MCP tool {tool_name} - Requête partagée avec un appel en cours")
+        else:
+            task = asyncio.ensure_future(self._fetch_tool(key, tool_name, arguments))
+            self._track_inflight(key, task)
+        
+        # shield: l'annulation d'un appelant (timeout) n'annule pas la requête partagée
+        result, _ = await asyncio.shield(task)
+        return result
+    
+    async def call_tools(
+        self,
+        calls: List[Dict[str, Any]],
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+        limit: Optional[asyncio.Semaphore] = None,
+        with_durations: bool = False
+    ) -> Union[List[Dict[str, Any]], Tuple[List[Dict[str, Any]], List[float]]]:
+        """
+        Appelle plusieurs tools MCP en un seul aller-retour (/tools/batch)
+        
+        Les résultats en cache et les appels déjà en cours sont réutilisés
+        comme dans call_tool; seuls les appels restants (dédoublonnés) sont
+        envoyés au serveur, qui les exécute en parallèle. Si le serveur ne
+        connaît pas /tools/batch, chaque appel passe par sa route dédiée.
+        
+        Args:
+            calls: Appels {"name", "arguments"}
+            timeout: Timeout par appel (secondes), appliqué par le serveur
+            use_cache: False pour forcer un appel au serveur (rafraîchissement)
+            limit: Sémaphore borné par les requêtes HTTP envoyées (une par
+                batch, une par appel sans /tools/batch), None sans limite
+            with_durations: True pour renvoyer aussi la durée de chaque appel
+            
+        Returns:
+            Un résultat par appel, dans l'ordre. Un appel en erreur ou en
+            timeout produit un résultat {"success": False, ...}.
+            Avec with_durations: (résultats, durées en secondes), la durée
+            d'un appel étant celle mesurée par le serveur dans un batch,
+            l'aller-retour de sa requête sinon, 0 pour un résultat en cache.
+        """
+        started = time.monotonic()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+        durations: List[float] = [0.0] * len(calls)
+        waiting: Dict[int, asyncio.Future] = {}
+        pending: Dict[str, Dict[str, Any]] = {}
+        
+        for index, call in enumerate(calls):
+            tool_name, arguments = call["name"], call.get("arguments") or {}
+            key = self._cache_key(tool_name, arguments)
+            
+            if use_cache and self.cache_enabled:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    logger.debug(f"MCP tool {tool_name} - Cache hit")
+                    MCP_TOOL_CALLS.labels(tool_name, "cache").inc()
+                    results[index] = cached
+                    continue
+            
+            if key in pending:
+                continue
+            task = self._inflight.get(key)
+            if task is not None:
+                self.coalesced += 1
+                logger.debug(f"MCP tool {tool_name} - Requête partagée avec un appel en cours")
+                continue
+            pending[key] = {"name": tool_name, "arguments": arguments}
+        
+        batch_supported = time.monotonic() >= self._batch_unsupported_until
+        if len(pending) == 1 or (pending and not batch_supported):
+            for key, call in pending.items():
+                self._track_inflight(key, asyncio.ensure_future(
+                    self._limited(limit, self._fetch_tool(key, call["name"], call["arguments"]))
+                ))
+        elif pending:
+            loop = asyncio.get_running_loop()
+            futures = {key: loop.create_future() for key in pending}
+            for key, future in futures.items():
+                self._track_inflight(key, future)
+            asyncio.ensure_future(self._fetch_batch(pending, futures, timeout, limit))
+        
+        for index, call in enumerate(calls):
+            if results[index] is None:
+                waiting[index] = self._inflight[self._cache_key(call["name"], call.get("arguments") or {})]
+        
+        async def wait(index: int, future: asyncio.Future) -> Tuple[Dict[str, Any], float]:
+            tool_name = calls[index]["name"]
+            try:
+                # shield: un timeout ici n'annule pas la requête partagée
+                if timeout:
+                    return await asyncio.wait_for(asyncio.shield(future), timeout=timeout + BATCH_TIMEOUT_GRACE)
+                return await asyncio.shield(future)
+            except asyncio.TimeoutError:
+                logger.error(f"Timeout lors de l'appel du tool {tool_name}")
+                return {
+                    "success": False,
+                    "error": f"Le tool {tool_name} a pris trop de temps à répondre."
+                }, time.monotonic() - started
+        
+        done = await asyncio.gather(*(wait(index, future) for index, future in waiting.items()))
+        for index, (result, duration) in zip(waiting, done):
+            results[index] = result
+            durations[index] = duration
+        if with_durations:
+            return results, durations
+        return results
+    
+    @staticmethod
+    async def _limited(limit: Optional[asyncio.Semaphore], coroutine):
+        """Exécute la coroutine en occupant une place du sémaphore (sans limite si None)"""
+        if limit is None:
+            return await coroutine
+        async with limit:
+            return await coroutine
+    
+    def _track_inflight(self, key: str, future: asyncio.Future):
+        """Enregistre une requête en cours (résolue en (résultat, durée)), retirée à sa fin"""
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+    
+    async def _fetch_batch(
+        self,
+        pending: Dict[str, Dict[str, Any]],
+        futures: Dict[str, asyncio.Future],
+        timeout: Optional[float],
+        limit: Optional[asyncio.Semaphore] = None
+    ):
+        """
+        Envoie les appels au serveur en une requête /tools/batch et résout la
+        future de chacun; repli sur les routes dédiées si le batch est inconnu
+        """
+        started = time.monotonic()
+        try:
+            batch = await self._limited(limit, self._request_batch(list(pending.values()), timeout))
+            
+            if batch is None:
+                results = await asyncio.gather(*(
+                    self._limited(limit, self._fetch_tool(key, call["name"], call["arguments"]))
+                    for key, call in pending.items()
+                ))
+            else:
+                # Durée de chaque tool mesurée par le serveur, aller-retour à défaut
+                round_trip = time.monotonic() - started
+                results = [
+                    (result, duration if duration is not None else round_trip)
+                    for result, duration in zip(*batch)
+                ]
+                for (key, call), (result, duration) in zip(pending.items(), results):
+                    MCP_TOOL_DURATION.labels(call["name"]).observe(duration)
+                    self._store_result(key, call["name"], result)
+            
+            for future, result in zip(futures.values(), results):
+                if not future.done():
+                    future.set_result(result)
+            
+            # Appel resté sans résultat: jamais laissé en attente
+            for future in futures.values():
+                if not future.done():
+                    future.set_result(({"success": False, "error": "Aucun résultat du serveur MCP pour cet appel."}, time.monotonic() - started))
+        
+        except Exception as e:
+            logger.error(f"Erreur inattendue lors du batch de tools: {str(e)}")
+            for future in futures.values():
+                if not future.done():
+                    future.set_result(({"success": False, "error": str(e)}, time.monotonic() - started))
+    
+    async def _request_batch(
+        self,
+        calls: List[Dict[str, Any]],
+        timeout: Optional[float]
+    ) -> Optional[Tuple[List[Dict[str, Any]], List[Optional[float]]]]:
+        """
+        Requête HTTP /tools/batch. Les erreurs sont renvoyées comme résultat
+        de chaque appel; None si le serveur ne propose pas /tools/batch.
+        
+        Returns:
+            (résultats, durée de chaque appel côté serveur en secondes ou None)
+        """
+        names = [call["name"] for call in calls]
+        
+        def failed(error: str) -> Tuple[List[Dict[str, Any]], List[Optional[float]]]:
+            return [{"success": False, "error": error} for _ in calls], [None] * len(calls)
+        
+        try:
+            logger.info(f"Appel MCP batch: {names}")
+            
+            payload: Dict[str, Any] = {"calls": calls}
+            options: Dict[str, Any] = {}
+            if timeout:
+                payload["timeout"] = timeout
+                options["timeout"] = timeout + BATCH_TIMEOUT_GRACE
+            
+            response = await self.http.post(f"{self.base_url}/tools/batch", json=payload, **options)
+            
+            if response.status_code in (404, 405):
+                logger.warning(f"Le serveur MCP ne propose pas /tools/batch, appels un par un pendant {self.batch_retry_interval}s")
+                self._batch_unsupported_until = time.monotonic() + self.batch_retry_interval
+                return None
+            
+            if response.status_code != 200:
+                logger.error(f"Erreur MCP: {response.status_code} - {response.text}")
+                return failed(f"HTTP {response.status_code}: {response.text}")
+            
+            items = response.json().get("results")
+            if not isinstance(items, list) or len(items) != len(calls) or not all(isinstance(item, dict) for item in items):
+                # Résultats impossibles à rattacher à leurs appels
+                logger.error(f"Réponse MCP batch invalide pour {names}: {response.text[:200]}")
+                return failed(f"Réponse invalide du serveur MCP ({len(calls)} résultats attendus).")
+            
+            results = [
+                {"success": item.get("success", False), "data": item.get("data"), "error": item.get("error")}
+                for item in items
+            ]
+            durations = [
+                item["duration_ms"] / 1000 if isinstance(item.get("duration_ms"), (int, float)) else None
+                for item in items
+            ]
+            logger.info(f"MCP batch {names} - Success: {[result['success'] for result in results]}")
+            return results, durations
+        
+        except httpx.ConnectError:
+            logger.error("Impossible de se connecter au serveur MCP")
+            return failed("Le serveur MCP n'est pas accessible. Vérifie qu'il est démarré sur le port 8001.")
+        
+        except httpx.TimeoutException:
+            logger.error(f"Timeout lors du batch de tools {names}")
+            return failed("Les tools ont pris trop de temps à répondre.")
+        
+        except Exception as e:
+            logger.error(f"Erreur inattendue lors du batch de tools {names}: {str(e)}")
+            return failed(str(e))
+    
+    async def _fetch_tool(self, key: str, tool_name: str, arguments: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+        """Appelle le tool sur le serveur MCP et met en cache un résultat réussi: (résultat, durée)"""
+        started = time.monotonic()
+        result = await self._request_tool(tool_name, arguments)
+        duration = time.monotonic() - started
+        MCP_TOOL_DURATION.labels(tool_name).observe(duration)
+        self._store_result(key, tool_name, result)
+        return result, duration
+    
+    def _store_result(self, key: str, tool_name: str, result: Dict[str, Any]):
+        """Compte le résultat et met en cache un résultat réussi"""
+        MCP_TOOL_CALLS.labels(tool_name, "success" if result.get("success") else "error").inc()
+        
+        if result.get("success"):
+            if self.cache_enabled:
+                self._cache.set(key, result, ttl=self.tool_ttl(tool_name))
+            if self.data_versions is not None:
+                self.data_versions.observe(tool_name, result.get("data"))
+    
+    async def _request_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Requête HTTP vers le tool, les erreurs sont renvoyées comme résultat"""
         try:
             logger.info(f"Appel MCP tool: {tool_name} avec args: {arguments}")
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/tools/{tool_name}",
-                    json={"arguments": arguments}
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"Erreur MCP: {response.status_code} - {response.text}")
-                    return {
-                        "success": False,
-                        "error": f"HTTP {response.status_code}: {response.text}"
-                    }
-                
-                data = response.json()
-                logger.info(f"MCP tool {tool_name} - Success: {data.get('success')}")
-                return data
+            response = await self.http.post(
+                f"{self.base_url}/tools/{tool_name}",
+                json={"arguments": arguments}
+            )
+            
+            if response.status_code != 200:
+                logger.error(f"Erreur MCP: {response.status_code} - {response.text}")
+                return {
+                    "success": False,
+                    "error": f"HTTP {response.status_code}: {response.text}"
+                }
+            
+            data = response.json()
+            logger.info(f"MCP tool {tool_name} - Success: {data.get('success')}")
+            return data
                 
         except httpx.ConnectError:
             logger.error("Impossible de se connecter au serveur MCP")
@@ -200,19 +470,42 @@ class MCPClient:
                 "error": str(e)
             }
     
+    def tool_ttl(self, tool_name: str) -> float:
+        """
+        TTL du cache pour un tool: MCP_CACHE_TTL_<TOOL> si défini, sinon la
+        valeur par défaut du tool, sinon MCP_CACHE_TTL
+        """
+        override = os.getenv(f"MCP_CACHE_TTL_{tool_name.upper()}")
+        if override is not None:
+            return float(override)
+        return DEFAULT_TOOL_TTLS.get(tool_name, self.default_ttl)
+    
+    @staticmethod
+    def _cache_key(tool_name: str, arguments: Dict[str, Any]) -> str:
+        """Clé canonique: nom du tool + arguments triés, sans valeurs nulles"""
+        canonical = {key: value for key, value in (arguments or {}).items() if value is not None}
+        return tool_name + ":" + json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Compteurs du cache de résultats de tools"""
+        return {
+            "enabled": self.cache_enabled,
+            **self._cache.stats(),
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight)
+        }
+    
     async def test_connection(self) -> bool:
         """Teste la connexion au serveur MCP"""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.base_url}/health")
-                return response.status_code == 200
+            await self.probe()
+            return True
         except:
             return False
     
     async def list_tools(self) -> List[str]:
         """Liste les tools disponibles"""
-        tools = self.get_available_tools()
-        return [tool["function"]["name"] for tool in tools]
+        return self.catalog.names
 
 
 # ====================================
@@ -241,5 +534,7 @@ if __name__ == "__main__":
             if result.get('success'):
                 data = result.get('data', {})
                 print(f"Nombre d'événements: {len(data.get('events', []))}")
+        
+        await client.close()
     
     asyncio.run(test())
@@ -2,25 +2,72 @@
 Client Ollama - Gestion des requêtes au modèle IA local
 """
 
+import asyncio
 import httpx
-from typing import List, Dict, Any, Optional
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
+import json
 import logging
 import os
+import time
+
+from utils.http import create_async_client
+from services.context_window import ContextWindow
+from services.admission import AdmissionController, PRIORITY_DEFAULT
+from services.ollama_pool import OllamaPool, OllamaEndpoint
+from services.tool_formatter import ToolResultFormatter
+from services.tool_catalog import ToolCatalog
+from services import tracing
+from utils.metrics import observe_generation
 
 logger = logging.getLogger(__name__)
 
+class ModelNotLoadedError(Exception):
+    """Ollama répond mais le modèle n'est chargé en mémoire sur aucune instance"""
+
 class OllamaClient:
     """Client pour communiquer avec Ollama"""
     
     def __init__(
         self,
         base_url: str = None,
-        model: str = None
+        model: str = None,
+        urls: List[str] = None,
+        keep_alive: str = None,
+        context_window: ContextWindow = None,
+        admission: AdmissionController = None,
+        tool_catalog: ToolCatalog = None
     ):
         self.base_url = base_url or os.getenv("OLLAMA_URL", "http://localhost:11434")
+        
+        # Plusieurs instances (OLLAMA_URLS="http://a:11434,http://b:11434"),
+        # sinon la seule instance OLLAMA_URL
+        urls = urls or [url.strip() for url in os.getenv("OLLAMA_URLS", "").split(",") if url.strip()]
+        self.pool = OllamaPool(urls or [self.base_url])
+        self.base_url = self.pool.endpoints[0].url
+        
         self.model = model or os.getenv("OLLAMA_MODEL", "llama3.2")
         
-        self.system_prompt = """Tu es un assistant intelligent pour découvrir Lille et sa région.
+        # Durée pendant laquelle Ollama garde le modèle en mémoire après une
+        # requête ("30m", "1h", ou -1 pour ne jamais le décharger)
+        keep_alive = keep_alive or os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+        self.keep_alive = int(keep_alive) if keep_alive.lstrip("-").isdigit() else keep_alive
+        
+        # Budget de tokens appliqué à l'historique envoyé
+        self.context_window = context_window or ContextWindow()
+        
+        # Résultats de tools compacts, classés par pertinence, bornés en tokens
+        self.formatter = ToolResultFormatter(self.context_window.estimate_tokens)
+        
+        # Générations simultanées limitées au parallélisme d'Ollama (par instance)
+        self.admission = admission or AdmissionController(
+            max_concurrency=int(os.getenv("OLLAMA_MAX_CONCURRENCY", "2")) * len(self.pool.endpoints)
+        )
+        
+        # Définitions des tools (manifeste MCP), pré-sérialisées
+        self.tool_catalog = tool_catalog or ToolCatalog()
+        
+        self.system_prompt_template = """Tu es un assistant intelligent pour découvrir Lille et sa région.
 
 **Ton rôle:**
 - Aider les utilisateurs à trouver des événements, restaurants, bars et activités à Lille
@@ -36,10 +83,7 @@ class OllamaClient:
 - Propose d'approfondir si l'utilisateur veut plus d'infos
 
 **Tools disponibles:**
-- get_weekend_events() : Récupère les événements du week-end
-- search_restaurants(cuisine, diet, price_range) : Recherche restaurants
-- search_bars(drink_type, activity) : Recherche bars
-- get_weather_forecast(days) : Prévisions météo
+{tools}
 
 **Format de réponse idéal:**
 🎭 **Titre de l'événement**
@@ -49,22 +93,132 @@ class OllamaClient:
 [Description courte]
 """
         
-        logger.info(f"Ollama client initialisé - URL: {self.base_url}, Modèle: {self.model}")
+        # System prompt reconstruit quand le manifeste des tools change
+        self._update_system_prompt(self.tool_catalog)
+        self.tool_catalog.subscribe(self._update_system_prompt)
+        
+        # Client HTTP partagé (créé au démarrage de l'application)
+        self._http: Optional[httpx.AsyncClient] = None
+        
+        logger.info(f"Ollama client initialisé - URL: {', '.join(e.url for e in self.pool.endpoints)}, Modèle: {self.model}")
     
-    def is_available(self) -> bool:
-        """Vérifie si Ollama est disponible"""
-        try:
-            import httpx
-            response = httpx.get(f"{self.base_url}/api/tags", timeout=5.0)
-            return response.status_code == 200
-        except:
-            return False
+    def _update_system_prompt(self, catalog: ToolCatalog):
+        """Liste des tools du system prompt alignée sur le catalogue"""
+        self.system_prompt = self.system_prompt_template.replace("{tools}", catalog.prompt_summary())
+    
+    async def start(self):
+        """Crée le client HTTP partagé (pool de connexions keep-alive)"""
+        if self._http is None:
+            self._http = create_async_client("OLLAMA", timeout=60.0)
+    
+    async def close(self):
+        """Ferme le client HTTP partagé et ses connexions"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+    
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Client HTTP partagé, créé à la demande si start() n'a pas été appelé"""
+        if self._http is None:
+            self._http = create_async_client("OLLAMA", timeout=60.0)
+        return self._http
+    
+    async def probe(self):
+        """
+        Sonde de santé: lève une exception si aucune instance Ollama ne répond.
+        Chaque instance est sondée; une instance qui répond est réintégrée,
+        et son temps de réponse est la latence retenue par le pool.
+        """
+        async def probe_endpoint(endpoint: OllamaEndpoint):
+            started = time.monotonic()
+            try:
+                response = await self.http.get(f"{endpoint.url}/api/tags", timeout=5.0)
+                response.raise_for_status()
+            except Exception as e:
+                self.pool.mark_down(endpoint, str(e) or type(e).__name__)
+                raise
+            self.pool.mark_up(endpoint, time.monotonic() - started)
+        
+        results = await asyncio.gather(
+            *(probe_endpoint(endpoint) for endpoint in self.pool.endpoints),
+            return_exceptions=True
+        )
+        if all(isinstance(result, Exception) for result in results):
+            raise results[0]
+    
+    async def probe_model(self):
+        """
+        Sonde de readiness: lève une exception si le modèle configuré
+        n'est chargé en mémoire sur aucune instance disponible
+        """
+        async def model_loaded(endpoint: OllamaEndpoint) -> bool:
+            response = await self.http.get(f"{endpoint.url}/api/ps", timeout=5.0)
+            response.raise_for_status()
+            loaded = {model.get("name") for model in response.json().get("models", [])}
+            return self._qualified_model_name() in loaded
+        
+        endpoints = [endpoint for endpoint in self.pool.endpoints if endpoint.available]
+        results = await asyncio.gather(
+            *(model_loaded(endpoint) for endpoint in endpoints),
+            return_exceptions=True
+        )
+        if not any(result is True for result in results):
+            errors = [result for result in results if isinstance(result, Exception)]
+            if errors and len(errors) == len(results):
+                raise errors[0]
+            raise ModelNotLoadedError(f"Modèle {self.model} non chargé")
+    
+    async def warm_up(self, timeout: float = None):
+        """
+        Précharge le modèle en mémoire (requête /api/generate sans prompt)
+        sur chaque instance et l'y épingle pour la durée keep_alive
+        
+        Args:
+            timeout: Timeout du chargement en secondes (défaut OLLAMA_WARMUP_TIMEOUT)
+            
+        Raises:
+            Exception: si le préchargement a échoué sur toutes les instances
+        """
+        timeout = timeout or float(os.getenv("OLLAMA_WARMUP_TIMEOUT", "300"))
+        
+        logger.info(f"Préchargement du modèle {self.model} (keep_alive: {self.keep_alive})...")
+        
+        async def warm_up_endpoint(endpoint: OllamaEndpoint):
+            response = await self.http.post(
+                f"{endpoint.url}/api/generate",
+                json={"model": self.model, "keep_alive": self.keep_alive},
+                timeout=timeout
+            )
+            
+            if response.status_code != 200:
+                raise Exception(f"Ollama error: {response.status_code} - {response.text}")
+            
+            logger.info(f"Modèle {self.model} chargé sur {endpoint.url}")
+        
+        results = await asyncio.gather(
+            *(warm_up_endpoint(endpoint) for endpoint in self.pool.endpoints),
+            return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        for endpoint, result in zip(self.pool.endpoints, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Préchargement impossible sur {endpoint.url}: {str(result) or type(result).__name__}")
+        if len(errors) == len(results):
+            raise errors[0]
+    
+    def _qualified_model_name(self) -> str:
+        """Nom du modèle tel que listé par Ollama (tag :latest implicite)"""
+        return self.model if ":" in self.model else f"{self.model}:latest"
     
     async def chat(
         self,
         messages: List[Dict[str, str]],
         tools: Optional[List[Dict]] = None,
-        tool_results: Optional[List[Dict]] = None
+        tool_results: Optional[List[Dict]] = None,
+        timeout: Optional[float] = None,
+        priority: int = PRIORITY_DEFAULT,
+        conv_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Envoie une requête de chat à Ollama
@@ -73,43 +227,37 @@ class OllamaClient:
             messages: Historique de conversation
             tools: Liste des tools disponibles
             tool_results: Résultats des tools appelés précédemment
+            timeout: Timeout de la requête en secondes (défaut du client sinon)
+            priority: Priorité dans la file d'admission (cf. services.admission)
+            conv_id: Conversation, pour la garder sur la même instance Ollama
             
         Returns:
             Réponse d'Ollama incluant le contenu et éventuels tool_calls
+            
+        Raises:
+            AdmissionRejected: Ollama saturé (file pleine ou attente trop longue)
         """
+        async with self.admission.slot(priority):
+            return await self._chat(messages, tools, tool_results, timeout, conv_id)
+    
+    async def _chat(
+        self,
+        messages: List[Dict[str, str]],
+        tools: Optional[List[Dict]],
+        tool_results: Optional[List[Dict]],
+        timeout: Optional[float],
+        conv_id: Optional[str]
+    ) -> Dict[str, Any]:
         try:
-            # Construire les messages avec le system prompt
-            full_messages = [
-                {"role": "system", "content": self.system_prompt}
-            ] + messages
-            
-            # Ajouter les résultats de tools si présents
-            if tool_results:
-                for result in tool_results:
-                    full_messages.append({
-                        "role": "tool",
-                        "content": self._format_tool_result(result)
-                    })
-            
-            # Payload pour Ollama
-            payload = {
-                "model": self.model,
-                "messages": full_messages,
-                "stream": False
-            }
-            
-            # Ajouter les tools si disponibles
-            if tools:
-                payload["tools"] = tools
+            body, message_count, prompt_chars = self._build_payload(messages, tools, tool_results, stream=False)
             
-            logger.debug(f"Envoi requête à Ollama - Messages: {len(full_messages)}, Tools: {len(tools) if tools else 0}")
+            logger.debug(f"Envoi requête à Ollama - Messages: {message_count}, Tools: {len(tools) if tools else 0}")
             
             # Appel à Ollama
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/chat",
-                    json=payload
-                )
+            started = time.monotonic()
+            with tracing.span("llm.chat", messages=message_count, tools=len(tools) if tools else 0) as span:
+                async with self._send(body, timeout, conv_id, stream=False) as response:
+                    pass
                 
                 if response.status_code != 200:
                     logger.error(f"Erreur Ollama: {response.status_code} - {response.text}")
@@ -124,12 +272,17 @@ class OllamaClient:
                 
                 result = {
                     "content": content,
-                    "tool_calls": tool_calls
+                    "tool_calls": tool_calls,
+                    **self._generation_stats(data)
                 }
                 
-                logger.debug(f"Réponse Ollama - Content length: {len(content)}, Tool calls: {len(tool_calls)}")
+                self.context_window.observe(prompt_chars, data.get("prompt_eval_count", 0))
+                observe_generation(self.model, False, time.monotonic() - started, result)
+                span.update(self._trace_attributes(response, result, tool_calls=len(tool_calls)))
                 
-                return result
+            logger.debug(f"Réponse Ollama - Content length: {len(content)}, Tool calls: {len(tool_calls)}")
+            
+            return result
                 
         except httpx.ConnectError:
             logger.error("Impossible de se connecter à Ollama. Vérifie qu'Ollama est démarré.")
@@ -143,98 +296,305 @@ class OllamaClient:
             logger.error(f"Erreur inattendue Ollama: {str(e)}")
             raise
     
-    def _format_tool_result(self, result: Dict) -> str:
+    async def chat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        tools: Optional[List[Dict]] = None,
+        tool_results: Optional[List[Dict]] = None,
+        timeout: Optional[float] = None,
+        priority: int = PRIORITY_DEFAULT,
+        conv_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Formate un résultat de tool pour Ollama
+        Envoie une requête de chat à Ollama en mode streaming
         
         Args:
-            result: Résultat brut du tool
+            messages: Historique de conversation
+            tools: Liste des tools disponibles
+            tool_results: Résultats des tools appelés précédemment
+            timeout: Timeout (connexion et attente entre deux fragments) en secondes
+            priority: Priorité dans la file d'admission (cf. services.admission)
+            conv_id: Conversation, pour la garder sur la même instance Ollama
             
-        Returns:
-            String formaté pour Ollama
+        Yields:
+            Fragments {"content", "tool_calls", "done"} au fur et à mesure
+            de la génération (un fragment par ligne NDJSON d'Ollama)
+            
+        Raises:
+            AdmissionRejected: Ollama saturé (file pleine ou attente trop longue)
         """
-        if result.get("success"):
-            data = result.get("data", {})
+        # La place est gardée jusqu'au dernier fragment
+        async with self.admission.slot(priority):
+            async for chunk in self._chat_stream(messages, tools, tool_results, timeout, conv_id):
+                yield chunk
+    
+    async def _chat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        tools: Optional[List[Dict]],
+        tool_results: Optional[List[Dict]],
+        timeout: Optional[float],
+        conv_id: Optional[str]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        try:
+            body, message_count, prompt_chars = self._build_payload(messages, tools, tool_results, stream=True)
+            
+            logger.debug(f"Envoi requête streaming à Ollama - Messages: {message_count}, Tools: {len(tools) if tools else 0}")
             
-            # Formater selon le type de données
-            if isinstance(data, dict):
-                # Cas événements
-                if "events" in data:
-                    events = data["events"]
-                    formatted = f"J'ai trouvé {len(events)} événements"
-                    if data.get("week_dates"):
-                        formatted += f" pour la semaine du {data['week_dates']}"
-                    formatted += ":\n\n"
+            started = time.monotonic()
+            with tracing.span("llm.stream", messages=message_count, tools=len(tools) if tools else 0) as span:
+                async with self._send(body, timeout, conv_id, stream=True) as response:
                     
-                    for i, event in enumerate(events[:10], 1):  # Max 10 événements
-                        formatted += f"{i}. {event.get('title', 'Sans titre')}\n"
-                        if event.get('dates'):
-                            formatted += f"   📅 {event['dates']}\n"
-                        if event.get('price'):
-                            formatted += f"   💰 {event['price']}\n"
-                        if event.get('location'):
-                            formatted += f"   📍 {event['location']}\n"
-                        if event.get('description'):
-                            desc = event['description'][:150]
-                            formatted += f"   {desc}...\n"
-                        formatted += "\n"
+                    if response.status_code != 200:
+                        body = await response.aread()
+                        logger.error(f"Erreur Ollama: {response.status_code} - {body.decode(errors='replace')}")
+                        raise Exception(f"Ollama error: {response.status_code}")
                     
-                    return formatted
+                    # Ollama renvoie un objet JSON par ligne
+                    async for line in response.aiter_lines():
+                        if not line.strip():
+                            continue
+                        
+                        data = json.loads(line)
+                        
+                        if data.get("error"):
+                            raise Exception(f"Ollama error: {data['error']}")
+                        
+                        message = data.get("message", {})
+                        chunk = {
+                            "content": message.get("content", ""),
+                            "tool_calls": message.get("tool_calls", []),
+                            "done": data.get("done", False)
+                        }
+                        
+                        if chunk["content"] and "first_token_ms" not in span:
+                            span["first_token_ms"] = round((time.monotonic() - started) * 1000, 2)
+                        
+                        # Le dernier fragment porte les statistiques de génération
+                        if data.get("done"):
+                            chunk.update(self._generation_stats(data))
+                            self.context_window.observe(prompt_chars, data.get("prompt_eval_count", 0))
+                            observe_generation(self.model, True, time.monotonic() - started, chunk)
+                            span.update(self._trace_attributes(response, chunk, tool_calls=len(chunk["tool_calls"])))
+                        
+                        yield chunk
+                        
+                        if data.get("done"):
+                            break
                 
-                # Cas météo
-                elif "current" in data or "forecast" in data:
-                    formatted = "Météo pour Lille:\n\n"
-                    
-                    if "current" in data:
-                        current = data["current"]
-                        formatted += f"Actuellement: {current.get('temp')}°C - {current.get('description')}\n\n"
-                    
-                    if "forecast" in data:
-                        formatted += "Prévisions:\n"
-                        for day in data["forecast"]:
-                            formatted += f"- {day.get('day')}: {day.get('temp')}°C, {day.get('description')}\n"
-                    
-                    return formatted
+        except httpx.ConnectError:
+            logger.error("Impossible de se connecter à Ollama. Vérifie qu'Ollama est démarré.")
+            raise Exception("Ollama n'est pas accessible. Lance 'ollama serve' dans un terminal.")
+        
+        except httpx.TimeoutException:
+            logger.error("Timeout lors de la requête Ollama (streaming)")
+            raise Exception("La requête à Ollama a pris trop de temps.")
+    
+    @asynccontextmanager
+    async def _send(
+        self,
+        body: bytes,
+        timeout: Optional[float],
+        conv_id: Optional[str],
+        stream: bool
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Envoie /api/chat à l'instance choisie par le pool. Si la connexion
+        échoue (rien n'a été envoyé), la requête part sur une autre instance.
+        Le résultat est reporté au pool à la fermeture: seuls une connexion
+        impossible ou coupée et un 5xx comptent comme échec de l'instance,
+        pas un timeout de lecture (imposé par l'échéance de l'appelant).
+        """
+        tried: List[OllamaEndpoint] = []
+        
+        while True:
+            endpoint = self.pool.select(conv_id, exclude=tried)
+            tried.append(endpoint)
+            self.pool.started(endpoint)
             
-            # Cas liste simple (restaurants, bars)
-            elif isinstance(data, list):
-                formatted = f"J'ai trouvé {len(data)} résultats:\n\n"
-                for i, item in enumerate(data[:8], 1):  # Max 8 résultats
-                    formatted += f"{i}. {item.get('name', 'Sans nom')}\n"
-                    if item.get('description'):
-                        desc = item['description'][:100]
-                        formatted += f"   {desc}...\n"
-                    if item.get('location'):
-                        formatted += f"   📍 {item['location']}\n"
-                    formatted += "\n"
-                return formatted
+            request = self.http.build_request(
+                "POST",
+                f"{endpoint.url}/api/chat",
+                content=body,
+                headers={"Content-Type": "application/json"},
+                timeout=timeout or httpx.USE_CLIENT_DEFAULT
+            )
             
-            # Fallback: convertir en string
-            return str(data)
+            try:
+                response = await self.http.send(request, stream=stream)
+                break
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                self.pool.failed(endpoint, str(e) or type(e).__name__)
+                if len(tried) < len(self.pool.endpoints):
+                    logger.warning(f"Instance Ollama {endpoint.url} injoignable, nouvel essai sur une autre instance")
+                    continue
+                raise
+            except httpx.HTTPError as e:
+                if self._is_instance_failure(e):
+                    self.pool.failed(endpoint, str(e) or type(e).__name__)
+                else:
+                    self.pool.released(endpoint)
+                raise
+            except BaseException:
+                self.pool.released(endpoint)
+                raise
+        
+        error: Optional[str] = None
+        try:
+            yield response
+            if response.status_code >= 500:
+                error = f"HTTP {response.status_code}"
+        except httpx.HTTPError as e:
+            error = (str(e) or type(e).__name__) if self._is_instance_failure(e) else ""
+            raise
+        except BaseException:
+            # Abandon par l'appelant (client déconnecté, erreur de parsing...)
+            error = ""
+            raise
+        finally:
+            await response.aclose()
+            if error is None:
+                self.pool.succeeded(endpoint)
+            elif error:
+                self.pool.failed(endpoint, error)
+            else:
+                self.pool.released(endpoint)
+    
+    @staticmethod
+    def _is_instance_failure(error: httpx.HTTPError) -> bool:
+        """
+        Erreur imputable à l'instance: connexion impossible ou coupée.
+        Les timeouts de lecture/écriture (génération plus longue que
+        l'échéance de l'appelant) et d'attente du pool de connexions (côté
+        client) n'en sont pas.
+        """
+        if isinstance(error, httpx.ConnectTimeout):
+            return True
+        if isinstance(error, httpx.TimeoutException):
+            return False
+        return isinstance(error, httpx.TransportError)
+    
+    def _build_payload(
+        self,
+        messages: List[Dict[str, str]],
+        tools: Optional[List[Dict]],
+        tool_results: Optional[List[Dict]],
+        stream: bool
+    ) -> Tuple[bytes, int, int]:
+        """
+        Construit le corps de /api/chat (system prompt, historique limité
+        au budget de tokens, messages du tour en cours, résultats de tools et
+        définitions de tools).
+        Les définitions de tools sont insérées déjà sérialisées.
+        
+        Returns:
+            (corps JSON, nombre de messages, nombre de caractères du prompt) -
+            le dernier sert à recalibrer l'estimation de tokens avec le
+            retour d'Ollama
+        """
+        system_message = {"role": "system", "content": self.system_prompt}
+        
+        # Résultats de tools si présents, classés selon la dernière question
+        query = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+        tool_messages = self.tool_messages(tool_results or [], query)
+        
+        tools_json = self.tool_catalog.serialize(tools) if tools else ""
+        tools_chars = len(tools_json)
+        
+        # Messages du tour en cours après la question (appels de tools de
+        # l'assistant et leurs résultats): toujours gardés, hors fenêtre
+        last_question = max(
+            (index for index, message in enumerate(messages) if message.get("role") == "user"),
+            default=len(messages) - 1
+        )
+        history, current_turn = messages[:last_question + 1], messages[last_question + 1:]
+        
+        # Historique récent dans le budget restant
+        reserved = (
+            self.context_window.estimate_messages([system_message] + current_turn + tool_messages)
+            + self.context_window.tokens_for_chars(tools_chars)
+        )
+        history = self.context_window.fit(history, reserved_tokens=reserved)
+        
+        full_messages = [system_message] + history + current_turn + tool_messages
+        
+        # Payload pour Ollama
+        payload = {
+            "model": self.model,
+            "messages": full_messages,
+            "stream": stream,
+            "keep_alive": self.keep_alive
+        }
+        
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        
+        # Ajouter les tools si disponibles (fragment JSON réutilisé)
+        if tools_json:
+            body = body[:-1] + ',"tools":' + tools_json + "}"
         
-        else:
-            # Erreur dans le tool
-            error = result.get("error", "Erreur inconnue")
-            return f"Erreur lors de la récupération des données: {error}"
+        prompt_chars = sum(len(str(message["content"])) for message in full_messages) + tools_chars
+        
+        return body.encode("utf-8"), len(full_messages), prompt_chars
+    
+    @staticmethod
+    def _generation_stats(data: Dict[str, Any]) -> Dict[str, int]:
+        """Extrait les compteurs de tokens et durées (ns) d'une réponse Ollama"""
+        return {
+            key: data.get(key, 0)
+            for key in ("prompt_eval_count", "prompt_eval_duration", "eval_count", "eval_duration")
+        }
+    
+    @staticmethod
+    def _trace_attributes(response: httpx.Response, stats: Dict[str, Any], **extra) -> Dict[str, Any]:
+        """Attributs d'une étape llm.* de la trace: instance, tokens et durées (ms)"""
+        return {
+            "endpoint": str(response.request.url).rsplit("/api/", 1)[0],
+            "prompt_tokens": stats.get("prompt_eval_count", 0),
+            "prompt_eval_ms": round(stats.get("prompt_eval_duration", 0) / 1e6, 2),
+            "eval_tokens": stats.get("eval_count", 0),
+            "eval_ms": round(stats.get("eval_duration", 0) / 1e6, 2),
+            **extra
+        }
+    
+    def tool_messages(self, results: List[Dict], query: str = "") -> List[Dict[str, str]]:
+        """
+        Messages "tool" transmis à Ollama pour les résultats d'un tour
+        
+        Args:
+            results: Résultats des tools ({"tool", "success", "data"|"error"})
+            query: Question de l'utilisateur, pour mettre en tête les éléments pertinents
+        """
+        if not results:
+            return []
+        
+        with tracing.span("format.tool_results", results=len(results)) as span:
+            contents = self.formatter.format_all(results, query)
+            span["chars"] = sum(len(content) for content in contents)
+        
+        messages = []
+        for result, content in zip(results, contents):
+            message = {"role": "tool", "content": content}
+            if result.get("tool"):
+                message["tool_name"] = result["tool"]
+            messages.append(message)
+        return messages
     
     async def test_connection(self) -> bool:
         """Teste la connexion à Ollama"""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.base_url}/api/tags")
-                return response.status_code == 200
+            await self.probe()
+            return True
         except:
             return False
     
     async def list_models(self) -> List[str]:
         """Liste les modèles disponibles dans Ollama"""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.base_url}/api/tags")
-                if response.status_code == 200:
-                    data = response.json()
-                    return [model["name"] for model in data.get("models", [])]
-                return []
+            response = await self.http.get(f"{self.base_url}/api/tags", timeout=10.0)
+            if response.status_code == 200:
+                data = response.json()
+                return [model["name"] for model in data.get("models", [])]
+            return []
         except:
             return []
 
@@ -266,5 +626,7 @@ if __name__ == "__main__":
                 ]
             )
             print(f"Réponse: {response['content']}")
+        
+        await client.close()
     
     asyncio.run(test())
@@ -0,0 +1,148 @@
+"""
+Pool d'instances Ollama - Répartition des requêtes entre plusieurs serveurs
+"""
+
+import time
+from typing import Dict, Any, List, Optional, Iterable
+import logging
+import os
+
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+class OllamaEndpoint:
+    """État d'une instance Ollama: requêtes en cours, latence, éjection"""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.outstanding = 0
+        self.latency_ms: Optional[float] = None
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+        self.requests = 0
+        self.errors = 0
+        self.ejections = 0
+
+    @property
+    def available(self) -> bool:
+        """Instance utilisable (pas éjectée, ou éjection expirée)"""
+        return time.monotonic() >= self.ejected_until
+
+    def stats(self) -> Dict[str, Any]:
+        remaining = self.ejected_until - time.monotonic()
+        return {
+            "url": self.url,
+            "available": self.available,
+            "ejected_for_s": round(remaining, 1) if remaining > 0 else 0,
+            "outstanding": self.outstanding,
+            "latency_ms": round(self.latency_ms, 1) if self.latency_ms is not None else None,
+            "requests": self.requests,
+            "errors": self.errors,
+            "ejections": self.ejections
+        }
+
+class OllamaPool:
+    """
+    Répartit les requêtes entre plusieurs instances Ollama (une par nœud NUMA
+    ou par machine).
+
+    Politique: l'instance avec le moins de requêtes en cours, à égalité la
+    plus réactive (latence des sondes de santé, pas la durée des
+    générations qui dépend surtout de leur longueur). Une conversation
+    reste sur la même instance tant que celle-ci n'a pas plus de
+    affinity_slack requêtes en cours que la moins chargée, pour réutiliser
+    son cache KV. Après eject_failures échecs consécutifs une instance est
+    écartée pendant eject_seconds.
+    """
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        affinity_slack: int = None,
+        eject_failures: int = None,
+        eject_seconds: float = None
+    ):
+        self.endpoints: List[OllamaEndpoint] = [OllamaEndpoint(url) for url in urls]
+        if not self.endpoints:
+            raise ValueError("Au moins une URL Ollama est requise")
+
+        self.affinity_slack = affinity_slack if affinity_slack is not None else int(os.getenv("OLLAMA_AFFINITY_SLACK", "2"))
+        self.eject_failures = eject_failures or int(os.getenv("OLLAMA_EJECT_FAILURES", "2"))
+        self.eject_seconds = eject_seconds or float(os.getenv("OLLAMA_EJECT_SECONDS", "30"))
+
+        # conversation -> instance qui a son cache KV
+        self._affinity = TTLCache(max_entries=10000, ttl=float(os.getenv("CONVERSATION_IDLE_TTL", "3600")))
+
+        logger.info(f"Pool Ollama - instances: {[endpoint.url for endpoint in self.endpoints]}")
+
+    def select(self, conv_id: Optional[str] = None, exclude: Iterable[OllamaEndpoint] = ()) -> OllamaEndpoint:
+        """
+        Choisit l'instance pour une requête
+
+        Args:
+            conv_id: Conversation (affinité), None pour une requête isolée
+            exclude: Instances déjà essayées pour cette requête
+        """
+        excluded = set(id(endpoint) for endpoint in exclude)
+        candidates = [e for e in self.endpoints if id(e) not in excluded and e.available]
+
+        if not candidates:
+            # Tout est écarté: on tente quand même l'instance réintégrée le plus tôt
+            candidates = sorted(
+                (e for e in self.endpoints if id(e) not in excluded),
+                key=lambda e: e.ejected_until
+            )[:1] or self.endpoints[:1]
+
+        least = min(candidates, key=lambda e: (e.outstanding, e.latency_ms or 0.0))
+
+        if conv_id is not None:
+            pinned = self._affinity.get(conv_id)
+            if pinned in candidates and pinned.outstanding <= least.outstanding + self.affinity_slack:
+                return pinned
+            self._affinity.set(conv_id, least)
+
+        return least
+
+    def started(self, endpoint: OllamaEndpoint):
+        """Une requête part vers l'instance"""
+        endpoint.outstanding += 1
+        endpoint.requests += 1
+
+    def succeeded(self, endpoint: OllamaEndpoint):
+        """Requête terminée: compteur d'échecs remis à zéro"""
+        endpoint.outstanding -= 1
+        self.mark_up(endpoint)
+
+    def released(self, endpoint: OllamaEndpoint):
+        """Requête abandonnée par l'appelant (ni succès ni échec de l'instance)"""
+        endpoint.outstanding -= 1
+
+    def failed(self, endpoint: OllamaEndpoint, error: str):
+        """Requête en échec imputable à l'instance (connexion, erreur 5xx)"""
+        endpoint.outstanding -= 1
+        self.mark_down(endpoint, error)
+
+    def mark_up(self, endpoint: OllamaEndpoint, duration: Optional[float] = None):
+        """Instance joignable (requête ou sonde réussie, avec sa durée pour une sonde)"""
+        if duration is not None:
+            latency_ms = duration * 1000
+            endpoint.latency_ms = latency_ms if endpoint.latency_ms is None else 0.8 * endpoint.latency_ms + 0.2 * latency_ms
+        if endpoint.ejected_until:
+            logger.info(f"Instance Ollama {endpoint.url} réintégrée")
+        endpoint.consecutive_failures = 0
+        endpoint.ejected_until = 0.0
+
+    def mark_down(self, endpoint: OllamaEndpoint, error: str):
+        """Échec sur l'instance, éjectée temporairement après plusieurs échecs"""
+        endpoint.errors += 1
+        endpoint.consecutive_failures += 1
+        if endpoint.consecutive_failures >= self.eject_failures and endpoint.available:
+            endpoint.ejected_until = time.monotonic() + self.eject_seconds
+            endpoint.ejections += 1
+            logger.warning(f"Instance Ollama {endpoint.url} écartée {self.eject_seconds}s ({error})")
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """État de chaque instance"""
+        return [endpoint.stats() for endpoint in self.endpoints]
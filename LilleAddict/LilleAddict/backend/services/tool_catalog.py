@@ -0,0 +1,144 @@
+"""
+Catalogue des tools - Définitions publiées par le serveur MCP (manifeste),
+avec leur forme sérialisée prête à être réutilisée dans chaque requête Ollama
+"""
+
+import json
+import re
+from typing import Dict, Any, List, Optional, Callable, Tuple
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# Dernier manifeste chargé, relu au démarrage si le serveur MCP ne répond pas encore
+DEFAULT_SNAPSHOT_PATH = os.path.join(tempfile.gettempdir(), "lilleaddict-tool-manifest.json")
+
+# Extrait la liste d'exemples d'une description de paramètre: "(ex: a, b, c)"
+PARAMETER_EXAMPLES = re.compile(r"ex\s*:\s*([^)]*)")
+
+class ToolCatalog:
+    """
+    Définitions des tools au format Ollama et leur version.
+
+    Chaque définition est sérialisée une fois au chargement: la liste de
+    tools envoyée à Ollama est assemblée à partir de ces fragments au lieu
+    d'être re-sérialisée à chaque requête. Les abonnés sont prévenus quand
+    le catalogue change.
+
+    Le serveur MCP est la seule source des définitions: chaque manifeste
+    chargé est écrit sur disque (dernière version connue) et relu au
+    démarrage suivant. Sans manifeste ni copie, le catalogue est vide et
+    la sonde "tools" garde la readiness à 503.
+    """
+
+    def __init__(
+        self,
+        tools: List[Dict[str, Any]] = None,
+        version: str = None,
+        snapshot_path: str = None
+    ):
+        self._listeners: List[Callable[["ToolCatalog"], None]] = []
+        self.snapshot_path = snapshot_path or os.getenv("TOOL_MANIFEST_SNAPSHOT", DEFAULT_SNAPSHOT_PATH)
+
+        if tools is None:
+            tools, version = self._read_snapshot()
+        self._load(tools, version or "none")
+
+    def subscribe(self, listener: Callable[["ToolCatalog"], None]):
+        """Enregistre un callback appelé avec le catalogue après chaque changement"""
+        self._listeners.append(listener)
+
+    def update(self, tools: List[Dict[str, Any]], version: str) -> bool:
+        """
+        Remplace les définitions
+
+        Returns:
+            True si la version a changé
+        """
+        if version == self.version:
+            return False
+        self._load(tools, version)
+        logger.info(f"Catalogue de tools mis à jour (version {version}, {len(tools)} tools)")
+        self._write_snapshot()
+        for listener in self._listeners:
+            listener(self)
+        return True
+
+    def _read_snapshot(self) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Dernier manifeste écrit sur disque: (tools, version), ([], None) à défaut"""
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as snapshot:
+                manifest = json.load(snapshot)
+            tools, version = manifest["tools"], manifest["version"]
+        except FileNotFoundError:
+            return [], None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Copie du manifeste des tools illisible ({self.snapshot_path}): {str(e)}")
+            return [], None
+
+        logger.info(f"Catalogue de tools chargé depuis la dernière copie (version {version}, {len(tools)} tools)")
+        return tools, version
+
+    def _write_snapshot(self):
+        """Écrit le catalogue courant sur disque (écriture atomique)"""
+        temporary = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "w", encoding="utf-8") as snapshot:
+                json.dump({"version": self.version, "tools": self.tools}, snapshot, ensure_ascii=False)
+            os.replace(temporary, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"Copie du manifeste des tools non écrite ({self.snapshot_path}): {str(e)}")
+
+    async def probe(self):
+        """Sonde de readiness: lève une exception tant qu'aucune définition n'est chargée"""
+        if not self.tools:
+            raise Exception("Aucune définition de tools (manifeste MCP pas encore chargé)")
+
+    def _load(self, tools: List[Dict[str, Any]], version: str):
+        self.tools = tools
+        self.version = version
+        self._fragments: Dict[str, str] = {
+            tool["function"]["name"]: json.dumps(tool, ensure_ascii=False, separators=(",", ":"))
+            for tool in tools
+        }
+        self.tools_json = "[" + ",".join(self._fragments.values()) + "]"
+
+    @property
+    def names(self) -> List[str]:
+        """Noms des tools, dans l'ordre du catalogue"""
+        return list(self._fragments)
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Définition d'un tool par son nom"""
+        for tool in self.tools:
+            if tool["function"]["name"] == name:
+                return tool
+        return None
+
+    def serialize(self, tools: List[Dict[str, Any]]) -> str:
+        """
+        Liste de tools en JSON, à partir des fragments déjà sérialisés
+        (les définitions inconnues du catalogue sont sérialisées à la volée)
+        """
+        if tools is self.tools:
+            return self.tools_json
+        fragments = []
+        for tool in tools:
+            fragment = self._fragments.get(tool.get("function", {}).get("name"))
+            if fragment is None:
+                fragment = json.dumps(tool, ensure_ascii=False, separators=(",", ":"))
+            fragments.append(fragment)
+        return "[" + ",".join(fragments) + "]"
+
+    def prompt_summary(self) -> str:
+        """Liste des tools pour le system prompt: "- nom(paramètres) : rôle" """
+        lines = []
+        for tool in self.tools:
+            function = tool["function"]
+            parameters = ", ".join(function.get("parameters", {}).get("properties", {}))
+            # Première phrase de la description
+            summary = function.get("description", "").split(". ")[0].rstrip(".")
+            lines.append(f"- {function['name']}({parameters}) : {summary}")
+        return "\n".join(lines)
@@ -0,0 +1,134 @@
+"""
+Exécution des tool calls - Appels MCP groupés avec timeout par appel
+"""
+
+import asyncio
+import json
+from typing import Dict, Any, List, Optional
+import logging
+import os
+import time
+
+from services.mcp_client import MCPClient
+from services import tracing
+
+logger = logging.getLogger(__name__)
+
+class ToolExecutor:
+    """Exécute en parallèle les tool calls d'un tour de conversation"""
+
+    def __init__(
+        self,
+        mcp_client: MCPClient,
+        max_batch: int = None,
+        max_concurrency: int = None,
+        timeout: float = None
+    ):
+        self.mcp_client = mcp_client
+        # À aligner sur TOOL_BATCH_MAX_CALLS du serveur MCP
+        self.max_batch = max_batch or int(os.getenv("TOOL_BATCH_MAX_CALLS", "16"))
+        # Requêtes MCP simultanées par tour (batchs, ou appels un par un sans /tools/batch)
+        self.max_concurrency = max_concurrency or int(os.getenv("TOOL_MAX_CONCURRENCY", "4"))
+        self.timeout = timeout or float(os.getenv("TOOL_CALL_TIMEOUT", "15"))
+
+        logger.info(
+            f"Tool executor initialisé - Appels par batch: {self.max_batch}, "
+            f"Requêtes simultanées: {self.max_concurrency}, Timeout: {self.timeout}s"
+        )
+
+    @staticmethod
+    def parse_tool_call(tool_call: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalise un tool call Ollama en {"name", "arguments"}
+
+        Ollama renvoie {"function": {"name": ..., "arguments": {...}}},
+        les arguments pouvant parfois être une chaîne JSON. Un tool call
+        inutilisable (sans nom, arguments qui ne sont pas un objet) reçoit
+        une clé "error" et n'est pas envoyé au serveur MCP.
+        """
+        function = tool_call.get("function", tool_call) if isinstance(tool_call, dict) else {}
+        if not isinstance(function, dict):
+            function = {}
+        name = function.get("name")
+        arguments = function.get("arguments") or {}
+
+        if isinstance(arguments, str):
+            try:
+                arguments = json.loads(arguments)
+            except ValueError:
+                logger.warning(f"Arguments invalides pour le tool {name}: {arguments}")
+                arguments = {}
+
+        if not isinstance(name, str) or not name:
+            return {"name": str(name or "inconnu"), "arguments": {}, "error": "Tool call sans nom de tool."}
+        if not isinstance(arguments, dict):
+            return {"name": name, "arguments": {}, "error": f"Arguments invalides pour le tool {name}."}
+
+        return {"name": name, "arguments": arguments}
+
+    async def run(
+        self,
+        tool_calls: List[Dict[str, Any]],
+        conv_id: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Exécute les tool calls en parallèle, en un seul aller-retour MCP
+        (plusieurs batchs au-delà de max_batch appels). Au plus
+        max_concurrency requêtes MCP sont en cours en même temps.
+
+        Args:
+            tool_calls: Tool calls renvoyés par Ollama
+            conv_id: ID de conversation (pour les logs)
+            timeout: Timeout par appel, plafonné au timeout configuré
+
+        Returns:
+            Un résultat par tool call, dans l'ordre des appels. Un appel en
+            erreur ou en timeout produit un résultat {"success": False, ...}
+            sans bloquer les autres.
+        """
+        calls = [self.parse_tool_call(tool_call) for tool_call in tool_calls]
+        timeout = min(timeout, self.timeout) if timeout else self.timeout
+
+        logger.info(f"[{conv_id}] Tool calls détectés: {len(calls)}")
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+        valid = []
+        for index, call in enumerate(calls):
+            if "error" in call:
+                logger.warning(f"[{conv_id}] Tool call ignoré: {call['error']}")
+                results[index] = {"tool": call["name"], "success": False, "error": call["error"]}
+            else:
+                logger.info(f"[{conv_id}] Appel tool: {call['name']} avec args: {call['arguments']}")
+                valid.append(index)
+
+        async def run_batch(indexes: List[int]):
+            batch = [calls[index] for index in indexes]
+            started = time.monotonic()
+            try:
+                batch_results, durations = await self.mcp_client.call_tools(
+                    batch, timeout=timeout, limit=limit, with_durations=True
+                )
+            except Exception as e:
+                logger.error(f"[{conv_id}] Erreur tools {[call['name'] for call in batch]}: {str(e)}")
+                batch_results = [{"success": False, "error": str(e)} for _ in batch]
+                durations = [time.monotonic() - started] * len(batch)
+
+            # Étape de chaque tool: sa propre durée (mesurée par le serveur
+            # dans un batch), pas celle de tout le batch
+            for index, call, result, duration in zip(indexes, batch, batch_results, durations):
+                logger.info(f"[{conv_id}] Tool {call['name']} - Success: {result.get('success')}")
+                tracing.record(
+                    f"tool.{call['name']}", started, started + duration,
+                    arguments=call["arguments"], success=bool(result.get("success")), batch=len(batch)
+                )
+                results[index] = {"tool": call["name"], **result}
+
+        # Les batchs partent en même temps dans la limite de max_concurrency
+        limit = asyncio.Semaphore(self.max_concurrency)
+        await asyncio.gather(*(
+            run_batch(valid[offset:offset + self.max_batch])
+            for offset in range(0, len(valid), self.max_batch)
+        ))
+
+        return results
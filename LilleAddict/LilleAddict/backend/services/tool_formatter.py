@@ -0,0 +1,215 @@
+"""
+Formatage des résultats de tools - Représentation compacte, classée par
+pertinence et bornée en tokens
+"""
+
+import json
+from typing import Dict, Any, List, Callable, Optional, Tuple
+import logging
+import os
+
+from utils.text import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Mots trop fréquents pour départager les résultats
+STOPWORDS = {
+    "les", "des", "une", "pour", "dans", "avec", "sur", "que", "qui", "quoi",
+    "est", "sont", "faire", "peux", "peut", "veux", "voudrais", "cherche",
+    "lille", "quel", "quelle", "quels", "quelles", "moi", "nous", "vous",
+    "ce", "cet", "cette", "ces", "aux", "pas", "plus", "tres", "bien", "bon"
+}
+
+# Champs affichés par forme de données connue, dans l'ordre. Le premier
+# est le titre de l'élément, la description (tronquée) vient toujours en
+# dernier.
+EVENT_FIELDS = ("title", "dates", "hours", "price", "location")
+VENUE_FIELDS = ("name", "cuisine", "drink_type", "category", "price_range", "dietary", "atmosphere", "location")
+
+DESCRIPTION_CHARS = 100
+VALUE_CHARS = 80
+
+class ToolResultFormatter:
+    """
+    Transforme le résultat d'un tool en texte pour le prompt d'Ollama.
+
+    Les éléments (événements, lieux, ou toute liste de dicts) sont classés
+    selon les mots de la question qu'ils contiennent, puis ajoutés une
+    ligne chacun tant que le budget de tokens le permet. Les formes de
+    données inconnues sont rendues en "clé: valeur", jamais en repr Python.
+    """
+
+    def __init__(
+        self,
+        estimate_tokens: Callable[[str], int],
+        max_tokens: int = None
+    ):
+        self.estimate_tokens = estimate_tokens
+        # Budget partagé entre les résultats d'un même tour
+        self.max_tokens = max_tokens or int(os.getenv("TOOL_RESULTS_MAX_TOKENS", "800"))
+
+    def format(self, result: Dict[str, Any], query: str = "", max_tokens: int = None) -> str:
+        """
+        Formate un résultat de tool
+
+        Args:
+            result: Résultat du tool ({"success", "data"|"error", "tool"})
+            query: Question de l'utilisateur (classement par pertinence)
+            max_tokens: Budget du résultat (défaut: budget complet)
+
+        Returns:
+            Texte compact pour le message "tool"
+        """
+        if not result.get("success"):
+            return f"Erreur lors de la récupération des données: {result.get('error', 'Erreur inconnue')}"
+
+        budget = max_tokens or self.max_tokens
+        data = result.get("data")
+        terms = self._terms(query)
+
+        if isinstance(data, dict) and isinstance(data.get("events"), list):
+            header = f"{len(data['events'])} événements"
+            if data.get("week_dates"):
+                header += f" (semaine du {data['week_dates']})"
+            return self._items(header, data["events"], EVENT_FIELDS, terms, budget)
+
+        if isinstance(data, dict) and ("current" in data or "forecast" in data):
+            return self._weather(data)
+
+        if isinstance(data, list) and all(isinstance(item, dict) for item in data):
+            if not data:
+                return "Aucun résultat."
+            fields = VENUE_FIELDS if any("name" in item for item in data) else None
+            return self._items(f"{len(data)} résultats", data, fields, terms, budget)
+
+        return self._generic(data, terms, budget)
+
+    def format_all(self, results: List[Dict[str, Any]], query: str = "") -> List[str]:
+        """Formate les résultats d'un tour, budget réparti également entre eux"""
+        if not results:
+            return []
+        share = max(self.max_tokens // len(results), 1)
+        return [self.format(result, query, max_tokens=share) for result in results]
+
+    @staticmethod
+    def _terms(query: str) -> List[str]:
+        """Mots significatifs de la question (normalisés)"""
+        return [
+            word for word in normalize_text(query).split()
+            if (len(word) >= 3 or word == "€") and word not in STOPWORDS
+        ]
+
+    @staticmethod
+    def _score(item: Dict[str, Any], title_key: Optional[str], terms: List[str]) -> int:
+        """Pertinence d'un élément: mots de la question trouvés, titre compté double"""
+        if not terms:
+            return 0
+        title = normalize_text(str(item.get(title_key, ""))) if title_key else ""
+        text = normalize_text(" ".join(str(value) for value in item.values() if _is_scalar(value)))
+        words = set(text.split())
+        score = 0
+        for term in terms:
+            # Accords simples (pluriel/féminin) par préfixe commun
+            if term in words or any(word.startswith(term) or term.startswith(word) for word in words if len(word) >= 4):
+                score += 2 if term in title else 1
+        return score
+
+    def _items(
+        self,
+        header: str,
+        items: List[Dict[str, Any]],
+        fields: Optional[Tuple[str, ...]],
+        terms: List[str],
+        budget: int
+    ) -> str:
+        """Une ligne par élément, les plus pertinents d'abord, dans le budget"""
+        title_key = fields[0] if fields else None
+        # Tri stable: à pertinence égale, l'ordre de la source est conservé
+        ranked = sorted(items, key=lambda item: -self._score(item, title_key, terms))
+
+        lines = [header + ":"]
+        used = self.estimate_tokens(lines[0])
+        for index, item in enumerate(ranked):
+            line = "- " + self._item_line(item, fields)
+            cost = self.estimate_tokens(line) + 1
+            if used + cost > budget and len(lines) > 1:
+                lines.append(f"(+{len(ranked) - index} autres non listés)")
+                break
+            lines.append(line)
+            used += cost
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def _item_line(item: Dict[str, Any], fields: Optional[Tuple[str, ...]]) -> str:
+        """Champs séparés par " | ", description tronquée en fin de ligne"""
+        if fields:
+            parts = [_clip(item[key], VALUE_CHARS) for key in fields if item.get(key)]
+        else:
+            parts = [
+                f"{key}: {_clip(value, VALUE_CHARS)}"
+                for key, value in item.items()
+                if key != "description" and value not in (None, "", [], {})
+            ]
+        if item.get("description"):
+            parts.append(_clip(item["description"], DESCRIPTION_CHARS))
+        return " | ".join(parts)
+
+    @staticmethod
+    def _weather(data: Dict[str, Any]) -> str:
+        """Météo sur deux lignes: actuelle puis prévisions"""
+        lines = ["Météo Lille:"]
+        current = data.get("current")
+        if current:
+            lines.append(f"Actuellement {current.get('temp')}°C, {current.get('description')}")
+        forecast = data.get("forecast") or []
+        if forecast:
+            days = "; ".join(f"{day.get('day')} {day.get('temp')}°C {day.get('description')}" for day in forecast)
+            lines.append(f"Prévisions: {days}")
+        return "\n".join(lines)
+
+    def _generic(self, data: Any, terms: List[str], budget: int) -> str:
+        """
+        Forme inconnue: champs simples en "clé: valeur", première liste de
+        dicts rendue comme des éléments
+        """
+        if data is None or data == {} or data == []:
+            return "Aucun résultat."
+
+        if _is_scalar(data):
+            return _clip(data, DESCRIPTION_CHARS * 4)
+
+        if isinstance(data, list):
+            if all(isinstance(item, dict) for item in data):
+                return self._items(f"{len(data)} résultats", data, None, terms, budget)
+            return "; ".join(_clip(item, VALUE_CHARS) for item in data)
+
+        lines = [
+            f"{key}: {_clip(value, VALUE_CHARS)}"
+            for key, value in data.items()
+            if not isinstance(value, list) and value not in (None, "", {})
+        ]
+        text = "\n".join(lines)
+
+        for key, value in data.items():
+            if isinstance(value, list) and value:
+                remaining = budget - self.estimate_tokens(text)
+                if isinstance(value[0], dict):
+                    block = self._items(f"{key} ({len(value)})", value, None, terms, max(remaining, 1))
+                else:
+                    block = f"{key}: " + ", ".join(_clip(item, VALUE_CHARS) for item in value)
+                text = f"{text}\n{block}" if text else block
+
+        return text or "Aucun résultat."
+
+def _is_scalar(value: Any) -> bool:
+    return isinstance(value, (str, int, float, bool))
+
+def _clip(value: Any, limit: int) -> str:
+    """Valeur sur une ligne, tronquée; les structures sont rendues en JSON compact"""
+    text = value if isinstance(value, str) else (
+        str(value) if _is_scalar(value)
+        else json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+    )
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
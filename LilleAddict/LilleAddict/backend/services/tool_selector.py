@@ -0,0 +1,186 @@
+"""
+Sélection des tools - N'envoyer à Ollama que les tools pertinents pour le message
+"""
+
+import re
+from typing import Dict, Any, List, Optional, Set
+import logging
+import os
+
+from services.tool_catalog import ToolCatalog, PARAMETER_EXAMPLES
+from services.context_window import ContextWindow
+from services.tool_formatter import STOPWORDS
+from utils.text import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Mots-clés des tools connus (formes normalisées)
+TOOL_KEYWORDS: Dict[str, List[str]] = {
+    "get_weekend_events": [
+        "week end", "weekend", "samedi", "dimanche", "sortir", "sortie", "evenement",
+        "concert", "expo", "exposition", "spectacle", "festival", "marche", "agenda"
+    ],
+    "search_restaurants": [
+        "restaurant", "resto", "manger", "diner", "dejeuner", "brunch", "cuisine",
+        "faim", "table", "vegetarien", "vegan", "halal", "gluten"
+    ],
+    "search_bars": [
+        "bar", "boire", "verre", "apero", "cocktail", "biere", "vin", "pub",
+        "karaoke", "billard", "flechettes", "soiree"
+    ],
+    "get_weather_forecast": [
+        "meteo", "temps", "pluie", "pleut", "pleuvoir", "soleil", "beau", "froid",
+        "chaud", "temperature", "prevision", "neige", "orage"
+    ],
+    "get_indoor_activities": [
+        "pleut", "pluie", "pleuvoir", "abri", "interieur", "musee", "escape", "cinema", "bowling"
+    ],
+    "get_outdoor_activities": [
+        "exterieur", "plein air", "dehors", "beau", "soleil", "parc", "balade",
+        "promenade", "jardin", "velo", "pique nique", "terrasse"
+    ]
+}
+
+GREETING = re.compile(
+    r"^(bonjour|bonsoir|salut|coucou|hello|hey|merci|merci beaucoup|ca va|comment ca va|"
+    r"au revoir|bonne journee|bonne soiree|ok|d accord|super|top|cool)( [a-z]+)?$"
+)
+
+class ToolSelector:
+    """
+    Choisit le sous-ensemble de tools à envoyer avec un message.
+
+    Chaque tool a un vocabulaire: ses mots-clés et les exemples de ses
+    paramètres ("ex: italien, japonais..."). Un tool inconnu (ajouté au
+    manifeste) utilise à la place les mots distinctifs de sa description.
+    Un tool est retenu si le message (ou, à défaut, la question précédente)
+    contient l'un de ses mots. Les salutations n'ont pas de tools; sans
+    aucune correspondance on envoie la liste complète.
+    """
+
+    def __init__(
+        self,
+        catalog: ToolCatalog,
+        context_window: ContextWindow,
+        enabled: bool = None
+    ):
+        self.catalog = catalog
+        self.context_window = context_window
+        if enabled is None:
+            enabled = os.getenv("TOOL_SELECTOR_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+        self.enabled = enabled
+
+        self.stats: Dict[str, Any] = {
+            "requests": 0,
+            "subset": 0,
+            "no_tools": 0,
+            "full_set_fallback": 0,
+            "tokens_saved": 0
+        }
+
+        self._build_vocabulary(catalog)
+        catalog.subscribe(self._build_vocabulary)
+
+        logger.info(f"Sélection des tools - activée: {self.enabled}")
+
+    @staticmethod
+    def _stem(word: str) -> str:
+        """Racine grossière: accords et dérivés proches (restaurants -> restau)"""
+        return word[:6] if len(word) > 6 else word.rstrip("s")
+
+    def _words(self, text: str) -> Set[str]:
+        return {self._stem(word) for word in normalize_text(text).split() if len(word) >= 3}
+
+    def _build_vocabulary(self, catalog: ToolCatalog):
+        """Vocabulaire de chaque tool, recalculé quand le catalogue change"""
+        examples: Dict[str, Set[str]] = {}
+        described: Dict[str, Set[str]] = {}
+        for tool in catalog.tools:
+            function = tool["function"]
+            name = function["name"]
+            examples[name] = set()
+            for spec in function.get("parameters", {}).get("properties", {}).values():
+                match = PARAMETER_EXAMPLES.search(spec.get("description", ""))
+                if match:
+                    examples[name] |= {
+                        word for word in self._words(match.group(1)) - STOPWORDS
+                        if len(word) >= 4
+                    }
+            described[name] = self._words(function.get("description", "")) - STOPWORDS
+
+        # Mots présents dans au moins la moitié des descriptions: pas discriminants
+        counts: Dict[str, int] = {}
+        for words in described.values():
+            for word in words:
+                counts[word] = counts.get(word, 0) + 1
+        common = {word for word, count in counts.items() if count * 2 >= max(len(described), 2)}
+
+        self.vocabulary: Dict[str, Set[str]] = {}
+        self.phrases: Dict[str, List[str]] = {}
+        for name in examples:
+            keywords = TOOL_KEYWORDS.get(name)
+            if keywords is None:
+                self.vocabulary[name] = examples[name] | (described[name] - common)
+                self.phrases[name] = []
+            else:
+                self.vocabulary[name] = examples[name] | {self._stem(k) for k in keywords if " " not in k}
+                self.phrases[name] = [k for k in keywords if " " in k]
+
+    def _match(self, text: str) -> List[str]:
+        """Tools dont le vocabulaire apparaît dans le texte, dans l'ordre du catalogue"""
+        normalized = normalize_text(text)
+        words = self._words(normalized)
+        return [
+            name for name in self.catalog.names
+            if words & self.vocabulary.get(name, set())
+            or any(phrase in normalized for phrase in self.phrases.get(name, []))
+        ]
+
+    def select(self, message: str, history: List[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Tools à envoyer pour ce message
+
+        Args:
+            message: Message courant
+            history: Historique (question précédente utilisée si le message seul ne suffit pas)
+
+        Returns:
+            Liste des tools (éventuellement complète), ou None pour n'en envoyer aucun
+        """
+        tools = self.catalog.tools
+        if not self.enabled:
+            return tools
+
+        self.stats["requests"] += 1
+        names = self._match(message)
+
+        if not names and GREETING.match(normalize_text(message)):
+            self._record("no_tools", [])
+            return None
+
+        if not names and history:
+            previous = [m.get("content", "") for m in history[:-1] if m.get("role") == "user"]
+            if previous:
+                names = self._match(previous[-1])
+
+        if not names:
+            self._record("full_set_fallback", tools)
+            return tools
+
+        selected = [tool for tool in tools if tool["function"]["name"] in names]
+        self._record("subset", selected)
+        return selected
+
+    def _record(self, outcome: str, selected: List[Dict[str, Any]]):
+        """Compteurs et tokens économisés par rapport à la liste complète"""
+        self.stats[outcome] += 1
+        saved = 0
+        if len(selected) < len(self.catalog.tools):
+            full = len(self.catalog.tools_json)
+            kept = len(self.catalog.serialize(selected)) if selected else 0
+            saved = self.context_window.tokens_for_chars(full) - self.context_window.tokens_for_chars(kept)
+            self.stats["tokens_saved"] += saved
+        logger.info(
+            f"Tools envoyés: {len(selected)}/{len(self.catalog.tools)} "
+            f"({[tool['function']['name'] for tool in selected]}), ~{saved} tokens de prompt économisés"
+        )
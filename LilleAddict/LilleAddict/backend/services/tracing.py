@@ -0,0 +1,167 @@
+"""
+Traces d'exécution - Chronologie des étapes d'une requête de chat
+(attente d'admission, appels Ollama, tools, formatage)
+"""
+
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Trace de la requête en cours: les services y ajoutent leurs étapes sans
+# qu'on ait à la passer en paramètre. Les tâches asyncio créées pendant la
+# requête (tools en parallèle) héritent de la même trace.
+_current: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+
+# Catégories du résumé Server-Timing (préfixe du nom de l'étape)
+SERVER_TIMING_CATEGORIES = ("queue", "llm", "tool", "format")
+
+class Trace:
+    """Chronologie d'une requête: liste d'étapes {name, start_ms, duration_ms, attributes}"""
+
+    def __init__(self, conversation_id: str, request_id: str = None, endpoint: str = ""):
+        self.request_id = request_id or uuid.uuid4().hex[:16]
+        self.conversation_id = conversation_id
+        self.endpoint = endpoint
+        self.started_at = time.time()
+        self._started = time.monotonic()
+        self.duration_ms: Optional[float] = None
+        self.spans: List[Dict[str, Any]] = []
+
+    def _offset_ms(self, instant: float) -> float:
+        return round((instant - self._started) * 1000, 2)
+
+    def add(self, name: str, started: float, ended: float, **attributes):
+        """Ajoute une étape mesurée par l'appelant (instants time.monotonic())"""
+        self.spans.append({
+            "name": name,
+            "start_ms": self._offset_ms(started),
+            "duration_ms": round((ended - started) * 1000, 2),
+            "attributes": attributes
+        })
+
+    def finish(self):
+        if self.duration_ms is None:
+            self.duration_ms = self._offset_ms(time.monotonic())
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Temps écoulé par catégorie (ms), plus la durée totale. Les étapes
+        simultanées (tools en parallèle) ne sont comptées qu'une fois: c'est
+        la durée de l'union de leurs intervalles, jamais plus que le total.
+        """
+        intervals: Dict[str, List[Tuple[float, float]]] = {category: [] for category in SERVER_TIMING_CATEGORIES}
+        for span in self.spans:
+            category = span["name"].split(".", 1)[0]
+            if category in intervals:
+                intervals[category].append((span["start_ms"], span["start_ms"] + span["duration_ms"]))
+
+        totals = {}
+        for category, spans in intervals.items():
+            elapsed = 0.0
+            current_start, current_end = None, None
+            for start, end in sorted(spans):
+                if current_end is None or start > current_end:
+                    if current_end is not None:
+                        elapsed += current_end - current_start
+                    current_start, current_end = start, end
+                else:
+                    current_end = max(current_end, end)
+            if current_end is not None:
+                elapsed += current_end - current_start
+            if elapsed:
+                totals[category] = round(elapsed, 2)
+        totals["total"] = self.duration_ms if self.duration_ms is not None else self._offset_ms(time.monotonic())
+        return totals
+
+    def server_timing(self) -> str:
+        """Valeur de l'en-tête Server-Timing (ex: "queue;dur=3.1, llm;dur=812.4, total;dur=905.0")"""
+        return ", ".join(f"{category};dur={value}" for category, value in self.summary().items())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "request_id": self.request_id,
+            "conversation_id": self.conversation_id,
+            "endpoint": self.endpoint,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "summary": self.summary(),
+            "spans": sorted(self.spans, key=lambda span: span["start_ms"])
+        }
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Dict[str, Any]]:
+    """
+    Mesure le bloc comme une étape de la trace courante (sans effet hors requête)
+
+    Le dict produit permet d'ajouter des attributs connus en fin de bloc.
+    Une exception est enregistrée dans l'attribut "error" puis propagée.
+    """
+    trace = _current.get()
+    started = time.monotonic()
+    try:
+        yield attributes
+    except BaseException as e:
+        attributes["error"] = str(e) or type(e).__name__
+        raise
+    finally:
+        if trace is not None:
+            trace.add(name, started, time.monotonic(), **attributes)
+
+def record(name: str, started: float, ended: float = None, **attributes):
+    """Ajoute une étape déjà mesurée à la trace courante"""
+    trace = _current.get()
+    if trace is not None:
+        trace.add(name, started, ended if ended is not None else time.monotonic(), **attributes)
+
+class TraceBuffer:
+    """
+    Dernières traces en mémoire (tampon circulaire borné), consultables par
+    ID de requête ou de conversation.
+    """
+
+    def __init__(self, max_traces: int = None, enabled: bool = None):
+        self.max_traces = max_traces or int(os.getenv("TRACE_BUFFER_SIZE", "200"))
+        if enabled is None:
+            enabled = os.getenv("TRACING_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+        self.enabled = enabled
+        self._traces: deque = deque(maxlen=self.max_traces)
+
+        logger.info(f"Traces d'exécution - activées: {self.enabled}, tampon: {self.max_traces}")
+
+    def start(self, conversation_id: str, endpoint: str) -> Optional[Trace]:
+        """Démarre la trace de la requête courante (None si désactivé)"""
+        if not self.enabled:
+            return None
+        trace = Trace(conversation_id, endpoint=endpoint)
+        _current.set(trace)
+        self._traces.append(trace)
+        return trace
+
+    def find(self, identifier: str) -> List[Dict[str, Any]]:
+        """Traces d'une requête ou d'une conversation, plus anciennes d'abord"""
+        return [
+            trace.to_dict() for trace in list(self._traces)
+            if identifier in (trace.request_id, trace.conversation_id)
+        ]
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Résumé des dernières traces, plus récentes d'abord"""
+        traces = list(self._traces)[-limit:] if limit > 0 else []
+        return [
+            {
+                "request_id": trace.request_id,
+                "conversation_id": trace.conversation_id,
+                "endpoint": trace.endpoint,
+                "started_at": trace.started_at,
+                "duration_ms": trace.duration_ms,
+                "summary": trace.summary()
+            }
+            for trace in reversed(traces)
+        ]
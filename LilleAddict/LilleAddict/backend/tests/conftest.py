@@ -0,0 +1,52 @@
+"""
+Configuration des tests du backend (lancés depuis backend/: python -m pytest)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Imports du backend (services, utils) comme au lancement de main.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.mcp_client import MCPClient
+from services.tool_catalog import ToolCatalog
+
+from fakes import FakeMCPServer
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+@pytest.fixture
+def manifest():
+    """Manifeste des tools publié par le serveur MCP (enregistré dans tests/fixtures)"""
+    return json.loads((FIXTURES / "tool_manifest.json").read_text(encoding="utf-8"))
+
+@pytest.fixture
+def mcp_server():
+    """Serveur MCP simulé (avec /tools/batch, 50 ms par requête)"""
+    return FakeMCPServer()
+
+@pytest.fixture
+def mcp_client(tool_catalog, mcp_server):
+    """Client MCP branché sur le serveur simulé, cache de résultats activé"""
+    client = MCPClient(base_url="http://mcp", catalog=tool_catalog)
+    client.cache_enabled = True
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(mcp_server.handler))
+    return client
+
+@pytest.fixture
+def tool_catalog(tmp_path):
+    """Catalogue vide, sans relire ni écrire le manifeste partagé du poste"""
+    return ToolCatalog(snapshot_path=str(tmp_path / "tool-manifest.json"))
+
+@pytest.fixture
+def backend():
+    """
+    Module main (application et services), sans lifespan: ni sondes ni
+    tâches de fond, aucun appel à Ollama ni au serveur MCP
+    """
+    import main
+    return main
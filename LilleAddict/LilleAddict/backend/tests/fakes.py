@@ -0,0 +1,59 @@
+"""
+Dépendances simulées partagées par les tests
+"""
+
+import asyncio
+import json
+
+import httpx
+
+BARS = {"bars": [{"nom": "Le Capitole"}]}
+WEATHER = {"ville": "Lille", "temps": "pluie"}
+
+class FakeMCPServer:
+    """
+    Serveur MCP simulé: routes /tools/<nom> et /tools/batch, requêtes
+    reçues et nombre maximal de requêtes traitées en même temps. La durée
+    de chaque tool annoncée par /tools/batch est réglable par tool.
+    """
+
+    def __init__(self, batch: bool = True, delay: float = 0.05):
+        self.batch = batch
+        self.delay = delay
+        self.durations_ms = {}
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @staticmethod
+    def run(name: str, arguments):
+        if name == "search_bars":
+            return {"success": True, "data": BARS}
+        if name == "get_weather_forecast":
+            return {"success": True, "data": {**WEATHER, **arguments}}
+        return {"success": False, "error": f"Tool inconnu: {name}"}
+
+    def batch_response(self, calls) -> httpx.Response:
+        results = [
+            {"name": call["name"], "duration_ms": self.durations_ms.get(call["name"], 12.5), **self.run(call["name"], call.get("arguments") or {})}
+            for call in calls
+        ]
+        return httpx.Response(200, json={"results": results})
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.requests.append(path)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        body = json.loads(request.content)
+
+        if path == "/tools/batch":
+            if not self.batch:
+                return httpx.Response(404, json={"detail": "Not Found"})
+            return self.batch_response(body["calls"])
+
+        return httpx.Response(200, json=self.run(path.rsplit("/", 1)[-1], body["arguments"]))
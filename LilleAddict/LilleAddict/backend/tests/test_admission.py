@@ -0,0 +1,132 @@
+"""
+Tests du contrôle d'admission (places, file priorisée, refus 429/503)
+"""
+
+import asyncio
+
+import pytest
+
+from services.admission import (
+    AdmissionController,
+    AdmissionRejected,
+    PRIORITY_CONTINUATION,
+    PRIORITY_DEFAULT,
+    PRIORITY_SHORT
+)
+
+def test_admits_up_to_max_concurrency_without_queueing():
+    async def scenario():
+        admission = AdmissionController(max_concurrency=2, max_queue=4, queue_timeout=1)
+        await admission.acquire()
+        await admission.acquire()
+        assert admission.active == 2
+        assert admission.queue_depth == 0
+        assert admission.counters["queued"] == 0
+
+    asyncio.run(scenario())
+
+def test_released_slot_goes_to_highest_priority_then_arrival_order():
+    async def scenario():
+        admission = AdmissionController(max_concurrency=1, max_queue=4, queue_timeout=5)
+        await admission.acquire()
+        order = []
+
+        async def wait(name: str, priority: int):
+            await admission.acquire(priority)
+            order.append(name)
+
+        tasks = [
+            asyncio.create_task(wait("défaut", PRIORITY_DEFAULT)),
+            asyncio.create_task(wait("courte 1", PRIORITY_SHORT)),
+            asyncio.create_task(wait("courte 2", PRIORITY_SHORT)),
+            asyncio.create_task(wait("suite", PRIORITY_CONTINUATION))
+        ]
+        await asyncio.sleep(0)
+        assert admission.queue_depth == 4
+
+        for _ in tasks:
+            admission.release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+        assert order == ["suite", "courte 1", "courte 2", "défaut"]
+        # Chaque place est transmise directement: toujours une seule active
+        assert admission.active == 1
+
+    asyncio.run(scenario())
+
+def test_full_queue_rejects_new_requests_with_429_but_not_continuations():
+    async def scenario():
+        admission = AdmissionController(max_concurrency=1, max_queue=1, queue_timeout=5)
+        await admission.acquire()
+        queued = asyncio.create_task(admission.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            admission.check(PRIORITY_SHORT)
+        assert rejected.value.status_code == 429
+        assert rejected.value.retry_after >= 1
+
+        with pytest.raises(AdmissionRejected):
+            await admission.acquire(PRIORITY_DEFAULT)
+
+        # Requête déjà engagée: mise en file malgré la file pleine
+        continuation = asyncio.create_task(admission.acquire(PRIORITY_CONTINUATION))
+        await asyncio.sleep(0)
+        assert admission.queue_depth == 2
+
+        admission.release()
+        await continuation
+        admission.release()
+        await queued
+        assert admission.counters["rejected_queue_full"] == 2
+
+    asyncio.run(scenario())
+
+def test_queue_timeout_rejects_with_503_and_frees_the_queue():
+    async def scenario():
+        admission = AdmissionController(max_concurrency=1, max_queue=4, queue_timeout=0.05)
+        await admission.acquire()
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await admission.acquire()
+        assert rejected.value.status_code == 503
+        assert admission.queue_depth == 0
+        assert admission.counters["rejected_timeout"] == 1
+
+        # La place libérée n'est pas transmise à l'attente abandonnée
+        admission.release()
+        assert admission.active == 0
+
+    asyncio.run(scenario())
+
+def test_cancelled_waiter_does_not_leak_its_slot():
+    async def scenario():
+        admission = AdmissionController(max_concurrency=1, max_queue=4, queue_timeout=5)
+        await admission.acquire()
+        waiter = asyncio.create_task(admission.acquire())
+        await asyncio.sleep(0)
+
+        # Client déconnecté pendant l'attente: la place libérée n'est pas perdue
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        admission.release()
+
+        assert admission.active == 0
+        assert admission.queue_depth == 0
+        await admission.acquire()
+        assert admission.active == 1
+
+    asyncio.run(scenario())
+
+def test_slot_releases_on_error():
+    async def scenario():
+        admission = AdmissionController(max_concurrency=1, max_queue=4, queue_timeout=1)
+        with pytest.raises(RuntimeError):
+            async with admission.slot():
+                assert admission.active == 1
+                raise RuntimeError("génération en échec")
+        assert admission.active == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,83 @@
+"""
+Tests du cache de réponses (clé normalisée, empreinte des données des
+tools, invalidation)
+"""
+
+from services.answer_cache import AnswerCache, ToolDataVersions
+
+EVENTS = [{"titre": "Braderie", "date": "samedi"}]
+WEATHER = {"ville": "Lille", "temps": "pluie"}
+
+def make_cache(**options):
+    versions = ToolDataVersions()
+    cache = AnswerCache(versions, max_entries=options.get("max_entries", 10), ttl=options.get("ttl", 60))
+    cache.enabled = True
+    return versions, cache
+
+def result(tool: str, success: bool = True):
+    return {"tool": tool, "success": success}
+
+def test_answer_served_for_normalized_question_while_data_unchanged():
+    versions, cache = make_cache()
+    versions.observe("get_weekend_events", EVENTS)
+
+    cache.put("Que faire ce week-end ?", [result("get_weekend_events")], "La Braderie !")
+
+    assert cache.get("que faire ce week end") == "La Braderie !"
+    assert cache.get("QUE FAIRE CE WEEK-END?") == "La Braderie !"
+    assert cache.get("que faire demain ?") is None
+
+def test_changed_tool_data_invalidates_dependent_answers_only():
+    versions, cache = make_cache()
+    versions.observe("get_weekend_events", EVENTS)
+    versions.observe("get_weather_forecast", WEATHER)
+
+    cache.put("Que faire ce week-end ?", [result("get_weekend_events")], "La Braderie !")
+    cache.put("Quel temps demain ?", [result("get_weather_forecast")], "De la pluie.")
+
+    assert versions.observe("get_weekend_events", EVENTS + [{"titre": "Concert"}])
+
+    assert cache.get("Que faire ce week-end ?") is None
+    assert cache.get("Quel temps demain ?") == "De la pluie."
+    assert cache.invalidations == 1
+
+def test_same_data_observed_again_keeps_answers():
+    versions, cache = make_cache()
+    versions.observe("get_weekend_events", EVENTS)
+    cache.put("Que faire ce week-end ?", [result("get_weekend_events")], "La Braderie !")
+
+    assert not versions.observe("get_weekend_events", list(EVENTS))
+    assert cache.get("Que faire ce week-end ?") == "La Braderie !"
+
+def test_answers_built_on_failed_or_unknown_tools_are_not_cached():
+    versions, cache = make_cache()
+    versions.observe("get_weekend_events", EVENTS)
+
+    cache.put("Que faire ?", [result("get_weekend_events"), result("search_bars", success=False)], "Réponse partielle")
+    cache.put("Quels bars ?", [result("search_bars")], "Réponse sans version de données")
+    cache.put("Bonjour", [], "")
+
+    assert cache.get("Que faire ?") is None
+    assert cache.get("Quels bars ?") is None
+    assert cache.get("Bonjour") is None
+
+def test_answer_without_tools_is_cached():
+    _, cache = make_cache()
+    cache.put("Bonjour !", [], "Salut, que veux-tu faire à Lille ?")
+    assert cache.get("bonjour") == "Salut, que veux-tu faire à Lille ?"
+
+def test_disabled_cache_serves_nothing():
+    _, cache = make_cache()
+    cache.enabled = False
+    cache.put("Bonjour !", [], "Salut")
+    assert cache.get("Bonjour !") is None
+
+def test_hits_and_misses_counted_in_stats():
+    versions, cache = make_cache()
+    versions.observe("search_bars", {"bars": []})
+    cache.put("Quels bars ?", [result("search_bars")], "Aucun bar")
+
+    assert cache.get("Que faire ?") is None
+    assert cache.get("Quels bars ?") == "Aucun bar"
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,145 @@
+"""
+Tests de la boucle d'agent (tours de tools, nombre max de tours, échéance
+et réserve de génération)
+"""
+
+import asyncio
+import time
+
+from services.admission import PRIORITY_CONTINUATION, PRIORITY_SHORT
+from services.chat_agent import ChatAgent
+
+TOOLS = [{"type": "function", "function": {"name": "search_bars", "parameters": {}}}]
+BAR_CALL = {"function": {"name": "search_bars", "arguments": {}}}
+
+class FakeOllama:
+    """Ollama simulé: demande des tools tant qu'il lui en reste, puis répond"""
+
+    def __init__(self, tool_rounds: int = 0):
+        self.tool_rounds = tool_rounds
+        self.calls = []
+
+    def reply(self, tools, timeout, priority):
+        self.calls.append({"tools": tools, "timeout": timeout, "priority": priority})
+        if tools and self.tool_rounds:
+            self.tool_rounds -= 1
+            return {"content": "", "tool_calls": [BAR_CALL]}
+        return {"content": "Le Capitole !", "tool_calls": []}
+
+    async def chat(self, messages, tools=None, timeout=None, priority=None, conv_id=None):
+        return self.reply(tools, timeout, priority)
+
+    async def chat_stream(self, messages, tools=None, timeout=None, priority=None, conv_id=None):
+        response = self.reply(tools, timeout, priority)
+        if response["content"]:
+            for token in ("Le ", "Capitole !"):
+                yield {"content": token, "tool_calls": []}
+        if response["tool_calls"]:
+            yield {"content": "", "tool_calls": response["tool_calls"]}
+
+    def tool_messages(self, results, query=""):
+        return [{"role": "tool", "content": str(result)} for result in results]
+
+class FakeExecutor:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.timeouts = []
+
+    async def run(self, tool_calls, conv_id=None, timeout=None):
+        self.timeouts.append(timeout)
+        await asyncio.sleep(self.delay)
+        return [{"tool": call["function"]["name"], "success": True, "data": {}} for call in tool_calls]
+
+class FakeRouter:
+    def __init__(self, calls=None):
+        self.calls = calls
+
+    def route(self, message):
+        return self.calls
+
+class FakeMCP:
+    def get_available_tools(self):
+        return TOOLS
+
+def make_agent(ollama, executor=None, router=None, **options) -> ChatAgent:
+    defaults = {"deadline": 10, "max_rounds": 2, "generation_reserve": 2}
+    return ChatAgent(ollama, FakeMCP(), executor or FakeExecutor(), router or FakeRouter(), **{**defaults, **options})
+
+def run(agent, message="Un bar ?"):
+    return asyncio.run(agent.run([{"role": "user", "content": message}], "conv", message))
+
+def test_answer_without_tools_in_one_generation():
+    ollama = FakeOllama(tool_rounds=0)
+    result = run(make_agent(ollama))
+
+    assert result == {"type": "result", "content": "Le Capitole !", "tool_results": []}
+    assert len(ollama.calls) == 1
+    assert ollama.calls[0]["priority"] == PRIORITY_SHORT
+
+def test_tool_round_then_final_generation_within_reserve():
+    ollama, executor = FakeOllama(tool_rounds=1), FakeExecutor()
+    agent = make_agent(ollama, executor, deadline=10, generation_reserve=2)
+    result = run(agent)
+
+    assert [result["tool"] for result in result["tool_results"]] == ["search_bars"]
+    assert len(ollama.calls) == 2
+    # Génération avec tools et tools eux-mêmes: jamais au-delà de l'échéance moins la réserve
+    assert ollama.calls[0]["timeout"] <= 8
+    assert executor.timeouts[0] <= 8
+    # Suite engagée: priorité de continuation
+    assert ollama.calls[1]["priority"] == PRIORITY_CONTINUATION
+
+def test_rounds_stop_at_max_rounds_then_answer_without_tools():
+    ollama = FakeOllama(tool_rounds=5)
+    agent = make_agent(ollama, max_rounds=2, deadline=30, generation_reserve=2)
+    result = run(agent)
+
+    assert len(result["tool_results"]) == 2
+    assert [call["tools"] is not None for call in ollama.calls] == [True, True, False]
+    assert result["content"] == "Le Capitole !"
+
+def test_low_budget_skips_tool_rounds():
+    ollama, executor = FakeOllama(tool_rounds=1), FakeExecutor()
+    agent = make_agent(ollama, executor, deadline=3, generation_reserve=2)
+    result = run(agent)
+
+    assert result["tool_results"] == []
+    assert executor.timeouts == []
+    assert [call["tools"] for call in ollama.calls] == [None]
+    assert agent.stats["budget_cutoffs"] == 1
+
+def test_slow_tools_leave_the_reserve_for_the_answer():
+    ollama, executor = FakeOllama(tool_rounds=5), FakeExecutor(delay=0.9)
+    agent = make_agent(ollama, executor, deadline=2.0, generation_reserve=0.6, max_rounds=3)
+
+    started = time.monotonic()
+    result = run(agent)
+
+    # Un seul tour: après les tools il ne reste plus deux réserves
+    assert len(executor.timeouts) == 1
+    assert executor.timeouts[0] <= 1.4
+    assert ollama.calls[-1]["tools"] is None
+    assert 1.0 <= ollama.calls[-1]["timeout"] <= 1.1
+    assert agent.stats["budget_cutoffs"] == 1
+    assert result["content"] == "Le Capitole !"
+    assert time.monotonic() - started < 2.0
+
+def test_routed_intent_skips_the_selection_round():
+    ollama, executor = FakeOllama(tool_rounds=1), FakeExecutor()
+    agent = make_agent(ollama, executor, router=FakeRouter([BAR_CALL]))
+    result = run(agent)
+
+    assert len(executor.timeouts) == 1
+    assert [call["tools"] for call in ollama.calls] == [None]
+    assert agent.stats["routed"] == 1
+    assert result["tool_results"][0]["tool"] == "search_bars"
+
+def test_stream_yields_tokens_then_result():
+    agent = make_agent(FakeOllama(tool_rounds=1))
+
+    async def collect():
+        return [event async for event in agent.stream([{"role": "user", "content": "Un bar ?"}], "conv", "Un bar ?")]
+
+    events = asyncio.run(collect())
+    assert [event["type"] for event in events] == ["token", "token", "result"]
+    assert [event["content"] for event in events] == ["Le ", "Capitole !", "Le Capitole !"]
@@ -0,0 +1,95 @@
+"""
+Tests de l'endpoint de chat en streaming (NDJSON) et de l'historique
+laissé par un tour réussi ou en échec
+"""
+
+import asyncio
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services.admission import AdmissionRejected
+
+@pytest.fixture(autouse=True)
+def no_answer_cache(backend, monkeypatch):
+    """Chaque test génère sa réponse (pas de réponse servie depuis le cache)"""
+    monkeypatch.setattr(backend.answer_cache, "enabled", False)
+
+def stream_events(response):
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+def history(backend, conv_id):
+    return asyncio.run(backend.conversations.get(conv_id))
+
+def post_stream(backend, message="Quels bars ce soir ?"):
+    conv_id = uuid.uuid4().hex
+    response = TestClient(backend.app).post("/api/chat/stream", json={"message": message, "conversation_id": conv_id})
+    return conv_id, response
+
+def test_tokens_streamed_then_done_and_reply_stored(backend, monkeypatch):
+    async def stream(history, conv_id, message):
+        for token in ("Le ", "Capitole", " !"):
+            yield {"type": "token", "content": token}
+        yield {"type": "result", "content": "Le Capitole !", "tool_results": []}
+
+    monkeypatch.setattr(backend.chat_agent, "stream", stream)
+    conv_id, response = post_stream(backend)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = stream_events(response)
+    assert events[0] == {"type": "start", "conversation_id": conv_id}
+    assert [event["content"] for event in events if event["type"] == "token"] == ["Le ", "Capitole", " !"]
+    assert events[-1]["type"] == "done"
+    assert "total" in events[-1]["timing"]
+    assert history(backend, conv_id)[-1] == {"role": "assistant", "content": "Le Capitole !"}
+
+def test_error_mid_stream_closes_the_turn(backend, monkeypatch):
+    async def stream(history, conv_id, message):
+        yield {"type": "token", "content": "Le "}
+        raise RuntimeError("Ollama coupé")
+
+    monkeypatch.setattr(backend.chat_agent, "stream", stream)
+    conv_id, response = post_stream(backend)
+
+    events = stream_events(response)
+    assert events[-1]["type"] == "error"
+    assert "Ollama coupé" in events[-1]["detail"]
+    assert [message["role"] for message in history(backend, conv_id)] == ["user", "assistant"]
+    assert history(backend, conv_id)[-1]["content"] == backend.FAILED_TURN_RESPONSE
+
+def test_admission_refusal_returns_429_and_closes_the_turn(backend, monkeypatch):
+    def check(priority):
+        raise AdmissionRejected(429, 3, "File d'attente Ollama pleine")
+
+    monkeypatch.setattr(backend.ollama_client.admission, "check", check)
+    conv_id, response = post_stream(backend)
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+    assert history(backend, conv_id)[-1]["content"] == backend.FAILED_TURN_RESPONSE
+
+def test_storage_error_before_the_stream_returns_500_and_finishes_the_trace(backend, monkeypatch):
+    async def unavailable(conv_id, message):
+        raise OSError("base de conversations indisponible")
+
+    monkeypatch.setattr(backend.conversations, "append", unavailable)
+    conv_id, response = post_stream(backend)
+
+    assert response.status_code == 500
+    assert "indisponible" in response.json()["detail"]
+    trace = backend.traces.find(conv_id)[-1]
+    assert trace["duration_ms"] is not None
+
+def test_history_read_error_closes_the_turn(backend, monkeypatch):
+    async def unavailable(conv_id):
+        raise OSError("lecture impossible")
+
+    monkeypatch.setattr(backend.conversations, "get", unavailable)
+    conv_id, response = post_stream(backend)
+    monkeypatch.undo()
+
+    assert response.status_code == 500
+    assert [message["role"] for message in history(backend, conv_id)] == ["user", "assistant"]
@@ -0,0 +1,81 @@
+"""
+Tests de la fenêtre de contexte (budget de tokens, résumé des anciens
+messages, messages du tour en cours toujours envoyés)
+"""
+
+import json
+
+from services.admission import AdmissionController
+from services.context_window import ContextWindow
+from services.ollama_client import OllamaClient
+
+def conversation(turns: int, length: int = 200):
+    messages = []
+    for turn in range(turns):
+        messages.append({"role": "user", "content": f"Question {turn}. " + "q" * length})
+        messages.append({"role": "assistant", "content": f"Réponse {turn}. " + "r" * length})
+    return messages
+
+def test_history_within_budget_is_unchanged():
+    window = ContextWindow(max_tokens=10000, summarize=True)
+    history = conversation(3)
+    assert window.fit(history) == history
+    assert window.stats["trimmed_requests"] == 0
+
+def test_keeps_most_recent_messages_within_budget():
+    window = ContextWindow(max_tokens=400, summarize=False)
+    history = conversation(10) + [{"role": "user", "content": "Et ce soir ?"}]
+
+    kept = window.fit(history, reserved_tokens=50)
+
+    assert kept[-1]["content"] == "Et ce soir ?"
+    assert kept == history[-len(kept):]
+    assert window.estimate_messages(kept) <= 400 - 50
+    assert window.stats["dropped_messages"] == len(history) - len(kept)
+
+def test_current_question_kept_even_over_budget():
+    window = ContextWindow(max_tokens=50, summarize=False)
+    question = {"role": "user", "content": "x" * 2000}
+    assert window.fit(conversation(2) + [question]) == [question]
+
+def test_dropped_messages_summarized_within_summary_budget():
+    window = ContextWindow(max_tokens=400, summarize=True, summary_tokens=60)
+    history = conversation(10) + [{"role": "user", "content": "Et ce soir ?"}]
+
+    fitted = window.fit(history)
+
+    summary = fitted[0]
+    assert summary["role"] == "system"
+    assert summary["content"].startswith("Résumé du début de la conversation:")
+    assert "Réponse" in summary["content"] or "Question" in summary["content"]
+    assert window.estimate_messages([summary]) <= 60 + 4
+    assert fitted[-1]["content"] == "Et ce soir ?"
+
+def test_calibration_moves_ratio_within_bounds():
+    window = ContextWindow(max_tokens=1000)
+    window.observe(prompt_chars=10000, prompt_eval_count=100)
+    assert 3.5 < window.chars_per_token <= 6.0
+    window.observe(prompt_chars=0, prompt_eval_count=100)
+    assert window.stats["calibrations"] == 1
+
+def test_payload_keeps_current_tool_round_and_trims_history_only(tool_catalog):
+    client = OllamaClient(
+        urls=["http://ollama:11434"],
+        context_window=ContextWindow(max_tokens=600, summarize=False),
+        admission=AdmissionController(max_concurrency=1, max_queue=1, queue_timeout=1),
+        tool_catalog=tool_catalog
+    )
+    question = {"role": "user", "content": "Quels bars ce soir ?"}
+    tool_round = [
+        {"role": "assistant", "content": "", "tool_calls": [{"function": {"name": "search_bars", "arguments": {}}}]},
+        {"role": "tool", "content": "b" * 800}
+    ]
+
+    body, message_count, _ = client._build_payload(conversation(10) + [question] + tool_round, None, None, stream=False)
+    messages = json.loads(body)["messages"]
+
+    assert messages[0]["role"] == "system"
+    assert messages[-3:] == [question] + tool_round
+    assert len(messages) == message_count
+    # Historique réduit pour faire place au tour de tools
+    assert len(messages) < 1 + 20 + 3
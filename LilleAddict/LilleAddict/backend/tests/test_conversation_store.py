@@ -0,0 +1,170 @@
+"""
+Tests du stockage des conversations: en mémoire (messages max, TTL
+d'inactivité, éviction LRU par nombre et par budget mémoire) et SQLite
+(partage entre workers, historique borné sur disque)
+"""
+
+import asyncio
+
+from services.conversation_store import InMemoryConversationStore, SQLiteConversationStore, message_size
+
+def user(content: str):
+    return {"role": "user", "content": content}
+
+def test_append_creates_then_extends_and_get_returns_a_copy():
+    store = InMemoryConversationStore(max_conversations=10, max_turns=10, idle_ttl=60, max_bytes=10**6)
+
+    async def scenario():
+        assert await store.append("a", user("bonjour")) is True
+        assert await store.append("a", {"role": "assistant", "content": "salut"}) is False
+        history = await store.get("a")
+        history.append(user("modifié hors du store"))
+        return await store.get("a"), await store.get("inconnue")
+
+    history, unknown = asyncio.run(scenario())
+    assert [message["content"] for message in history] == ["bonjour", "salut"]
+    assert unknown is None
+
+def test_oldest_messages_trimmed_beyond_max_turns():
+    store = InMemoryConversationStore(max_conversations=10, max_turns=3, idle_ttl=60, max_bytes=10**6)
+
+    async def scenario():
+        for index in range(5):
+            await store.append("a", user(f"message {index}"))
+        return await store.get("a"), await store.stats()
+
+    history, stats = asyncio.run(scenario())
+    assert [message["content"] for message in history] == ["message 2", "message 3", "message 4"]
+    assert stats["evictions"]["turns_trimmed"] == 2
+    assert stats["bytes"] == sum(message_size(message) for message in history)
+
+def test_least_recently_used_conversation_evicted_beyond_max_count():
+    store = InMemoryConversationStore(max_conversations=2, max_turns=10, idle_ttl=60, max_bytes=10**6)
+
+    async def scenario():
+        await store.append("a", user("a"))
+        await store.append("b", user("b"))
+        await store.get("a")  # "a" redevient la plus récente
+        await store.append("c", user("c"))
+        return [await store.get(conv_id) is not None for conv_id in ("a", "b", "c")], await store.stats()
+
+    present, stats = asyncio.run(scenario())
+    assert present == [True, False, True]
+    assert stats["evictions"]["lru_count"] == 1
+
+def test_memory_budget_evicts_old_conversations_but_keeps_the_current_one():
+    budget = message_size(user("x" * 100)) * 2
+    store = InMemoryConversationStore(max_conversations=10, max_turns=10, idle_ttl=60, max_bytes=budget)
+
+    async def scenario():
+        await store.append("a", user("x" * 100))
+        await store.append("b", user("x" * 100))
+        await store.append("c", user("x" * 500))
+        return [await store.get(conv_id) is not None for conv_id in ("a", "b", "c")], await store.stats()
+
+    present, stats = asyncio.run(scenario())
+    assert present == [False, False, True]
+    assert stats["evictions"]["lru_bytes"] == 2
+
+def test_idle_conversation_expires():
+    store = InMemoryConversationStore(max_conversations=10, max_turns=10, idle_ttl=0.05, max_bytes=10**6)
+
+    async def scenario():
+        await store.append("a", user("bonjour"))
+        await asyncio.sleep(0.1)
+        expired = await store.get("a")
+        created = await store.append("a", user("de retour"))
+        return expired, created, await store.get("a"), await store.stats()
+
+    expired, created, history, stats = asyncio.run(scenario())
+    assert expired is None
+    assert created is True
+    assert history == [user("de retour")]
+    assert stats["evictions"]["idle_ttl"] == 1
+
+def test_delete():
+    store = InMemoryConversationStore(max_conversations=10, max_turns=10, idle_ttl=60, max_bytes=10**6)
+
+    async def scenario():
+        await store.append("a", user("bonjour"))
+        return await store.delete("a"), await store.delete("a"), await store.stats()
+
+    deleted, again, stats = asyncio.run(scenario())
+    assert (deleted, again) == (True, False)
+    assert stats["conversations"] == 0 and stats["bytes"] == 0
+
+def sqlite_store(tmp_path, **options) -> SQLiteConversationStore:
+    defaults = {"max_turns": 3, "idle_ttl": 60}
+    return SQLiteConversationStore(path=str(tmp_path / "conversations.db"), **{**defaults, **options})
+
+def test_sqlite_store_shared_between_workers(tmp_path):
+    first, second = sqlite_store(tmp_path), sqlite_store(tmp_path)
+
+    async def scenario():
+        assert await first.append("a", user("bonjour")) is True
+        assert await second.append("a", {"role": "assistant", "content": "salut"}) is False
+        history = await first.get("a")
+        await first.close()
+        await second.close()
+        return history
+
+    assert asyncio.run(scenario()) == [user("bonjour"), {"role": "assistant", "content": "salut"}]
+
+def test_sqlite_turns_beyond_max_turns_deleted_on_disk(tmp_path):
+    store = sqlite_store(tmp_path, max_turns=3)
+
+    async def scenario():
+        for index in range(5):
+            await store.append("a", user(f"message {index}"))
+        await store.append("b", user("autre conversation"))
+        return await store.get("a"), await store.stats()
+
+    history, stats = asyncio.run(scenario())
+    assert [message["content"] for message in history] == ["message 2", "message 3", "message 4"]
+    assert stats["messages"] == 4
+    assert stats["evictions"]["turns_trimmed"] == 2
+
+def test_sqlite_concurrent_appends_counted_exactly(tmp_path):
+    store = sqlite_store(tmp_path, max_turns=2)
+
+    async def scenario():
+        await asyncio.gather(*(
+            store.append(f"conv-{conv}", user(f"message {index}"))
+            for conv in range(4) for index in range(5)
+        ))
+        return await store.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["messages"] == 4 * 2
+    assert stats["evictions"]["turns_trimmed"] == 4 * 3
+
+def test_sqlite_expired_conversation_restarts_empty(tmp_path):
+    store = sqlite_store(tmp_path, idle_ttl=0.05)
+
+    async def scenario():
+        await store.append("a", user("bonjour"))
+        await asyncio.sleep(0.1)
+        expired = await store.get("a")
+        created = await store.append("a", user("de retour"))
+        return expired, created, await store.get("a"), await store.stats()
+
+    expired, created, history, stats = asyncio.run(scenario())
+    assert expired is None
+    assert created is True
+    assert history == [user("de retour")]
+    assert stats["evictions"]["idle_ttl"] == 1
+
+def test_sqlite_prune_and_delete(tmp_path):
+    store = sqlite_store(tmp_path, idle_ttl=0.05)
+
+    async def scenario():
+        await store.append("ancienne", user("bonjour"))
+        await asyncio.sleep(0.1)
+        await store.append("récente", user("bonjour"))
+        pruned = await store.prune_expired()
+        return pruned, await store.delete("récente"), await store.delete("récente"), await store.stats()
+
+    pruned, deleted, again, stats = asyncio.run(scenario())
+    assert pruned == 1
+    assert (deleted, again) == (True, False)
+    assert stats["conversations"] == 0 and stats["messages"] == 0
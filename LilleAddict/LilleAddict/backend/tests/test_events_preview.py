@@ -0,0 +1,105 @@
+"""
+Tests de l'aperçu des événements (version matérialisée, ETag, 304,
+dernière version servie si le serveur MCP échoue)
+"""
+
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from services.events_preview import EventsPreview
+
+EVENTS = [{"title": "Braderie de Lille", "date": "samedi"}]
+
+class FakeEventsTool:
+    """get_weekend_events simulé: données modifiables, panne possible"""
+
+    def __init__(self):
+        self.events = list(EVENTS)
+        self.down = False
+        self.calls = 0
+
+    async def call_tool(self, tool_name, arguments, use_cache=True):
+        self.calls += 1
+        if self.down:
+            return {"success": False, "error": "serveur MCP injoignable"}
+        return {"success": True, "data": {"events": self.events, "week_dates": "du 5 au 7 septembre"}}
+
+def loaded_preview(tool: FakeEventsTool) -> EventsPreview:
+    preview = EventsPreview(tool, refresh_interval=300, max_age=60)
+    assert asyncio.run(preview.refresh())
+    return preview
+
+def test_etag_stable_while_data_unchanged_and_new_when_changed():
+    tool = FakeEventsTool()
+    preview = loaded_preview(tool)
+    first = preview.get()["etag"]
+
+    asyncio.run(preview.refresh())
+    assert preview.get()["etag"] == first
+
+    tool.events = EVENTS + [{"title": "Concert", "date": "dimanche"}]
+    asyncio.run(preview.refresh())
+    assert preview.get()["etag"] != first
+    assert len(json.loads(preview.get()["body"])["events"]) == 2
+
+def test_failed_refresh_keeps_last_version():
+    tool = FakeEventsTool()
+    preview = loaded_preview(tool)
+    snapshot = preview.get()
+
+    tool.down = True
+    assert not asyncio.run(preview.refresh())
+    assert preview.get() is snapshot
+    assert preview.refresh_errors == 1
+
+def test_stale_version_served_while_revalidating_in_background():
+    tool = FakeEventsTool()
+    preview = loaded_preview(tool)
+    stale = preview.get()
+    preview.refresh_interval = 0
+
+    async def scenario():
+        served = preview.get()
+        await asyncio.sleep(0.01)
+        return served
+
+    assert asyncio.run(scenario()) is stale
+    assert tool.calls == 2
+
+def test_if_none_match():
+    etag = '"abc"'
+    assert EventsPreview.etag_matches('"abc"', etag)
+    assert EventsPreview.etag_matches('W/"abc"', etag)
+    assert EventsPreview.etag_matches('"zzz", "abc"', etag)
+    assert EventsPreview.etag_matches("*", etag)
+    assert not EventsPreview.etag_matches('"zzz"', etag)
+    assert not EventsPreview.etag_matches(None, etag)
+
+def test_endpoint_serves_etag_then_304(backend, monkeypatch):
+    monkeypatch.setattr(backend, "events_preview", loaded_preview(FakeEventsTool()))
+    client = TestClient(backend.app)
+
+    response = client.get("/api/events/preview")
+    assert response.status_code == 200
+    assert response.json()["events"] == EVENTS
+    assert response.headers["Cache-Control"].startswith("public, max-age=60")
+    etag = response.headers["ETag"]
+
+    not_modified = client.get("/api/events/preview", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    assert client.get("/api/events/preview", headers={"If-None-Match": '"ancien"'}).status_code == 200
+
+def test_endpoint_before_first_load_is_empty_and_not_cacheable(backend, monkeypatch):
+    tool = FakeEventsTool()
+    monkeypatch.setattr(backend, "events_preview", EventsPreview(tool, refresh_interval=300, max_age=60))
+
+    response = TestClient(backend.app).get("/api/events/preview")
+    assert response.status_code == 200
+    assert response.json() == {"events": [], "week_dates": ""}
+    assert response.headers["Cache-Control"] == "no-store"
+    assert "ETag" not in response.headers
@@ -0,0 +1,129 @@
+"""
+Tests des sondes de santé en arrière-plan (états en cache, readiness)
+"""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from services.health import HealthMonitor, STATUS_DEGRADED, STATUS_DOWN, STATUS_UNKNOWN, STATUS_UP
+
+class FakeDependency:
+    """Dépendance sondée: disponible, lente ou en panne"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.down = False
+        self.probes = 0
+
+    async def probe(self):
+        self.probes += 1
+        await asyncio.sleep(self.delay)
+        if self.down:
+            raise ConnectionError("connexion refusée")
+
+def make_monitor(**options) -> HealthMonitor:
+    defaults = {"interval": 60, "timeout": 0.5, "degraded_latency": 100, "failure_threshold": 2}
+    return HealthMonitor(**{**defaults, **options})
+
+def test_unprobed_dependency_is_unknown_and_not_ready():
+    monitor = make_monitor()
+    monitor.register("ollama", FakeDependency().probe)
+
+    assert monitor.status("ollama") == STATUS_UNKNOWN
+    assert not monitor.is_ready()
+    assert monitor.snapshot()["status"] == "down"
+
+def test_fast_probe_up_slow_probe_degraded():
+    monitor = make_monitor(degraded_latency=50)
+    monitor.register("ollama", FakeDependency().probe)
+    monitor.register("mcp", FakeDependency(delay=0.1).probe)
+
+    asyncio.run(monitor.probe_all())
+
+    assert monitor.status("ollama") == STATUS_UP
+    assert monitor.status("mcp") == STATUS_DEGRADED
+    assert monitor.is_ready()
+    assert monitor.snapshot()["status"] == "degraded"
+
+def test_isolated_failure_degrades_then_repeated_failures_go_down():
+    monitor = make_monitor(failure_threshold=2)
+    dependency = FakeDependency()
+    monitor.register("mcp", dependency.probe)
+
+    async def scenario():
+        await monitor.probe_all()
+        dependency.down = True
+        await monitor.probe_all()
+        first = monitor.status("mcp")
+        await monitor.probe_all()
+        return first
+
+    assert asyncio.run(scenario()) == STATUS_DEGRADED
+    assert monitor.status("mcp") == STATUS_DOWN
+    assert monitor.snapshot()["dependencies"]["mcp"]["last_error"] == "connexion refusée"
+    assert not monitor.is_ready()
+
+def test_never_reachable_dependency_is_down_at_once():
+    monitor = make_monitor()
+    dependency = FakeDependency()
+    dependency.down = True
+    monitor.register("ollama", dependency.probe)
+
+    asyncio.run(monitor.probe_all())
+    assert monitor.status("ollama") == STATUS_DOWN
+
+def test_probe_timeout_counts_as_failure():
+    monitor = make_monitor(timeout=0.05)
+    monitor.register("ollama", FakeDependency(delay=1).probe)
+
+    asyncio.run(monitor.probe_all())
+    assert monitor.status("ollama") == STATUS_DOWN
+    assert monitor.snapshot()["dependencies"]["ollama"]["last_error"] == "TimeoutError"
+
+def test_optional_dependency_does_not_affect_readiness():
+    monitor = make_monitor()
+    broken = FakeDependency()
+    broken.down = True
+    monitor.register("ollama", FakeDependency().probe)
+    monitor.register("metrics", broken.probe, required=False)
+
+    asyncio.run(monitor.probe_all())
+    assert monitor.is_ready()
+    assert monitor.snapshot()["status"] == "degraded"
+
+def test_background_loop_probes_until_stopped():
+    monitor = make_monitor(interval=0.01)
+    dependency = FakeDependency()
+    monitor.register("ollama", dependency.probe)
+
+    async def scenario():
+        await monitor.start()
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+        probes = dependency.probes
+        await asyncio.sleep(0.03)
+        return probes
+
+    probes = asyncio.run(scenario())
+    assert probes >= 2
+    assert dependency.probes == probes
+
+def test_health_endpoints_answer_from_cache(backend, monkeypatch):
+    monitor = make_monitor()
+    ollama, mcp = FakeDependency(), FakeDependency()
+    mcp.down = True
+    monitor.register("ollama", ollama.probe)
+    monitor.register("mcp", mcp.probe)
+    asyncio.run(monitor.probe_all())
+    monkeypatch.setattr(backend, "health_monitor", monitor)
+
+    client = TestClient(backend.app)
+    health = client.get("/health").json()
+    ready = client.get("/health/ready")
+
+    assert health["ollama"] is True and health["mcp"] is False
+    assert ready.status_code == 503 and ready.json()["ready"] is False
+    assert client.get("/health/live").json() == {"status": "ok"}
+    # Réponses servies sans nouvelle sonde
+    assert ollama.probes == mcp.probes == 1
@@ -0,0 +1,60 @@
+"""
+Tests du pré-routage des intentions (tool calls proposés sans Ollama pour
+les questions évidentes, repli sur Ollama sinon)
+"""
+
+import pytest
+
+from services.intent_router import IntentRouter
+
+@pytest.fixture
+def router(manifest):
+    return IntentRouter(manifest["tools"], threshold=0.8, enabled=True)
+
+def routed(router, message):
+    calls = router.route(message)
+    if calls is None:
+        return None
+    return {call["function"]["name"]: call["function"]["arguments"] for call in calls}
+
+def test_weather_question_with_days(router):
+    assert routed(router, "Quelle météo pour les 5 prochains jours ?") == {"get_weather_forecast": {"days": 5}}
+    assert routed(router, "Il va pleuvoir demain ?") == {"get_weather_forecast": {"days": 2}}
+
+def test_rainy_day_plan_gets_indoor_activities_and_forecast(router):
+    assert routed(router, "Que faire ce week-end s'il pleut ?") == {
+        "get_indoor_activities": {},
+        "get_weather_forecast": {"days": 3},
+        "get_weekend_events": {}
+    }
+
+def test_restaurant_with_cuisine_uses_original_label(router):
+    assert routed(router, "Un bon RESTO japonais pas cher à Wazemmes ?") == {
+        "search_restaurants": {"cuisine": "japonais", "price_range": "€", "location": "Wazemmes"}
+    }
+
+def test_feminine_and_plural_forms_match_examples(router):
+    calls = routed(router, "Je cherche une cuisine italienne végétarienne")
+    assert calls == {"search_restaurants": {"cuisine": "italien", "diet": "végétarien"}}
+
+def test_bar_with_activity(router):
+    assert routed(router, "Un bar avec billard dans le Vieux-Lille") == {
+        "search_bars": {"activity": "billard", "location": "Vieux-Lille"}
+    }
+
+def test_vague_request_left_to_ollama(router):
+    assert router.route("Je veux manger quelque part") is None
+    assert router.stats["fallback_low_confidence"] == 1
+
+def test_no_intent_left_to_ollama(router):
+    assert router.route("Bonjour, comment ça va ?") is None
+    assert router.stats["fallback_no_intent"] == 1
+
+def test_only_published_tools_are_proposed(manifest):
+    tools = [tool for tool in manifest["tools"] if tool["function"]["name"] != "get_weather_forecast"]
+    router = IntentRouter(tools, threshold=0.8, enabled=True)
+    assert router.route("Quel temps demain ?") is None
+
+def test_disabled_router(manifest):
+    router = IntentRouter(manifest["tools"], enabled=False)
+    assert router.route("Quel temps demain ?") is None
@@ -0,0 +1,185 @@
+"""
+Tests du client MCP (cache de résultats, requêtes partagées entre appels
+identiques simultanés, batch /tools/batch et repli appel par appel)
+"""
+
+import asyncio
+
+import httpx
+
+from services.answer_cache import ToolDataVersions
+from services.mcp_client import MCPClient
+from fakes import BARS
+
+def test_identical_concurrent_calls_share_one_request(mcp_client, mcp_server):
+    async def scenario():
+        return await asyncio.gather(*(mcp_client.call_tool("search_bars", {}) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+
+    assert mcp_server.requests == ["/tools/search_bars"]
+    assert all(result["data"] == BARS for result in results)
+    assert mcp_client.coalesced == 4
+
+def test_successful_result_cached_failed_result_not(mcp_client, mcp_server):
+    mcp_server.delay = 0
+
+    async def scenario():
+        await mcp_client.call_tool("search_bars", {})
+        await mcp_client.call_tool("search_bars", {})
+        await mcp_client.call_tool("unknown_tool", {})
+        await mcp_client.call_tool("unknown_tool", {})
+        await mcp_client.call_tool("search_bars", {}, use_cache=False)
+
+    asyncio.run(scenario())
+    assert mcp_server.requests == [
+        "/tools/search_bars",
+        "/tools/unknown_tool",
+        "/tools/unknown_tool",
+        "/tools/search_bars"
+    ]
+
+def test_cache_key_ignores_argument_order(mcp_client, mcp_server):
+    mcp_server.delay = 0
+
+    async def scenario():
+        first = await mcp_client.call_tool("get_weather_forecast", {"days": 2, "city": "Lille"})
+        second = await mcp_client.call_tool("get_weather_forecast", {"city": "Lille", "days": 2})
+        third = await mcp_client.call_tool("get_weather_forecast", {"city": "Lille", "days": 3})
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert first is second
+    assert third["data"]["days"] == 3
+    assert len(mcp_server.requests) == 2
+
+def test_per_tool_ttl_override(mcp_client, monkeypatch):
+    monkeypatch.setenv("MCP_CACHE_TTL_SEARCH_BARS", "5")
+    assert mcp_client.tool_ttl("search_bars") == 5.0
+    assert mcp_client.tool_ttl("get_weekend_events") == 600
+    assert mcp_client.tool_ttl("tool_sans_ttl") == mcp_client.default_ttl
+
+def test_cancelled_caller_does_not_cancel_shared_request(mcp_client, mcp_server):
+    async def scenario():
+        impatient = asyncio.ensure_future(asyncio.wait_for(mcp_client.call_tool("search_bars", {}), timeout=0.01))
+        patient = asyncio.ensure_future(mcp_client.call_tool("search_bars", {}))
+        return await asyncio.gather(impatient, patient, return_exceptions=True)
+
+    impatient, patient = asyncio.run(scenario())
+    assert isinstance(impatient, asyncio.TimeoutError)
+    assert patient["data"] == BARS
+    assert mcp_server.requests == ["/tools/search_bars"]
+
+def test_call_tools_shares_requests_already_in_flight(mcp_client, mcp_server):
+    async def scenario():
+        single = asyncio.ensure_future(mcp_client.call_tool("search_bars", {}))
+        await asyncio.sleep(0)
+        batch = await mcp_client.call_tools([{"name": "search_bars", "arguments": {}}])
+        return await single, batch
+
+    single, batch = asyncio.run(scenario())
+    assert mcp_server.requests == ["/tools/search_bars"]
+    assert batch == [single]
+
+def test_call_tools_reports_each_call_duration(mcp_client, mcp_server):
+    mcp_server.durations_ms = {"get_weather_forecast": 30}
+
+    async def scenario():
+        await mcp_client.call_tool("search_bars", {})
+        return await mcp_client.call_tools([
+            {"name": "search_bars", "arguments": {}},
+            {"name": "get_weather_forecast", "arguments": {"days": 1}},
+            {"name": "get_weather_forecast", "arguments": {"days": 2}}
+        ], with_durations=True)
+
+    results, durations = asyncio.run(scenario())
+
+    assert all(result["success"] for result in results)
+    # Résultat en cache: pas d'appel; dans le batch: durée mesurée par le serveur
+    assert durations == [0.0, 0.03, 0.03]
+
+def test_call_tools_sends_remaining_calls_in_one_batch(mcp_client, mcp_server):
+    mcp_server.delay = 0
+    mcp_client.data_versions = ToolDataVersions()
+
+    async def scenario():
+        await mcp_client.call_tool("search_bars", {})
+        return await mcp_client.call_tools([
+            {"name": "search_bars", "arguments": {}},
+            {"name": "get_weather_forecast", "arguments": {"days": 2}},
+            {"name": "get_weather_forecast", "arguments": {"days": 2}},
+            {"name": "unknown_tool", "arguments": {}}
+        ], timeout=5)
+
+    results = asyncio.run(scenario())
+
+    # search_bars servi par le cache, les doublons envoyés une seule fois
+    assert mcp_server.requests == ["/tools/search_bars", "/tools/batch"]
+    assert results[0]["data"] == BARS
+    assert results[1] is results[2]
+    assert results[1]["data"]["days"] == 2
+    assert results[3]["success"] is False
+    assert mcp_client.data_versions.get("get_weather_forecast") is not None
+
+def test_batch_unknown_falls_back_then_retries_after_interval(mcp_client, mcp_server):
+    mcp_server.batch = False
+    mcp_server.delay = 0
+    calls = [{"name": "search_bars", "arguments": {}}, {"name": "get_weather_forecast", "arguments": {}}]
+
+    results = asyncio.run(mcp_client.call_tools(calls, use_cache=False))
+    assert [result["success"] for result in results] == [True, True]
+    assert mcp_server.requests[0] == "/tools/batch"
+    assert sorted(mcp_server.requests[1:]) == ["/tools/get_weather_forecast", "/tools/search_bars"]
+
+    # Pendant l'intervalle: appels un par un, sans nouvel essai du batch
+    mcp_server.requests.clear()
+    asyncio.run(mcp_client.call_tools(calls, use_cache=False))
+    assert "/tools/batch" not in mcp_server.requests
+
+    # Intervalle écoulé (serveur MCP mis à jour): le batch est retenté
+    mcp_server.batch = True
+    mcp_server.requests.clear()
+    mcp_client._batch_unsupported_until = 0.0
+    asyncio.run(mcp_client.call_tools(calls, use_cache=False))
+    assert mcp_server.requests == ["/tools/batch"]
+
+def batch_client(tool_catalog, handler) -> MCPClient:
+    client = MCPClient(base_url="http://mcp", catalog=tool_catalog)
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+def test_unreachable_server_gives_error_result_per_call(tool_catalog):
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connexion refusée", request=request)
+
+    results = asyncio.run(batch_client(tool_catalog, handler).call_tools([
+        {"name": "search_bars", "arguments": {}},
+        {"name": "get_weather_forecast", "arguments": {}}
+    ]))
+
+    assert [result["success"] for result in results] == [False, False]
+    assert all("n'est pas accessible" in result["error"] for result in results)
+
+def test_short_or_malformed_batch_response_fails_every_call(tool_catalog):
+    responses = [
+        {"results": [{"success": True, "data": BARS}]},
+        {"results": [{"success": True, "data": BARS}, "pas un objet"]},
+        {"detail": "sans résultats"}
+    ]
+    calls = [{"name": "search_bars", "arguments": {}}, {"name": "get_weather_forecast", "arguments": {}}]
+
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        return httpx.Response(200, json=responses[len(seen) - 1])
+
+    client = batch_client(tool_catalog, handler)
+
+    for _ in responses:
+        results = asyncio.run(asyncio.wait_for(client.call_tools(calls), timeout=1))
+        assert [result["success"] for result in results] == [False, False]
+        assert all("Réponse invalide" in result["error"] for result in results)
+
+    # Résultats en échec: rien en cache, chaque appel a renvoyé une requête
+    assert seen == ["/tools/batch"] * len(responses)
@@ -0,0 +1,161 @@
+"""
+Tests du pool d'instances Ollama (choix de l'instance, affinité,
+éjection) et du classement des erreurs par le client
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from services.admission import AdmissionController
+from services.context_window import ContextWindow
+from services.ollama_client import OllamaClient
+from services.ollama_pool import OllamaPool
+
+A, B = "http://ollama-a:11434", "http://ollama-b:11434"
+
+def make_pool(**options) -> OllamaPool:
+    defaults = {"affinity_slack": 1, "eject_failures": 2, "eject_seconds": 30}
+    return OllamaPool([A, B], **{**defaults, **options})
+
+def test_selects_least_outstanding_then_lowest_latency():
+    pool = make_pool()
+    a, b = pool.endpoints
+
+    pool.started(a)
+    assert pool.select() is b
+
+    pool.succeeded(a)
+    pool.mark_up(a, duration=0.200)
+    pool.mark_up(b, duration=0.010)
+    assert pool.select() is b
+
+def test_conversation_stays_on_its_instance_within_affinity_slack():
+    pool = make_pool(affinity_slack=1)
+    a, b = pool.endpoints
+
+    assert pool.select("conv") is a
+    pool.started(a)
+    assert pool.select("conv") is a
+
+    # Deux requêtes de plus que la moins chargée: la conversation change d'instance
+    pool.started(a)
+    assert pool.select("conv") is b
+    assert pool.select("conv") is b
+
+def test_instance_ejected_after_consecutive_failures_then_reinstated():
+    pool = make_pool(eject_failures=2)
+    a, b = pool.endpoints
+
+    pool.started(a)
+    pool.failed(a, "connexion refusée")
+    assert a.available
+
+    pool.started(a)
+    pool.failed(a, "connexion refusée")
+    assert not a.available
+    assert a.ejections == 1
+    assert pool.select() is b
+    assert pool.select(exclude=[b]) is a  # Tout est écarté: on tente quand même
+
+    pool.mark_up(a, duration=0.05)
+    assert a.available
+    assert a.consecutive_failures == 0
+
+def test_success_resets_consecutive_failures():
+    pool = make_pool(eject_failures=2)
+    a, _ = pool.endpoints
+
+    for _ in range(3):
+        pool.started(a)
+        pool.failed(a, "HTTP 500")
+        pool.started(a)
+        pool.succeeded(a)
+
+    assert a.available
+    assert a.errors == 3
+    assert a.outstanding == 0
+
+def test_released_request_is_neither_success_nor_failure():
+    pool = make_pool()
+    a, _ = pool.endpoints
+    a.consecutive_failures = 1
+
+    pool.started(a)
+    pool.released(a)
+
+    assert a.outstanding == 0
+    assert a.consecutive_failures == 1
+    assert a.errors == 0
+
+def make_client(tool_catalog, handler) -> OllamaClient:
+    client = OllamaClient(
+        urls=[A, B],
+        context_window=ContextWindow(max_tokens=4000),
+        admission=AdmissionController(max_concurrency=4, max_queue=4, queue_timeout=1),
+        tool_catalog=tool_catalog
+    )
+    client.pool.eject_failures = 1
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+def reply(content: str) -> httpx.Response:
+    return httpx.Response(200, json={"message": {"role": "assistant", "content": content}, "done": True})
+
+def test_connect_error_fails_over_to_another_instance(tool_catalog):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "ollama-a":
+            raise httpx.ConnectError("connexion refusée", request=request)
+        return reply("bonjour")
+
+    client = make_client(tool_catalog, handler)
+    result = asyncio.run(client.chat([{"role": "user", "content": "salut"}]))
+
+    a, b = client.pool.endpoints
+    assert result["content"] == "bonjour"
+    assert not a.available
+    assert b.available and b.requests == 1
+    assert a.outstanding == b.outstanding == 0
+
+def test_caller_timeout_does_not_eject_the_instance(tool_catalog):
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ReadTimeout("génération trop longue", request=request)
+
+    client = make_client(tool_catalog, handler)
+    with pytest.raises(Exception):
+        asyncio.run(client.chat([{"role": "user", "content": "salut"}], timeout=0.1))
+
+    a, b = client.pool.endpoints
+    assert a.available and b.available
+    assert a.errors == b.errors == 0
+    assert a.outstanding == b.outstanding == 0
+
+def test_server_error_counts_as_instance_failure(tool_catalog):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(500, text="erreur interne")
+
+    client = make_client(tool_catalog, handler)
+    with pytest.raises(Exception):
+        asyncio.run(client.chat([{"role": "user", "content": "salut"}]))
+
+    errors = [endpoint.errors for endpoint in client.pool.endpoints]
+    assert sorted(errors) == [0, 1]
+
+def test_request_body_keeps_conversation_on_same_instance(tool_catalog):
+    hosts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        hosts.append(request.url.host)
+        assert json.loads(request.content)["messages"][-1]["content"] == "salut"
+        return reply("bonjour")
+
+    client = make_client(tool_catalog, handler)
+
+    async def scenario():
+        for _ in range(3):
+            await client.chat([{"role": "user", "content": "salut"}], conv_id="conv")
+
+    asyncio.run(scenario())
+    assert len(set(hosts)) == 1
@@ -0,0 +1,80 @@
+"""
+Tests du catalogue de tools (copie du manifeste sur disque, fragments
+sérialisés, revalidation conditionnelle du manifeste)
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from services.mcp_client import MCPClient
+from services.tool_catalog import ToolCatalog
+
+def test_empty_catalog_fails_readiness_probe(tool_catalog):
+    assert tool_catalog.tools == []
+    assert tool_catalog.version == "none"
+    with pytest.raises(Exception):
+        asyncio.run(tool_catalog.probe())
+
+def test_update_writes_snapshot_reloaded_at_next_start(tool_catalog, manifest):
+    assert tool_catalog.update(manifest["tools"], manifest["version"])
+    asyncio.run(tool_catalog.probe())
+
+    restarted = ToolCatalog(snapshot_path=tool_catalog.snapshot_path)
+    assert restarted.version == manifest["version"]
+    assert restarted.names == tool_catalog.names
+    assert restarted.tools_json == tool_catalog.tools_json
+
+def test_unreadable_snapshot_gives_empty_catalog(tmp_path):
+    snapshot = tmp_path / "tool-manifest.json"
+    snapshot.write_text("{pas du json", encoding="utf-8")
+    assert ToolCatalog(snapshot_path=str(snapshot)).tools == []
+
+    snapshot.write_text(json.dumps({"tools": []}), encoding="utf-8")
+    assert ToolCatalog(snapshot_path=str(snapshot)).version == "none"
+
+def test_same_version_is_not_reloaded_and_listeners_notified_on_change(tool_catalog, manifest):
+    notified = []
+    tool_catalog.subscribe(lambda catalog: notified.append(catalog.version))
+
+    assert tool_catalog.update(manifest["tools"], manifest["version"])
+    assert not tool_catalog.update(manifest["tools"][:1], manifest["version"])
+    assert len(tool_catalog.tools) == len(manifest["tools"])
+    assert tool_catalog.update(manifest["tools"][:1], "v2")
+
+    assert notified == [manifest["version"], "v2"]
+
+def test_serialize_reuses_fragments(tool_catalog, manifest):
+    tool_catalog.update(manifest["tools"], manifest["version"])
+    compact = dict(ensure_ascii=False, separators=(",", ":"))
+
+    assert tool_catalog.serialize(tool_catalog.tools) is tool_catalog.tools_json
+    assert json.loads(tool_catalog.tools_json) == manifest["tools"]
+
+    weather = tool_catalog.get("get_weather_forecast")
+    extra = {"type": "function", "function": {"name": "hors_catalogue"}}
+    assert tool_catalog.serialize([weather, extra]) == json.dumps([weather, extra], **compact)
+
+def test_refresh_manifest_revalidates_with_etag_and_keeps_tools_on_failure(tool_catalog, manifest):
+    etag = f'"{manifest["version"]}"'
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.headers.get("If-None-Match"))
+        if len(requests) == 3:
+            return httpx.Response(500)
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, json=manifest, headers={"ETag": etag})
+
+    client = MCPClient(base_url="http://mcp", catalog=tool_catalog)
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def scenario():
+        return [await client.refresh_manifest() for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [True, False, False]
+    assert requests == [None, etag, etag]
+    assert tool_catalog.version == manifest["version"]
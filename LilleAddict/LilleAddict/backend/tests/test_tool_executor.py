@@ -0,0 +1,85 @@
+"""
+Tests de l'exécution des tool calls d'un tour (parallélisme borné, ordre
+des résultats, appels invalides)
+"""
+
+import asyncio
+
+from services import tracing
+from services.tool_executor import ToolExecutor
+
+def tool_calls(count: int):
+    return [
+        {"function": {"name": "get_weather_forecast", "arguments": {"days": day}}}
+        for day in range(count)
+    ]
+
+def test_fallback_calls_limited_to_max_concurrency(mcp_client, mcp_server):
+    mcp_server.batch = False
+    executor = ToolExecutor(mcp_client, max_batch=16, max_concurrency=3, timeout=5)
+
+    results = asyncio.run(executor.run(tool_calls(10)))
+
+    assert mcp_server.max_in_flight == 3
+    assert [result["data"]["days"] for result in results] == list(range(10))
+
+def test_batch_requests_limited_to_max_concurrency(mcp_client, mcp_server):
+    executor = ToolExecutor(mcp_client, max_batch=2, max_concurrency=2, timeout=5)
+
+    results = asyncio.run(executor.run(tool_calls(10)))
+
+    assert mcp_server.requests == ["/tools/batch"] * 5
+    assert mcp_server.max_in_flight == 2
+    assert all(result["success"] for result in results)
+
+def test_results_in_call_order_with_invalid_calls_isolated(mcp_client, mcp_server):
+    executor = ToolExecutor(mcp_client, max_concurrency=4, timeout=5)
+
+    results = asyncio.run(executor.run([
+        {"function": {"name": "search_bars", "arguments": "{}"}},
+        {"function": {"arguments": {}}},
+        {"function": {"name": "get_weather_forecast", "arguments": ["pas", "un", "objet"]}},
+        {"function": {"name": "unknown_tool", "arguments": {}}}
+    ]))
+
+    assert [result["tool"] for result in results] == ["search_bars", "inconnu", "get_weather_forecast", "unknown_tool"]
+    assert [result["success"] for result in results] == [True, False, False, False]
+    # Les appels invalides ne sont pas envoyés au serveur
+    assert mcp_server.requests == ["/tools/batch"]
+
+def test_mcp_client_error_fails_only_its_batch(mcp_client, monkeypatch):
+    executor = ToolExecutor(mcp_client, max_batch=1, max_concurrency=2, timeout=5)
+    original = mcp_client.call_tools
+
+    async def call_tools(calls, **options):
+        if calls[0]["name"] == "search_bars":
+            raise RuntimeError("client MCP en panne")
+        return await original(calls, **options)
+
+    monkeypatch.setattr(mcp_client, "call_tools", call_tools)
+    results = asyncio.run(executor.run([
+        {"function": {"name": "search_bars", "arguments": {}}},
+        {"function": {"name": "get_weather_forecast", "arguments": {}}}
+    ]))
+
+    assert results[0] == {"tool": "search_bars", "success": False, "error": "client MCP en panne"}
+    assert results[1]["success"] is True
+
+def test_tool_spans_use_each_call_duration(mcp_client, mcp_server):
+    mcp_server.durations_ms = {"search_bars": 5, "get_weather_forecast": 40}
+    executor = ToolExecutor(mcp_client, max_concurrency=4, timeout=5)
+    trace = tracing.Trace("conv-spans")
+
+    async def scenario():
+        tracing._current.set(trace)
+        await executor.run([
+            {"function": {"name": "search_bars", "arguments": {}}},
+            {"function": {"name": "get_weather_forecast", "arguments": {}}}
+        ])
+
+    asyncio.run(scenario())
+
+    spans = {span["name"]: span for span in trace.spans}
+    assert spans["tool.search_bars"]["duration_ms"] == 5
+    assert spans["tool.get_weather_forecast"]["duration_ms"] == 40
+    assert spans["tool.search_bars"]["attributes"]["batch"] == 2
@@ -0,0 +1,81 @@
+"""
+Tests du formatage des résultats de tools (classement par pertinence,
+budget de tokens, formes de données inconnues)
+"""
+
+import math
+
+from services.tool_formatter import ToolResultFormatter
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / 4)
+
+def make_formatter(max_tokens: int = 800) -> ToolResultFormatter:
+    return ToolResultFormatter(estimate_tokens, max_tokens=max_tokens)
+
+BARS = [
+    {"name": "Le Capitole", "drink_type": "bière", "atmosphere": "animé", "location": "Centre", "description": "Bar étudiant"},
+    {"name": "La Cave aux Vins", "drink_type": "vin", "atmosphere": "calme", "location": "Vieux-Lille"},
+    {"name": "Jazz Club", "drink_type": "cocktail", "atmosphere": "jazz", "location": "Wazemmes", "description": "Concerts le jeudi"}
+]
+
+def test_items_ranked_by_question_terms():
+    text = make_formatter().format({"success": True, "data": BARS}, query="Un bar à cocktails avec du jazz ?")
+    lines = text.splitlines()
+
+    assert lines[0] == "3 résultats:"
+    assert lines[1].startswith("- Jazz Club | cocktail")
+    # À pertinence égale, l'ordre de la source est conservé
+    assert lines[2].startswith("- Le Capitole") and lines[3].startswith("- La Cave aux Vins")
+
+def test_budget_limits_listed_items():
+    venues = [{"name": f"Bar {index}", "description": "x" * 80} for index in range(50)]
+    text = make_formatter().format({"success": True, "data": venues}, max_tokens=100)
+
+    assert estimate_tokens(text) <= 100 + 10
+    assert text.splitlines()[-1].startswith("(+")
+    assert text.splitlines()[-1].endswith("autres non listés)")
+
+def test_events_header_and_fields():
+    data = {
+        "week_dates": "5 au 7 septembre",
+        "events": [{"title": "Braderie", "dates": "samedi", "price": "gratuit", "location": "Centre", "description": "D" * 300}]
+    }
+    text = make_formatter().format({"success": True, "data": data})
+    header, line = text.splitlines()
+
+    assert header == "1 événements (semaine du 5 au 7 septembre):"
+    assert line.startswith("- Braderie | samedi | gratuit | Centre | DDD")
+    assert line.endswith("…") and len(line) < 200
+
+def test_weather_in_two_lines():
+    data = {
+        "current": {"temp": 12, "description": "pluie"},
+        "forecast": [{"day": "samedi", "temp": 14, "description": "nuageux"}]
+    }
+    assert make_formatter().format({"success": True, "data": data}) == (
+        "Météo Lille:\nActuellement 12°C, pluie\nPrévisions: samedi 14°C nuageux"
+    )
+
+def test_unknown_shape_rendered_as_key_values_not_python_repr():
+    data = {"city": "Lille", "count": 2, "tags": ["a", "b"], "places": [{"label": "Parc", "open": True}]}
+    text = make_formatter().format({"success": True, "data": data})
+
+    assert "city: Lille" in text
+    assert "tags: a, b" in text
+    assert "- label: Parc | open: True" in text
+    assert "{'" not in text
+
+def test_errors_and_empty_results():
+    formatter = make_formatter()
+    assert formatter.format({"success": False, "error": "timeout"}) == "Erreur lors de la récupération des données: timeout"
+    assert formatter.format({"success": True, "data": []}) == "Aucun résultat."
+    assert formatter.format({"success": True, "data": None}) == "Aucun résultat."
+
+def test_budget_shared_between_results_of_a_turn():
+    venues = [{"name": f"Bar {index}", "description": "x" * 80} for index in range(50)]
+    formatter = make_formatter(max_tokens=300)
+    texts = formatter.format_all([{"success": True, "data": venues}] * 3)
+
+    assert len(texts) == 3
+    assert all(estimate_tokens(text) <= 100 + 10 for text in texts)
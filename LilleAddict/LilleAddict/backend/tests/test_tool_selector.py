@@ -0,0 +1,61 @@
+"""
+Tests de la sélection des tools (mots-clés, exemples de paramètres,
+salutations sans tools, repli sur la liste complète)
+"""
+
+import pytest
+
+from services.context_window import ContextWindow
+from services.tool_selector import ToolSelector
+
+@pytest.fixture
+def selector(tool_catalog, manifest):
+    tool_catalog.update(manifest["tools"], manifest["version"])
+    return ToolSelector(tool_catalog, ContextWindow(max_tokens=3000), enabled=True)
+
+def names(tools):
+    return [tool["function"]["name"] for tool in tools]
+
+def test_greeting_sends_no_tools(selector):
+    assert selector.select("Bonjour !") is None
+    assert selector.select("Merci beaucoup") is None
+    assert selector.stats["no_tools"] == 2
+
+def test_weather_question_sends_weather_tools(selector):
+    selected = selector.select("Quel temps fera-t-il demain, il va pleuvoir ?")
+    assert "get_weather_forecast" in names(selected)
+    assert "search_restaurants" not in names(selected)
+    assert selector.stats["subset"] == 1
+    assert selector.stats["tokens_saved"] > 0
+
+def test_parameter_examples_extend_keywords(selector):
+    assert names(selector.select("Une adresse italienne ce soir ?")) == ["search_restaurants"]
+
+def test_follow_up_uses_previous_question(selector):
+    history = [
+        {"role": "user", "content": "Où boire un cocktail ?"},
+        {"role": "assistant", "content": "Le Capitole"},
+        {"role": "user", "content": "Et plus tard ?"}
+    ]
+    assert names(selector.select("Et plus tard ?", history)) == ["search_bars"]
+
+def test_no_match_sends_full_list(selector, tool_catalog):
+    assert selector.select("Raconte-moi une histoire") is tool_catalog.tools
+    assert selector.stats["full_set_fallback"] == 1
+
+def test_tool_added_to_manifest_matched_by_description(selector, tool_catalog, manifest):
+    parking = {
+        "type": "function",
+        "function": {
+            "name": "find_parking",
+            "description": "Trouve un parking ou un stationnement disponible près d'une adresse.",
+            "parameters": {"type": "object", "properties": {}}
+        }
+    }
+    tool_catalog.update(manifest["tools"] + [parking], "v2")
+    assert names(selector.select("Où se garer, un parking près de Lille Flandres ?")) == ["find_parking"]
+
+def test_disabled_selector_sends_full_list(tool_catalog, manifest):
+    tool_catalog.update(manifest["tools"], manifest["version"])
+    selector = ToolSelector(tool_catalog, ContextWindow(max_tokens=3000), enabled=False)
+    assert selector.select("Bonjour") is tool_catalog.tools
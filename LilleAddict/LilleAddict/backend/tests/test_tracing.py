@@ -0,0 +1,85 @@
+"""
+Tests des traces d'exécution (résumé par catégorie, en-tête Server-Timing,
+tampon des dernières traces)
+"""
+
+import asyncio
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services import tracing
+from services.tracing import Trace, TraceBuffer
+
+def test_summary_counts_parallel_spans_once():
+    trace = Trace("conv")
+    start = trace._started
+    trace.add("queue", start, start + 0.010)
+    trace.add("tool.search_bars", start + 0.010, start + 0.050)
+    trace.add("tool.get_weather_forecast", start + 0.020, start + 0.060)
+    trace.add("tool.search_restaurants", start + 0.100, start + 0.110)
+    trace.add("autre", start, start + 1)
+    trace.duration_ms = 200.0
+
+    assert trace.summary() == {"queue": 10.0, "tool": 60.0, "total": 200.0}
+    assert trace.server_timing() == "queue;dur=10.0, tool;dur=60.0, total;dur=200.0"
+
+def test_span_records_error_and_is_noop_outside_a_request():
+    with tracing.span("format"):
+        pass
+
+    trace = Trace("conv")
+    token = tracing._current.set(trace)
+    try:
+        with pytest.raises(ValueError):
+            with tracing.span("llm.chat", model="mistral") as attributes:
+                attributes["tokens"] = 3
+                raise ValueError("réponse invalide")
+    finally:
+        tracing._current.reset(token)
+
+    [span] = trace.spans
+    assert span["name"] == "llm.chat"
+    assert span["attributes"] == {"model": "mistral", "tokens": 3, "error": "réponse invalide"}
+
+def test_buffer_finds_by_request_or_conversation_and_lists_recent_first():
+    buffer = TraceBuffer(max_traces=2, enabled=True)
+    first = buffer.start("conv-a", "/chat")
+    second = buffer.start("conv-a", "/chat/stream")
+    third = buffer.start("conv-b", "/chat")
+    tracing._current.set(None)
+
+    # Tampon borné: la plus ancienne trace est écartée
+    assert buffer.find(first.request_id) == []
+    assert [trace["request_id"] for trace in buffer.find("conv-a")] == [second.request_id]
+    assert [trace["request_id"] for trace in buffer.recent()] == [third.request_id, second.request_id]
+    assert buffer.recent(0) == []
+
+def test_disabled_buffer_starts_no_trace():
+    assert TraceBuffer(enabled=False).start("conv", "/chat") is None
+
+def test_chat_response_carries_server_timing_and_trace_is_listed(backend, monkeypatch):
+    async def run(history, conv_id, message):
+        started = time.monotonic()
+        await asyncio.sleep(0.02)
+        tracing.record("tool.search_bars", started, success=True)
+        return {"content": "Le Capitole !", "tool_results": []}
+
+    monkeypatch.setattr(backend.answer_cache, "enabled", False)
+    monkeypatch.setattr(backend.chat_agent, "run", run)
+    client = TestClient(backend.app)
+    conv_id = uuid.uuid4().hex
+
+    response = client.post("/api/chat", json={"message": "Quels bars ce soir ?", "conversation_id": conv_id})
+
+    assert response.status_code == 200
+    timing = dict(entry.split(";dur=") for entry in response.headers["Server-Timing"].split(", "))
+    assert float(timing["tool"]) >= 20.0
+    assert float(timing["total"]) >= float(timing["tool"])
+
+    [trace] = backend.traces.find(response.headers["X-Request-ID"])
+    assert trace["conversation_id"] == conv_id
+    assert [span["name"] for span in trace["spans"]] == ["tool.search_bars"]
+    assert client.get("/api/debug/traces").json()[0]["request_id"] == trace["request_id"]
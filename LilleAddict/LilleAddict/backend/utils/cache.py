@@ -0,0 +1,86 @@
+"""
+Utilitaires cache - Cache mémoire LRU avec expiration (TTL)
+"""
+
+from collections import OrderedDict
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+class TTLCache:
+    """
+    Cache clé/valeur borné en nombre d'entrées (éviction LRU), chaque
+    entrée expirant après son TTL
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        # clé -> (expiration monotonic, valeur), ordre = LRU
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        # Sans effet sur les compteurs ni sur l'ordre LRU
+        entry = self._entries.get(key)
+        return entry is not None and time.monotonic() < entry[0]
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retourne la valeur si présente et non expirée, sinon None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def record_miss(self):
+        """Compte un échec de recherche résolu avant d'interroger le cache (clé incomplète)"""
+        self.misses += 1
+
+    def set(self, key: Hashable, value: Any, ttl: float = None):
+        """Ajoute ou remplace une entrée (TTL spécifique optionnel)"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """Supprime une entrée, False si absente"""
+        return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        """Vide le cache"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Compteurs du cache"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
@@ -0,0 +1,59 @@
+"""
+Utilitaires HTTP - Clients httpx partagés (pool de connexions)
+"""
+
+import httpx
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    """Lit un booléen depuis une variable d'environnement"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+def create_async_client(env_prefix: str, timeout: float) -> httpx.AsyncClient:
+    """
+    Crée un httpx.AsyncClient longue durée avec pool de connexions
+
+    Les limites sont configurables par variables d'environnement
+    préfixées (ex: OLLAMA_HTTP_MAX_CONNECTIONS):
+    - {PREFIX}_HTTP_MAX_CONNECTIONS: connexions simultanées max (défaut 20)
+    - {PREFIX}_HTTP_MAX_KEEPALIVE: connexions gardées ouvertes (défaut 10)
+    - {PREFIX}_HTTP_KEEPALIVE_EXPIRY: durée de vie keep-alive en s (défaut 30)
+    - {PREFIX}_HTTP2: active HTTP/2 si le paquet h2 est installé (défaut false)
+
+    Args:
+        env_prefix: Préfixe des variables d'environnement (OLLAMA, MCP...)
+        timeout: Timeout par défaut des requêtes en secondes
+
+    Returns:
+        Client httpx à fermer avec aclose()
+    """
+    limits = httpx.Limits(
+        max_connections=int(os.getenv(f"{env_prefix}_HTTP_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv(f"{env_prefix}_HTTP_MAX_KEEPALIVE", "10")),
+        keepalive_expiry=float(os.getenv(f"{env_prefix}_HTTP_KEEPALIVE_EXPIRY", "30"))
+    )
+
+    http2 = _env_bool(f"{env_prefix}_HTTP2")
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning(f"{env_prefix}_HTTP2 activé mais le paquet 'h2' n'est pas installé, repli sur HTTP/1.1")
+            http2 = False
+
+    logger.info(
+        f"Client HTTP {env_prefix} - max_connections: {limits.max_connections}, "
+        f"keepalive: {limits.max_keepalive_connections}, http2: {http2}"
+    )
+
+    return httpx.AsyncClient(
+        timeout=timeout,
+        limits=limits,
+        http2=http2
+    )
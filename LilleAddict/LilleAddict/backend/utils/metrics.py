@@ -0,0 +1,133 @@
+"""
+Utilitaires métriques - Métriques Prometheus du backend et endpoint /metrics
+"""
+
+import os
+from typing import Dict, Any, Tuple
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    generate_latest,
+    multiprocess
+)
+
+# Bornes adaptées à une génération sur CPU (jusqu'à la minute)
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+TOKENS_PER_SECOND_BUCKETS = (1, 2, 5, 10, 15, 20, 30, 50, 75, 100, 200)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "lilleaddict_backend_http_request_duration_seconds",
+    "Durée des requêtes HTTP par route (jusqu'aux en-têtes pour le streaming)",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+
+OLLAMA_REQUEST_DURATION = Histogram(
+    "lilleaddict_ollama_request_duration_seconds",
+    "Durée totale d'un appel /api/chat vu du backend",
+    ["model", "stream"],
+    buckets=LATENCY_BUCKETS
+)
+OLLAMA_PROMPT_EVAL_DURATION = Histogram(
+    "lilleaddict_ollama_prompt_eval_duration_seconds",
+    "Temps d'évaluation du prompt (prompt_eval_duration d'Ollama)",
+    ["model"],
+    buckets=LATENCY_BUCKETS
+)
+OLLAMA_EVAL_DURATION = Histogram(
+    "lilleaddict_ollama_eval_duration_seconds",
+    "Temps de génération de la réponse (eval_duration d'Ollama)",
+    ["model"],
+    buckets=LATENCY_BUCKETS
+)
+OLLAMA_PROMPT_TOKENS = Counter(
+    "lilleaddict_ollama_prompt_tokens_total",
+    "Tokens de prompt évalués (prompt_eval_count)",
+    ["model"]
+)
+OLLAMA_EVAL_TOKENS = Counter(
+    "lilleaddict_ollama_eval_tokens_total",
+    "Tokens générés (eval_count)",
+    ["model"]
+)
+OLLAMA_PROMPT_TOKENS_PER_SECOND = Histogram(
+    "lilleaddict_ollama_prompt_tokens_per_second",
+    "Débit d'évaluation du prompt",
+    ["model"],
+    buckets=TOKENS_PER_SECOND_BUCKETS + (500, 1000, 2000)
+)
+OLLAMA_EVAL_TOKENS_PER_SECOND = Histogram(
+    "lilleaddict_ollama_eval_tokens_per_second",
+    "Débit de génération",
+    ["model"],
+    buckets=TOKENS_PER_SECOND_BUCKETS
+)
+
+MCP_TOOL_DURATION = Histogram(
+    "lilleaddict_mcp_tool_duration_seconds",
+    "Durée des appels HTTP aux tools MCP (hors cache)",
+    ["tool"],
+    buckets=LATENCY_BUCKETS
+)
+MCP_TOOL_CALLS = Counter(
+    "lilleaddict_mcp_tool_calls_total",
+    "Appels aux tools MCP par résultat (success, error, cache)",
+    ["tool", "outcome"]
+)
+
+ACTIVE_CONVERSATIONS = Gauge(
+    "lilleaddict_active_conversations",
+    "Conversations actives dans le stockage",
+    multiprocess_mode="livemax"
+)
+ADMISSION_ACTIVE = Gauge(
+    "lilleaddict_ollama_admission_active",
+    "Générations Ollama en cours",
+    multiprocess_mode="livesum"
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "lilleaddict_ollama_admission_queue_depth",
+    "Requêtes en attente d'une place de génération",
+    multiprocess_mode="livesum"
+)
+
+def observe_generation(model: str, stream: bool, duration: float, stats: Dict[str, Any]):
+    """
+    Enregistre un appel Ollama terminé
+
+    Args:
+        model: Modèle utilisé
+        stream: Appel en streaming
+        duration: Durée mesurée côté backend (secondes)
+        stats: Compteurs d'Ollama (prompt_eval_count/duration, eval_count/duration, en ns)
+    """
+    OLLAMA_REQUEST_DURATION.labels(model, str(stream).lower()).observe(duration)
+
+    for count_key, duration_key, tokens, seconds, throughput in (
+        ("prompt_eval_count", "prompt_eval_duration", OLLAMA_PROMPT_TOKENS, OLLAMA_PROMPT_EVAL_DURATION, OLLAMA_PROMPT_TOKENS_PER_SECOND),
+        ("eval_count", "eval_duration", OLLAMA_EVAL_TOKENS, OLLAMA_EVAL_DURATION, OLLAMA_EVAL_TOKENS_PER_SECOND)
+    ):
+        count = stats.get(count_key) or 0
+        elapsed = (stats.get(duration_key) or 0) / 1e9
+        tokens.labels(model).inc(count)
+        if elapsed > 0:
+            seconds.labels(model).observe(elapsed)
+            if count:
+                throughput.labels(model).observe(count / elapsed)
+
+def metrics_payload() -> Tuple[bytes, str]:
+    """
+    Exposition au format texte Prometheus. Avec plusieurs workers uvicorn,
+    définir PROMETHEUS_MULTIPROC_DIR pour agréger les métriques de tous les
+    processus.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
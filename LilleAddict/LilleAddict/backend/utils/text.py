@@ -0,0 +1,23 @@
+"""
+Utilitaires texte - Normalisation des messages utilisateurs
+"""
+
+import re
+import unicodedata
+
+_NON_ALNUM = re.compile(r"[^a-z0-9€]+")
+
+def strip_accents(text: str) -> str:
+    """Retire les accents (é -> e, ç -> c...)"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+def normalize_text(text: str) -> str:
+    """
+    Normalise un texte pour la comparaison: minuscules, sans accents,
+    ponctuation remplacée par des espaces, espaces multiples réduits
+
+    Ex: "Que faire ce Week-End ?" -> "que faire ce week end"
+    """
+    text = strip_accents(text.lower())
+    return _NON_ALNUM.sub(" ", text).strip()
@@ -0,0 +1,323 @@
+"""
+Micro-benchmarks - Fonctions pures du chemin de chat sur des entrées
+synthétiques de taille croissante (10 à 100k éléments), avec temps et
+allocations comparés à une baseline
+
+Exemples:
+    python bench.py                       # compare à baseline.json, code 1 si régression
+    python bench.py --sizes 10,1000       # tailles réduites
+    python bench.py --update-baseline     # enregistre les mesures comme nouvelle baseline
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, Any, List, Callable, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+DEFAULT_SIZES = (10, 100, 1_000, 10_000, 100_000)
+
+# Le backend et le serveur MCP ont chacun un package `utils`: les tools MCP
+# sont importés en premier, puis leur `utils` est retiré de sys.modules pour
+# laisser le backend importer le sien
+sys.path.insert(0, str(ROOT / "mcp_server"))
+from tools import scraping, weather  # noqa: E402
+
+sys.path.remove(str(ROOT / "mcp_server"))
+for module in [name for name in sys.modules if name == "utils" or name.startswith("utils.")]:
+    del sys.modules[module]
+sys.path.insert(0, str(ROOT / "backend"))
+
+from services.tool_formatter import ToolResultFormatter  # noqa: E402
+from services.context_window import ContextWindow  # noqa: E402
+
+# ====================================
+# DONNÉES SYNTHÉTIQUES
+# ====================================
+
+CUISINES = ["Italien", "Japonais", "Français", "Mexicain", "Indien", "Chinois", "Thaï", "Coréen", "Libanais"]
+DIETS = ["", "Options végétariennes", "Vegan", "Sans gluten", "Halal"]
+DRINKS = ["Cocktails", "Bières", "Vins", "Whisky", "Softs"]
+ATMOSPHERES = ["Jazz, Cosy", "Décontracté", "Festif", "Terrasse", "Karaoké", "Romantique"]
+LOCATIONS = ["Vieux-Lille", "Centre Lille", "Wazemmes", "Euralille", "Fives", "Moulins"]
+CONDITIONS = ["Clear", "Clouds", "Rain", "Drizzle", "Snow", "Thunderstorm", "Mist", "Sunny intervals"]
+WORDS = (
+    "concert exposition marché festival spectacle gratuit jazz brunch atelier "
+    "famille musée théâtre cinéma balade vintage nocturne dégustation"
+).split()
+
+def restaurants(size: int, rng: random.Random) -> List[Dict]:
+    return [
+        {
+            "name": f"Restaurant {i}",
+            "cuisine": rng.choice(CUISINES),
+            "description": f"Cuisine {rng.choice(WORDS)} et {rng.choice(WORDS)}, produits frais",
+            "price_range": rng.choice(["€", "€€", "€€€"]),
+            "location": rng.choice(LOCATIONS),
+            "dietary": rng.choice(DIETS)
+        }
+        for i in range(size)
+    ]
+
+def bars(size: int, rng: random.Random) -> List[Dict]:
+    return [
+        {
+            "name": f"Bar {i}",
+            "description": f"Bar {rng.choice(WORDS)} au cœur de {rng.choice(LOCATIONS)}",
+            "drink_type": rng.choice(DRINKS),
+            "atmosphere": rng.choice(ATMOSPHERES),
+            "location": rng.choice(LOCATIONS)
+        }
+        for i in range(size)
+    ]
+
+def events(size: int, rng: random.Random) -> Dict[str, Any]:
+    return {
+        "week_dates": "17 au 19 octobre",
+        "events": [
+            {
+                "title": f"{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)} n°{i}",
+                "dates": rng.choice(["Samedi", "Dimanche", "Samedi et dimanche"]),
+                "hours": "14h - 18h",
+                "price": rng.choice(["Gratuit", "5€", "12€", "Prix libre"]),
+                "location": rng.choice(LOCATIONS),
+                "description": " ".join(rng.choice(WORDS) for _ in range(40))
+            }
+            for i in range(size)
+        ]
+    }
+
+def texts(size: int, rng: random.Random) -> List[str]:
+    """Textes bruts comme extraits d'une page (espaces multiples, prix)"""
+    prices = ["Gratuit", "À partir de 15 €", "Prix libre", "8€ l'entrée", "Tarif : 22 €", "Sur réservation"]
+    return [
+        "  \n".join(rng.choice(WORDS) for _ in range(12)) + "\t\t " + rng.choice(prices) + "   "
+        for _ in range(size)
+    ]
+
+def forecast(size: int, rng: random.Random) -> Dict[str, Any]:
+    return {
+        "current": {"temp": 14, "condition": "cloudy", "description": "nuageux"},
+        "forecast": [
+            {"day": "Samedi", "temp": 15, "condition": weather.map_weather_condition(rng.choice(CONDITIONS)), "description": ""}
+            for _ in range(size)
+        ]
+    }
+
+# ====================================
+# CAS MESURÉS
+# ====================================
+
+def build_cases(size: int) -> Dict[str, Callable[[], Any]]:
+    """Fonction sans argument par cas, données préparées hors mesure"""
+    rng = random.Random(size)
+    formatter = ToolResultFormatter(ContextWindow().estimate_tokens)
+    events_result = {"success": True, "tool": "get_weekend_events", "data": events(size, rng)}
+    venues_result = {"success": True, "tool": "search_restaurants", "data": restaurants(size, rng)}
+    venue_list = restaurants(size, rng)
+    bar_list = bars(size, rng)
+    raw_texts = texts(size, rng)
+    conditions = [rng.choice(CONDITIONS) for _ in range(size)]
+    days = forecast(size, rng)
+
+    return {
+        "formatter.events": lambda: formatter.format(events_result, "concert jazz gratuit samedi"),
+        "formatter.venues": lambda: formatter.format(venues_result, "restaurant italien végétarien vieux-lille"),
+        "filter_restaurants": lambda: scraping.filter_restaurants(venue_list, cuisine="italien", diet="végé"),
+        "filter_bars": lambda: scraping.filter_bars(bar_list, drink_type="cocktail", atmosphere="jazz"),
+        "clean_text": lambda: [scraping.clean_text(text) for text in raw_texts],
+        "extract_price": lambda: [scraping.extract_price(text) for text in raw_texts],
+        "map_weather_condition": lambda: [weather.map_weather_condition(condition) for condition in conditions],
+        "interpret_weather": lambda: weather.interpret_weather(days)
+    }
+
+def measure_time(function: Callable[[], Any], min_sample: float = 0.05, repeat: int = 5) -> float:
+    """
+    Meilleur temps par appel (secondes). Chaque échantillon enchaîne assez
+    d'appels pour durer au moins `min_sample`; le minimum des échantillons
+    est le moins sensible au bruit de la machine.
+    """
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            function()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_sample or loops >= 1_000_000:
+            break
+        loops = max(loops * 2, int(loops * min_sample / max(elapsed, 1e-9)))
+
+    # Appels longs (grandes tailles): moins d'échantillons
+    repeat = repeat if elapsed < 1 else 2
+    best = elapsed / loops
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat - 1):
+            started = time.perf_counter()
+            for _ in range(loops):
+                function()
+            best = min(best, (time.perf_counter() - started) / loops)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return best
+
+def calibrate() -> float:
+    """
+    Temps (µs) d'une charge Python fixe (chaînes, dicts, tri). Les temps des
+    cas sont comparés relativement à cette mesure, ce qui compense la
+    vitesse de la machine et ses variations (CPU partagé, fréquence).
+    """
+    rng = random.Random(0)
+    words = [rng.choice(WORDS).capitalize() + str(i) for i in range(2_000)]
+
+    def workload():
+        counts: Dict[str, int] = {}
+        for word in words:
+            key = word.lower()[:5]
+            counts[key] = counts.get(key, 0) + len(word.split("e"))
+        return sorted(counts.items(), key=lambda item: -item[1])
+
+    return measure_time(workload, min_sample=0.2, repeat=7) * 1e6
+
+def measure_allocations(function: Callable[[], Any]) -> Tuple[int, int]:
+    """Pic de mémoire allouée pendant un appel et mémoire encore allouée à la fin (le résultat)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak, current
+
+def run(sizes: List[int], only: List[str]) -> Dict[str, Dict[str, Any]]:
+    calibration = calibrate()
+    print(f"{'calibration':<34} {calibration:>14.2f} µs")
+    results: Dict[str, Dict[str, Any]] = {}
+    for size in sizes:
+        for name, function in build_cases(size).items():
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            seconds = measure_time(function)
+            peak, retained = measure_allocations(function)
+            key = f"{name}[{size}]"
+            results[key] = {
+                "case": name,
+                "size": size,
+                "time_us": round(seconds * 1e6, 3),
+                "relative": round(seconds * 1e6 / calibration, 5),
+                "peak_kib": round(peak / 1024, 1),
+                "retained_kib": round(retained / 1024, 1)
+            }
+            print(f"{key:<34} {seconds * 1e6:>14.2f} µs  pic {peak / 1024:>10.1f} KiB")
+    return results
+
+def remeasure(results: Dict[str, Dict[str, Any]], keys: List[str]):
+    """
+    Nouvelle mesure, plus longue, des cas suspects: le meilleur des deux
+    temps est gardé, pour qu'un pic de charge de la machine ne soit pas
+    pris pour une régression
+    """
+    for size in sorted({results[key]["size"] for key in keys}):
+        cases = build_cases(size)
+        for key in keys:
+            if results[key]["size"] != size:
+                continue
+            seconds = measure_time(cases[results[key]["case"]], min_sample=0.2, repeat=9)
+            if seconds * 1e6 < results[key]["time_us"]:
+                ratio = results[key]["relative"] / results[key]["time_us"]
+                results[key]["time_us"] = round(seconds * 1e6, 3)
+                results[key]["relative"] = round(seconds * 1e6 * ratio, 5)
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[Tuple[str, str]]:
+    """
+    Régressions par rapport à la baseline: temps relatif (cf. calibrate)
+    ou pic mémoire au-delà de (1 + threshold) fois la référence. Les
+    écarts absolus minimes (moins de 5 µs ou 16 KiB) sont ignorés, ils
+    relèvent du bruit.
+    """
+    regressions = []
+    reference = baseline.get("results", {})
+    for key, current in results.items():
+        previous = reference.get(key)
+        if previous is None:
+            continue
+
+        # Temps de référence ramené à la vitesse actuelle de la machine
+        expected_us = previous["relative"] * current["time_us"] / current["relative"]
+        if current["time_us"] > expected_us * (1 + threshold) and current["time_us"] - expected_us > 5.0:
+            regressions.append((key, (
+                f"{key} temps: {expected_us:.1f} -> {current['time_us']:.1f} µs "
+                f"(x{current['time_us'] / expected_us:.2f})"
+            )))
+
+        old, new = previous["peak_kib"], current["peak_kib"]
+        if new > old * (1 + threshold) and new - old > 16.0:
+            ratio = f" (x{new / old:.2f})" if old else ""
+            regressions.append((key, f"{key} pic mémoire: {old} -> {new} KiB{ratio}"))
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks des fonctions du chemin de chat")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES), help="Tailles des entrées, séparées par des virgules")
+    parser.add_argument("--only", default="", help="Préfixes de cas à mesurer, séparés par des virgules (ex: formatter,filter)")
+    parser.add_argument("--threshold", type=float, default=None, help="Régression tolérée (0.3 = +30%%), défaut: valeur de la baseline")
+    parser.add_argument("--baseline", default=str(BASELINE), help="Fichier de baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="Enregistre les mesures comme nouvelle baseline")
+    parser.add_argument("--output", default=None, help="Fichier JSON des mesures")
+    args = parser.parse_args()
+
+    sizes = [int(value) for value in args.sizes.split(",") if value.strip()]
+    only = [value.strip() for value in args.only.split(",") if value.strip()]
+    results = run(sizes, only)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2, ensure_ascii=False))
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    threshold = args.threshold if args.threshold is not None else baseline.get("threshold", 0.3)
+
+    if args.update_baseline:
+        # Mise à jour partielle possible (--sizes/--only): les autres cas sont conservés
+        merged = {**baseline.get("results", {}), **results}
+        baseline_path.write_text(json.dumps({
+            "python": sys.version.split()[0],
+            "threshold": threshold,
+            "results": dict(sorted(merged.items()))
+        }, indent=2, ensure_ascii=False) + "\n")
+        print(f"\nBaseline mise à jour: {baseline_path}")
+        return 0
+
+    if not baseline:
+        print("\nAucune baseline: lancer avec --update-baseline pour en créer une")
+        return 0
+
+    regressions = compare(results, baseline, threshold)
+    if regressions:
+        suspects = sorted({key for key, _ in regressions})
+        print(f"\nConfirmation de {len(suspects)} cas au-delà du seuil...")
+        remeasure(results, suspects)
+        regressions = compare(results, baseline, threshold)
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) au-delà de +{threshold * 100:.0f}%:")
+        for _, regression in regressions:
+            print(f"  - {regression}")
+        return 1
+
+    print(f"\n✅ Aucune régression au-delà de +{threshold * 100:.0f}%")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,7 @@
 // ====================================
 const CONFIG = {
     API_URL: 'http://localhost:8000/api/chat',
+    STREAM_API_URL: 'http://localhost:8000/api/chat/stream',
     TYPING_DELAY: 1000  // Délai simulation "typing..."
 };
 
@@ -93,8 +94,8 @@ async function sendMessage() {
         // 2. Afficher l'indicateur de typing
         const typingIndicator = addTypingIndicator();
         
-        // 3. Appeler l'API
-        const response = await fetch(CONFIG.API_URL, {
+        // 3. Appeler l'API en streaming (NDJSON)
+        const response = await fetch(CONFIG.STREAM_API_URL, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -106,20 +107,41 @@ async function sendMessage() {
         });
         
         if (!response.ok) {
-            throw new Error(`Erreur HTTP: ${response.status}`);
+            const error = new Error(`Erreur HTTP: ${response.status}`);
+            // Backend saturé (429/503): délai conseillé avant de réessayer
+            if (response.headers.has('Retry-After')) {
+                error.retryAfter = parseInt(response.headers.get('Retry-After'), 10);
+            }
+            throw error;
         }
         
-        const data = await response.json();
+        // 4. Afficher les tokens au fur et à mesure
+        let botMessage = null;
+        let botText = '';
         
-        // 4. Retirer l'indicateur de typing
-        typingIndicator.remove();
-        
-        // 5. Afficher la réponse du bot
-        addMessage(data.response, 'bot');
+        await readNdjsonStream(response, (event) => {
+            if (event.type === 'start' || event.type === 'done') {
+                // 5. Sauvegarder l'ID de conversation
+                if (event.conversation_id) {
+                    conversationId = event.conversation_id;
+                }
+            } else if (event.type === 'token') {
+                if (!botMessage) {
+                    typingIndicator.remove();
+                    botMessage = addMessage('', 'bot');
+                }
+                botText += event.content;
+                botMessage.querySelector('.message-content').innerHTML = formatMessage(botText);
+                scrollToBottom();
+            } else if (event.type === 'error') {
+                const error = new Error(event.detail);
+                error.retryAfter = event.retry_after;
+                throw error;
+            }
+        });
         
-        // 6. Sauvegarder l'ID de conversation
-        if (data.conversation_id) {
-            conversationId = data.conversation_id;
+        if (!botMessage) {
+            typingIndicator.remove();
         }
         
     } catch (error) {
@@ -130,10 +152,17 @@ async function sendMessage() {
         if (typing) typing.remove();
         
         // Afficher message d'erreur
-        addMessage(
-            '😞 Désolé, une erreur est survenue. Vérifie que le backend est démarré (http://localhost:8000).',
-            'bot'
-        );
+        if (error.retryAfter) {
+            addMessage(
+                `⏳ Beaucoup de monde en ce moment ! Réessaie dans ${error.retryAfter} secondes.`,
+                'bot'
+            );
+        } else {
+            addMessage(
+                '😞 Désolé, une erreur est survenue. Vérifie que le backend est démarré (http://localhost:8000).',
+                'bot'
+            );
+        }
     } finally {
         // Réactiver l'input
         isWaitingResponse = false;
@@ -143,6 +172,36 @@ async function sendMessage() {
     }
 }
 
+/**
+ * Lit une réponse NDJSON et appelle le callback pour chaque événement
+ * @param {Response} response - Réponse fetch en streaming
+ * @param {function(Object)} onEvent - Callback appelé par ligne JSON
+ */
+async function readNdjsonStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        
+        for (const line of lines) {
+            if (line.trim()) {
+                onEvent(JSON.parse(line));
+            }
+        }
+    }
+    
+    if (buffer.trim()) {
+        onEvent(JSON.parse(buffer));
+    }
+}
+
 /**
  * Ajoute un message dans le chat
  * @param {string} text - Texte du message
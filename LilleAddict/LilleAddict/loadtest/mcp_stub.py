@@ -0,0 +1,147 @@
+"""
+Stub MCP - Émule les routes /tools/* (dont /tools/batch) du serveur MCP avec
+une latence et un taux d'erreur configurables, sans scraping ni réseau
+
+Configuration (variables d'environnement):
+- MCP_STUB_LATENCY_MS: latence moyenne d'un tool (défaut 50)
+- MCP_STUB_JITTER_MS: écart maximal autour de la moyenne (défaut 20)
+- MCP_STUB_LATENCY_MS_<TOOL>: latence d'un tool précis (ex: MCP_STUB_LATENCY_MS_GET_WEEKEND_EVENTS)
+- MCP_STUB_ERROR_RATE: probabilité d'une réponse HTTP 500 (défaut 0)
+- MCP_STUB_TOOL_ERROR_RATE: probabilité d'un résultat {"success": false} (défaut 0)
+- MCP_STUB_ITEMS: nombre d'éléments par liste renvoyée (défaut 10)
+- MCP_STUB_SEED: graine du générateur aléatoire (défaut: aléatoire)
+
+Lancement:
+    uvicorn mcp_stub:app --port 8001
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import Dict, Any, Callable
+
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+
+LATENCY_MS = float(os.getenv("MCP_STUB_LATENCY_MS", "50"))
+JITTER_MS = float(os.getenv("MCP_STUB_JITTER_MS", "20"))
+ERROR_RATE = float(os.getenv("MCP_STUB_ERROR_RATE", "0"))
+TOOL_ERROR_RATE = float(os.getenv("MCP_STUB_TOOL_ERROR_RATE", "0"))
+ITEMS = int(os.getenv("MCP_STUB_ITEMS", "10"))
+
+rng = random.Random(os.getenv("MCP_STUB_SEED"))
+
+def _load_manifest() -> Dict[str, Any]:
+    """Manifeste du vrai serveur MCP (mêmes schémas de tools)"""
+    path = Path(__file__).resolve().parent.parent / "mcp_server" / "tools" / "manifest.py"
+    spec = importlib.util.spec_from_file_location("mcp_manifest", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.build_manifest()
+
+MANIFEST = _load_manifest()
+MANIFEST_ETAG = f'"{MANIFEST["version"]}"'
+
+app = FastAPI(title="MCP stub")
+
+def _events() -> Dict[str, Any]:
+    return {
+        "week_dates": "stub",
+        "events": [
+            {
+                "title": f"Événement {i}",
+                "dates": "Samedi",
+                "hours": "14h-18h",
+                "price": "Gratuit" if i % 2 else "10€",
+                "location": "Vieux-Lille",
+                "description": "Description d'un événement de test pour la charge. " * 3
+            }
+            for i in range(ITEMS)
+        ]
+    }
+
+def _venues(kind: str) -> Callable[[], Any]:
+    def build():
+        return [
+            {
+                "name": f"{kind} {i}",
+                "category": kind,
+                "price_range": "€€",
+                "atmosphere": "convivial",
+                "location": "Centre",
+                "description": f"{kind} de test numéro {i}, ambiance détendue."
+            }
+            for i in range(ITEMS)
+        ]
+    return build
+
+def _weather() -> Dict[str, Any]:
+    return {
+        "current": {"temp": 14, "description": "nuageux"},
+        "forecast": [{"day": day, "temp": 15, "description": "averses"} for day in ("Samedi", "Dimanche")]
+    }
+
+TOOL_DATA: Dict[str, Callable[[], Any]] = {
+    "get_weekend_events": _events,
+    "search_restaurants": _venues("Restaurant"),
+    "search_bars": _venues("Bar"),
+    "get_weather_forecast": _weather,
+    "get_indoor_activities": _venues("Activité intérieure"),
+    "get_outdoor_activities": _venues("Activité extérieure")
+}
+
+def latency_seconds(tool_name: str) -> float:
+    mean = float(os.getenv(f"MCP_STUB_LATENCY_MS_{tool_name.upper()}", LATENCY_MS))
+    return max(mean + rng.uniform(-JITTER_MS, JITTER_MS), 0) / 1000
+
+@app.get("/")
+async def root():
+    return {"message": "MCP stub", "tools": list(TOOL_DATA)}
+
+@app.get("/health")
+async def health_check():
+    return {"status": "ok"}
+
+@app.get("/tools/manifest")
+async def tools_manifest(request: Request):
+    headers = {"ETag": MANIFEST_ETAG, "Cache-Control": "no-cache"}
+    if MANIFEST_ETAG in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=json.dumps(MANIFEST), media_type="application/json", headers=headers)
+
+async def run_tool(tool_name: str) -> Dict[str, Any]:
+    await asyncio.sleep(latency_seconds(tool_name))
+    if rng.random() < TOOL_ERROR_RATE:
+        return {"success": False, "error": "Erreur simulée du tool"}
+    return {"success": True, "data": TOOL_DATA[tool_name]()}
+
+@app.post("/tools/batch")
+async def call_batch(request: Request):
+    """Appels groupés: latence du batch = celle de l'appel le plus lent"""
+    calls = (await request.json())["calls"]
+
+    async def run(call: Dict[str, Any]) -> Dict[str, Any]:
+        if call["name"] not in TOOL_DATA:
+            return {"name": call["name"], "success": False, "error": f"Tool inconnu: {call['name']}", "duration_ms": 0}
+        started = time.monotonic()
+        result = await run_tool(call["name"])
+        return {"name": call["name"], **result, "duration_ms": round((time.monotonic() - started) * 1000, 1)}
+
+    results = await asyncio.gather(*(run(call) for call in calls))
+    if rng.random() < ERROR_RATE:
+        return JSONResponse(status_code=500, content={"detail": "Erreur simulée"})
+    return {"results": results}
+
+@app.post("/tools/{tool_name}")
+async def call_tool(tool_name: str):
+    if tool_name not in TOOL_DATA:
+        raise HTTPException(status_code=404, detail=f"Tool inconnu: {tool_name}")
+
+    result = await run_tool(tool_name)
+    if rng.random() < ERROR_RATE:
+        return JSONResponse(status_code=500, content={"detail": "Erreur simulée"})
+    return result
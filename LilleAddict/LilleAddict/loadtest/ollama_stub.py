@@ -0,0 +1,163 @@
+"""
+Stub Ollama - Émule /api/chat (streaming ou non) avec des délais réalistes
+pour les tests de charge, sans GPU ni modèle
+
+Configuration (variables d'environnement):
+- STUB_PROMPT_EVAL_MS: temps fixe d'évaluation du prompt (défaut 200)
+- STUB_PROMPT_TOKENS_PER_SECOND: débit d'évaluation du prompt, 0 = ignoré (défaut 2000)
+- STUB_TOKENS_PER_SECOND: débit de génération (défaut 20)
+- STUB_RESPONSE_TOKENS: longueur des réponses en tokens (défaut 60)
+- STUB_TOOL_CALL_RATE: probabilité d'appeler un tool quand des tools sont
+  fournis et qu'aucun résultat de tool n'est encore dans le contexte (défaut 0.5)
+- STUB_PARALLEL: générations traitées en même temps, les autres attendent
+  comme sur une vraie instance (défaut 1, OLLAMA_NUM_PARALLEL)
+- STUB_SEED: graine du générateur aléatoire (défaut: aléatoire)
+
+Lancement:
+    uvicorn ollama_stub:app --port 11434
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Dict, Any, List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+PROMPT_EVAL_MS = float(os.getenv("STUB_PROMPT_EVAL_MS", "200"))
+PROMPT_TOKENS_PER_SECOND = float(os.getenv("STUB_PROMPT_TOKENS_PER_SECOND", "2000"))
+TOKENS_PER_SECOND = float(os.getenv("STUB_TOKENS_PER_SECOND", "20"))
+RESPONSE_TOKENS = int(os.getenv("STUB_RESPONSE_TOKENS", "60"))
+TOOL_CALL_RATE = float(os.getenv("STUB_TOOL_CALL_RATE", "0.5"))
+PARALLEL = int(os.getenv("STUB_PARALLEL", "1"))
+
+rng = random.Random(os.getenv("STUB_SEED"))
+
+WORDS = (
+    "Lille propose ce week-end un marché sur la Grand Place, une expo au Palais "
+    "des Beaux-Arts et plusieurs concerts dans le Vieux-Lille. Pense à réserver "
+    "ta table et à vérifier la météo avant de sortir."
+).split()
+
+app = FastAPI(title="Ollama stub")
+
+# Une instance Ollama ne traite que PARALLEL générations à la fois
+_slots = asyncio.Semaphore(PARALLEL)
+_loaded: List[str] = []
+
+def estimate_prompt_tokens(body: Dict[str, Any]) -> int:
+    """~4 caractères par token, définitions de tools comprises"""
+    chars = sum(len(str(message.get("content", ""))) for message in body.get("messages", []))
+    chars += len(json.dumps(body.get("tools") or []))
+    return max(chars // 4, 1)
+
+def prompt_eval_seconds(prompt_tokens: int) -> float:
+    seconds = PROMPT_EVAL_MS / 1000
+    if PROMPT_TOKENS_PER_SECOND > 0:
+        seconds += prompt_tokens / PROMPT_TOKENS_PER_SECOND
+    return seconds
+
+def plan_response(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Décide entre tool call et réponse texte"""
+    messages = body.get("messages", [])
+    tools = body.get("tools") or []
+    has_tool_result = any(message.get("role") == "tool" for message in messages)
+
+    if tools and not has_tool_result and rng.random() < TOOL_CALL_RATE:
+        tool = rng.choice(tools)["function"]["name"]
+        return {"tool_calls": [{"function": {"name": tool, "arguments": {}}}], "tokens": []}
+
+    tokens = [rng.choice(WORDS) + " " for _ in range(RESPONSE_TOKENS)]
+    return {"tool_calls": [], "tokens": tokens}
+
+def final_stats(prompt_tokens: int, eval_count: int, prompt_seconds: float, eval_seconds: float, started: float) -> Dict[str, Any]:
+    """Compteurs de fin de génération, au format d'Ollama (durées en ns)"""
+    return {
+        "done": True,
+        "done_reason": "stop",
+        "prompt_eval_count": prompt_tokens,
+        "prompt_eval_duration": int(prompt_seconds * 1e9),
+        "eval_count": eval_count,
+        "eval_duration": int(eval_seconds * 1e9),
+        "total_duration": int((time.monotonic() - started) * 1e9)
+    }
+
+@app.get("/api/version")
+async def version():
+    return {"version": "stub"}
+
+@app.get("/api/tags")
+async def tags():
+    return {"models": [{"name": "llama3.2:latest", "model": "llama3.2:latest"}]}
+
+@app.get("/api/ps")
+async def ps():
+    return {"models": [{"name": name, "model": name} for name in _loaded]}
+
+@app.post("/api/generate")
+async def generate(request: Request):
+    """Préchargement du modèle (prompt vide)"""
+    body = await request.json()
+    name = body.get("model", "llama3.2")
+    if ":" not in name:
+        name += ":latest"
+    if name not in _loaded:
+        _loaded.append(name)
+    return {"model": body.get("model"), "response": "", "done": True}
+
+@app.post("/api/chat")
+async def chat(request: Request):
+    body = await request.json()
+    started = time.monotonic()
+    prompt_tokens = estimate_prompt_tokens(body)
+    plan = plan_response(body)
+    prompt_seconds = prompt_eval_seconds(prompt_tokens)
+    token_delay = 1 / TOKENS_PER_SECOND if TOKENS_PER_SECOND > 0 else 0
+    message_head = {"model": body.get("model"), "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}
+
+    if not body.get("stream", True):
+        async with _slots:
+            await asyncio.sleep(prompt_seconds)
+            eval_count = len(plan["tokens"]) or 1
+            await asyncio.sleep(eval_count * token_delay)
+        message = {"role": "assistant", "content": "".join(plan["tokens"]).strip()}
+        if plan["tool_calls"]:
+            message["tool_calls"] = plan["tool_calls"]
+        return {
+            **message_head,
+            "message": message,
+            **final_stats(prompt_tokens, eval_count, prompt_seconds, eval_count * token_delay, started)
+        }
+
+    async def stream():
+        async with _slots:
+            await asyncio.sleep(prompt_seconds)
+            eval_started = time.monotonic()
+
+            if plan["tool_calls"]:
+                await asyncio.sleep(token_delay)
+                yield json.dumps({
+                    **message_head,
+                    "message": {"role": "assistant", "content": "", "tool_calls": plan["tool_calls"]},
+                    "done": False
+                }) + "\n"
+
+            for token in plan["tokens"]:
+                await asyncio.sleep(token_delay)
+                yield json.dumps({
+                    **message_head,
+                    "message": {"role": "assistant", "content": token},
+                    "done": False
+                }) + "\n"
+
+            eval_count = len(plan["tokens"]) or 1
+            yield json.dumps({
+                **message_head,
+                "message": {"role": "assistant", "content": ""},
+                **final_stats(prompt_tokens, eval_count, prompt_seconds, time.monotonic() - eval_started, started)
+            }) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -0,0 +1,221 @@
+"""
+Test de charge - Envoie des questions au backend à plusieurs niveaux de
+concurrence et mesure latence (p50/p95/p99), débit et taux d'erreur
+
+Exemples:
+    python run.py --concurrency 1,4,16 --requests 100 --output results.json
+    python run.py --stream --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import string
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import httpx
+
+# Questions représentatives: salutation, tools, plusieurs tools, relance
+MESSAGES = [
+    "Bonjour",
+    "Que faire ce week-end à Lille ?",
+    "Je cherche un restaurant italien pas cher",
+    "Quel temps fera-t-il ce week-end ?",
+    "Un bar à cocktails sympa dans le Vieux-Lille ?",
+    "Il pleut, on peut faire quoi en intérieur ?",
+    "Merci !"
+]
+
+def percentile(values: List[float], p: float) -> float:
+    """Percentile au rang le plus proche"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(p / 100 * len(ordered)) - 1, 0)
+    return round(ordered[rank], 1)
+
+def distribution(values: List[float]) -> Dict[str, float]:
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "mean": round(sum(values) / len(values), 1) if values else 0.0,
+        "max": round(max(values), 1) if values else 0.0
+    }
+
+async def send_chat(client: httpx.AsyncClient, url: str, message: str) -> Dict[str, Any]:
+    response = await client.post(f"{url}/api/chat", json={"message": message})
+    error = None if response.status_code == 200 else response.text[:200]
+    return {"status": response.status_code, "error": error, "ttft": None}
+
+async def send_stream(client: httpx.AsyncClient, url: str, message: str, started: float) -> Dict[str, Any]:
+    """Temps jusqu'au premier token et erreur éventuelle signalée dans le flux"""
+    ttft = None
+    error = None
+    async with client.stream("POST", f"{url}/api/chat/stream", json={"message": message}) as response:
+        if response.status_code != 200:
+            body = await response.aread()
+            return {"status": response.status_code, "error": body.decode(errors="replace")[:200], "ttft": None}
+        async for line in response.aiter_lines():
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            if event["type"] == "token" and ttft is None:
+                ttft = (time.monotonic() - started) * 1000
+            elif event["type"] == "error":
+                error = event.get("detail", "erreur")
+    return {"status": response.status_code, "error": error, "ttft": ttft}
+
+async def run_level(
+    url: str,
+    concurrency: int,
+    total: int,
+    stream: bool,
+    timeout: float,
+    bust_cache: bool
+) -> Dict[str, Any]:
+    """Envoie `total` requêtes avec `concurrency` clients simultanés"""
+    latencies: List[float] = []
+    ttfts: List[float] = []
+    status_codes: Dict[str, int] = {}
+    errors: List[str] = []
+    counter = iter(range(total))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+
+        async def worker():
+            for index in counter:
+                message = MESSAGES[index % len(MESSAGES)]
+                if bust_cache:
+                    # Chaque requête ouvre une conversation: sans suffixe, le
+                    # cache des réponses servirait les questions répétées. Un
+                    # mot en lettres seules ne change ni le routage ni les tools.
+                    message = f"{message} {''.join(random.choices(string.ascii_lowercase, k=7))}"
+                started = time.monotonic()
+                try:
+                    if stream:
+                        outcome = await send_stream(client, url, message, started)
+                    else:
+                        outcome = await send_chat(client, url, message)
+                except httpx.HTTPError as e:
+                    outcome = {"status": 0, "error": f"{type(e).__name__}: {e}", "ttft": None}
+
+                latencies.append((time.monotonic() - started) * 1000)
+                status_codes[str(outcome["status"])] = status_codes.get(str(outcome["status"]), 0) + 1
+                if outcome["ttft"] is not None:
+                    ttfts.append(outcome["ttft"])
+                if outcome["error"]:
+                    errors.append(outcome["error"])
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        duration = time.monotonic() - started
+
+    level = {
+        "concurrency": concurrency,
+        "requests": total,
+        "duration_s": round(duration, 2),
+        "throughput_rps": round(total / duration, 2) if duration else 0.0,
+        "errors": len(errors),
+        "error_rate": round(len(errors) / total, 4) if total else 0.0,
+        "status_codes": status_codes,
+        "latency_ms": distribution(latencies),
+        "sample_errors": sorted(set(errors))[:5]
+    }
+    if stream:
+        level["ttft_ms"] = distribution(ttfts)
+    return level
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_level(level: Dict[str, Any]):
+    latency = level["latency_ms"]
+    line = (
+        f"c={level['concurrency']:<4} n={level['requests']:<5} "
+        f"p50={latency['p50']:>8.1f}ms p95={latency['p95']:>8.1f}ms p99={latency['p99']:>8.1f}ms "
+        f"débit={level['throughput_rps']:>6.2f} req/s erreurs={level['error_rate'] * 100:.1f}%"
+    )
+    if "ttft_ms" in level:
+        line += f" ttft_p50={level['ttft_ms']['p50']:.1f}ms"
+    print(line)
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any]):
+    """Écart par niveau de concurrence avec un résultat précédent"""
+    before = {level["concurrency"]: level for level in previous.get("levels", [])}
+    print(f"\nComparaison avec {previous.get('label') or previous.get('revision') or 'le résultat précédent'}:")
+    for level in current["levels"]:
+        old = before.get(level["concurrency"])
+        if old is None:
+            continue
+
+        def delta(new: float, ref: float) -> str:
+            return f"{(new - ref) / ref * 100:+.1f}%" if ref else "n/a"
+
+        print(
+            f"c={level['concurrency']:<4} "
+            f"p50 {delta(level['latency_ms']['p50'], old['latency_ms']['p50'])}  "
+            f"p95 {delta(level['latency_ms']['p95'], old['latency_ms']['p95'])}  "
+            f"p99 {delta(level['latency_ms']['p99'], old['latency_ms']['p99'])}  "
+            f"débit {delta(level['throughput_rps'], old['throughput_rps'])}  "
+            f"erreurs {old['error_rate'] * 100:.1f}% -> {level['error_rate'] * 100:.1f}%"
+        )
+
+async def main(args: argparse.Namespace) -> int:
+    levels = [int(value) for value in args.concurrency.split(",") if value.strip()]
+
+    if args.warmup:
+        await run_level(args.url, 1, args.warmup, args.stream, args.timeout, bust_cache=not args.allow_cache)
+
+    results = {
+        "label": args.label,
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "url": args.url,
+        "mode": "stream" if args.stream else "chat",
+        "levels": []
+    }
+
+    for concurrency in levels:
+        total = args.requests or concurrency * args.requests_per_client
+        level = await run_level(args.url, concurrency, total, args.stream, args.timeout, bust_cache=not args.allow_cache)
+        results["levels"].append(level)
+        print_level(level)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2, ensure_ascii=False))
+        print(f"\nRésultats écrits dans {args.output}")
+
+    if args.compare:
+        compare(results, json.loads(Path(args.compare).read_text()))
+
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test de charge du backend Lille Addict")
+    parser.add_argument("--url", default="http://localhost:8000", help="URL du backend")
+    parser.add_argument("--concurrency", default="1,4,16", help="Niveaux de concurrence, séparés par des virgules")
+    parser.add_argument("--requests", type=int, default=0, help="Requêtes par niveau (défaut: --requests-per-client x concurrence)")
+    parser.add_argument("--requests-per-client", type=int, default=10, help="Requêtes par client simulé")
+    parser.add_argument("--stream", action="store_true", help="Utiliser /api/chat/stream (mesure aussi le premier token)")
+    parser.add_argument("--timeout", type=float, default=120, help="Timeout d'une requête (secondes)")
+    parser.add_argument("--warmup", type=int, default=3, help="Requêtes d'échauffement non mesurées")
+    parser.add_argument("--allow-cache", action="store_true", help="Ne pas rendre les questions uniques (mesure le cache des réponses)")
+    parser.add_argument("--label", default=None, help="Nom du run (ex: version testée)")
+    parser.add_argument("--output", default=None, help="Fichier JSON des résultats")
+    parser.add_argument("--compare", default=None, help="Résultats JSON précédents à comparer")
+
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,56 @@
+#!/bin/bash
+
+# 🔥 Test de charge local: stubs Ollama et MCP + backend, puis run.py
+# Les options sont transmises à run.py (ex: ./run_local.sh --stream --output results.json)
+# Les délais des stubs se règlent par variables d'environnement (voir ollama_stub.py / mcp_stub.py)
+
+LOADTEST_DIR="$(cd "$(dirname "$0")" && pwd)"
+ROOT_DIR="$(dirname "$LOADTEST_DIR")"
+
+OLLAMA_STUB_PORT=${OLLAMA_STUB_PORT:-11500}
+MCP_STUB_PORT=${MCP_STUB_PORT:-8101}
+BACKEND_PORT=${BACKEND_PORT:-8100}
+BACKEND_LOG=${BACKEND_LOG:-${TMPDIR:-/tmp}/lilleaddict-loadtest-backend.log}
+
+# Aucune requête vers le site Lille Addict pendant un test de charge
+export SCRAPING_ENABLED=false
+
+PIDS=()
+cleanup() {
+    for pid in "${PIDS[@]}"; do
+        kill "$pid" 2> /dev/null
+    done
+}
+trap cleanup EXIT
+
+wait_for() {
+    for _ in $(seq 1 50); do
+        curl -s -o /dev/null "$1" && return 0
+        sleep 0.2
+    done
+    echo "❌ $1 ne répond pas"
+    exit 1
+}
+
+echo "1️⃣  Stub Ollama sur le port $OLLAMA_STUB_PORT"
+(cd "$LOADTEST_DIR" && python3 -m uvicorn ollama_stub:app --port "$OLLAMA_STUB_PORT" --log-level warning) &
+PIDS+=($!)
+
+echo "2️⃣  Stub MCP sur le port $MCP_STUB_PORT"
+(cd "$LOADTEST_DIR" && python3 -m uvicorn mcp_stub:app --port "$MCP_STUB_PORT" --log-level warning) &
+PIDS+=($!)
+
+wait_for "http://localhost:$OLLAMA_STUB_PORT/api/tags"
+wait_for "http://localhost:$MCP_STUB_PORT/health"
+
+echo "3️⃣  Backend sur le port $BACKEND_PORT (logs: $BACKEND_LOG)"
+(cd "$ROOT_DIR/backend" && \
+    OLLAMA_URL="http://localhost:$OLLAMA_STUB_PORT" \
+    MCP_URL="http://localhost:$MCP_STUB_PORT" \
+    python3 -m uvicorn main:app --port "$BACKEND_PORT" --log-level warning > "$BACKEND_LOG" 2>&1) &
+PIDS+=($!)
+
+wait_for "http://localhost:$BACKEND_PORT/health/live"
+
+echo ""
+python3 "$LOADTEST_DIR/run.py" --url "http://localhost:$BACKEND_PORT" "$@"
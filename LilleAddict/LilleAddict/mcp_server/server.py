@@ -2,10 +2,15 @@
 Serveur MCP - Expose les tools pour le scraping et traitement de données
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+from contextlib import asynccontextmanager
+import asyncio
+import json
 import logging
+import os
+import time
 
 from tools.scraping import (
     get_weekend_events,
@@ -15,6 +20,10 @@ from tools.scraping import (
     get_outdoor_activities
 )
 from tools.weather import get_weather_forecast
+from tools.manifest import build_manifest, tool_names
+from utils.metrics import HTTP_REQUEST_DURATION, observe_tool, metrics_payload
+from utils.http import get_http_client, close_http_client
+from utils.executor import run_sync, shutdown_executor
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
@@ -24,12 +33,52 @@ logger = logging.getLogger(__name__)
 # APPLICATION FASTAPI
 # ====================================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Ouvre le client HTTP partagé des tools au démarrage, le ferme ainsi que
+    le pool des tools synchrones à l'arrêt
+    """
+    get_http_client()
+    
+    yield
+    
+    await close_http_client()
+    shutdown_executor()
+
 app = FastAPI(
     title="Lille Addict MCP Server",
     description="Serveur MCP exposant les tools de scraping et traitement",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Manifeste sérialisé une seule fois: l'ETag est sa version (empreinte du contenu)
+MANIFEST = build_manifest()
+MANIFEST_BODY = json.dumps(MANIFEST, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+MANIFEST_ETAG = f'"{MANIFEST["version"]}"'
+
+# ====================================
+# MÉTRIQUES
+# ====================================
+
+@app.middleware("http")
+async def record_request_duration(request: Request, call_next):
+    """Latence par route (gabarit de la route, pas le chemin)"""
+    started = time.monotonic()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_DURATION.labels(
+            request.method,
+            route.path if route is not None else "unmatched",
+            str(status)
+        ).observe(time.monotonic() - started)
+
 # ====================================
 # MODÈLES PYDANTIC
 # ====================================
@@ -42,6 +91,120 @@ class ToolResponse(BaseModel):
     data: Optional[Any] = None
     error: Optional[str] = None
 
+class ToolCall(BaseModel):
+    name: str
+    arguments: Dict[str, Any] = {}
+
+class BatchRequest(BaseModel):
+    calls: List[ToolCall]
+    timeout: Optional[float] = None  # Timeout par appel (secondes), plafonné par TOOL_CALL_TIMEOUT
+
+class BatchResult(ToolResponse):
+    name: str
+    duration_ms: float
+
+class BatchResponse(BaseModel):
+    results: List[BatchResult]
+
+# ====================================
+# TOOLS
+# ====================================
+
+async def handle_weekend_events(args: Dict[str, Any]) -> Any:
+    """Tool: Récupère les événements du week-end à Lille"""
+    logger.info("Tool appelé: get_weekend_events")
+    result = await get_weekend_events()
+    logger.info(f"Résultat: {len(result.get('events', []))} événements récupérés")
+    return result
+
+async def handle_search_restaurants(args: Dict[str, Any]) -> Any:
+    """Tool: Recherche de restaurants selon critères"""
+    logger.info(f"Tool appelé: search_restaurants avec args: {args}")
+    result = await run_sync(
+        search_restaurants,
+        cuisine=args.get("cuisine"),
+        diet=args.get("diet"),
+        price_range=args.get("price_range"),
+        atmosphere=args.get("atmosphere"),
+        location=args.get("location")
+    )
+    logger.info(f"Résultat: {len(result)} restaurants trouvés")
+    return result
+
+async def handle_search_bars(args: Dict[str, Any]) -> Any:
+    """Tool: Recherche de bars selon critères"""
+    logger.info(f"Tool appelé: search_bars avec args: {args}")
+    result = await run_sync(
+        search_bars,
+        drink_type=args.get("drink_type"),
+        activity=args.get("activity"),
+        atmosphere=args.get("atmosphere"),
+        location=args.get("location")
+    )
+    logger.info(f"Résultat: {len(result)} bars trouvés")
+    return result
+
+async def handle_weather(args: Dict[str, Any]) -> Any:
+    """Tool: Récupère les prévisions météo"""
+    days = args.get("days", 3)
+    logger.info(f"Tool appelé: get_weather_forecast pour {days} jours")
+    result = await get_weather_forecast(days=days)
+    logger.info("Météo récupérée avec succès")
+    return result
+
+async def handle_indoor_activities(args: Dict[str, Any]) -> Any:
+    """Tool: Récupère les activités en intérieur"""
+    logger.info("Tool appelé: get_indoor_activities")
+    result = await run_sync(get_indoor_activities)
+    logger.info(f"Résultat: {len(result)} activités trouvées")
+    return result
+
+async def handle_outdoor_activities(args: Dict[str, Any]) -> Any:
+    """Tool: Récupère les activités en extérieur"""
+    logger.info("Tool appelé: get_outdoor_activities")
+    result = await run_sync(get_outdoor_activities)
+    logger.info(f"Résultat: {len(result)} activités trouvées")
+    return result
+
+TOOL_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {
+    "get_weekend_events": handle_weekend_events,
+    "search_restaurants": handle_search_restaurants,
+    "search_bars": handle_search_bars,
+    "get_weather_forecast": handle_weather,
+    "get_indoor_activities": handle_indoor_activities,
+    "get_outdoor_activities": handle_outdoor_activities
+}
+
+# Limites des appels groupés (/tools/batch)
+TOOL_CALL_TIMEOUT = float(os.getenv("TOOL_CALL_TIMEOUT", "15"))
+TOOL_BATCH_MAX_CALLS = int(os.getenv("TOOL_BATCH_MAX_CALLS", "16"))
+
+async def execute_tool(name: str, arguments: Dict[str, Any], timeout: Optional[float] = None) -> ToolResponse:
+    """
+    Exécute un tool et convertit toute erreur (tool inconnu, exception,
+    timeout) en ToolResponse(success=False). Enregistre durée et résultat.
+    """
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
+        return ToolResponse(success=False, error=f"Tool inconnu: {name}")
+    
+    started = time.monotonic()
+    try:
+        if timeout:
+            data = await asyncio.wait_for(handler(arguments), timeout=timeout)
+        else:
+            data = await handler(arguments)
+        response = ToolResponse(success=True, data=data)
+    except asyncio.TimeoutError:
+        logger.warning(f"Timeout {name} après {timeout}s")
+        response = ToolResponse(success=False, error=f"Timeout après {timeout}s")
+    except Exception as e:
+        logger.error(f"Erreur {name}: {str(e)}", exc_info=True)
+        response = ToolResponse(success=False, error=str(e))
+    
+    observe_tool(name, time.monotonic() - started, response.success)
+    return response
+
 # ====================================
 # ROUTES
 # ====================================
@@ -52,14 +215,7 @@ async def root():
     return {
         "message": "Lille Addict MCP Server",
         "version": "1.0.0",
-        "tools": [
-            "get_weekend_events",
-            "search_restaurants",
-            "search_bars",
-            "get_weather_forecast",
-            "get_indoor_activities",
-            "get_outdoor_activities"
-        ]
+        "tools": tool_names()
     }
 
 @app.get("/health")
@@ -67,110 +223,97 @@ async def health_check():
     """Health check"""
     return {"status": "ok"}
 
+@app.get("/metrics")
+async def metrics():
+    """Métriques au format Prometheus"""
+    payload, content_type = metrics_payload()
+    return Response(content=payload, media_type=content_type)
+
+@app.get("/tools/manifest")
+async def tools_manifest(request: Request):
+    """
+    Manifeste des tools (schémas au format Ollama + version).
+    
+    Réponse 304 si If-None-Match correspond à la version courante.
+    """
+    headers = {"ETag": MANIFEST_ETAG, "Cache-Control": "no-cache"}
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    if MANIFEST_ETAG in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=MANIFEST_BODY, media_type="application/json", headers=headers)
+
+@app.post("/tools/batch", response_model=BatchResponse)
+async def tools_batch(request: BatchRequest):
+    """
+    Exécute plusieurs tool calls en parallèle en un seul aller-retour.
+    
+    Chaque appel a son propre timeout; les résultats sont renvoyés dans
+    l'ordre des appels, un échec n'affectant pas les autres.
+    """
+    if len(request.calls) > TOOL_BATCH_MAX_CALLS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Trop d'appels ({len(request.calls)} > {TOOL_BATCH_MAX_CALLS})"
+        )
+    
+    timeout = min(request.timeout, TOOL_CALL_TIMEOUT) if request.timeout else TOOL_CALL_TIMEOUT
+    logger.info(f"Batch de {len(request.calls)} tool calls: {[call.name for call in request.calls]}")
+    
+    async def run(call: ToolCall) -> BatchResult:
+        started = time.monotonic()
+        response = await execute_tool(call.name, call.arguments, timeout=timeout)
+        return BatchResult(
+            name=call.name,
+            duration_ms=round((time.monotonic() - started) * 1000, 1),
+            **response.model_dump()
+        )
+    
+    results = await asyncio.gather(*(run(call) for call in request.calls))
+    return BatchResponse(results=results)
+
 @app.post("/tools/get_weekend_events", response_model=ToolResponse)
 async def tool_weekend_events(request: ToolRequest):
     """
     Tool: Récupère les événements du week-end à Lille
     """
-    try:
-        logger.info("Tool appelé: get_weekend_events")
-        result = get_weekend_events()
-        logger.info(f"Résultat: {len(result.get('events', []))} événements récupérés")
-        return ToolResponse(success=True, data=result)
-    except Exception as e:
-        logger.error(f"Erreur get_weekend_events: {str(e)}", exc_info=True)
-        return ToolResponse(success=False, error=str(e))
+    return await execute_tool("get_weekend_events", request.arguments)
 
 @app.post("/tools/search_restaurants", response_model=ToolResponse)
 async def tool_search_restaurants(request: ToolRequest):
     """
     Tool: Recherche de restaurants selon critères
     """
-    try:
-        args = request.arguments
-        logger.info(f"Tool appelé: search_restaurants avec args: {args}")
-        
-        result = search_restaurants(
-            cuisine=args.get("cuisine"),
-            diet=args.get("diet"),
-            price_range=args.get("price_range"),
-            atmosphere=args.get("atmosphere"),
-            location=args.get("location")
-        )
-        
-        logger.info(f"Résultat: {len(result)} restaurants trouvés")
-        return ToolResponse(success=True, data=result)
-    except Exception as e:
-        logger.error(f"Erreur search_restaurants: {str(e)}", exc_info=True)
-        return ToolResponse(success=False, error=str(e))
+    return await execute_tool("search_restaurants", request.arguments)
 
 @app.post("/tools/search_bars", response_model=ToolResponse)
 async def tool_search_bars(request: ToolRequest):
     """
     Tool: Recherche de bars selon critères
     """
-    try:
-        args = request.arguments
-        logger.info(f"Tool appelé: search_bars avec args: {args}")
-        
-        result = search_bars(
-            drink_type=args.get("drink_type"),
-            activity=args.get("activity"),
-            atmosphere=args.get("atmosphere"),
-            location=args.get("location")
-        )
-        
-        logger.info(f"Résultat: {len(result)} bars trouvés")
-        return ToolResponse(success=True, data=result)
-    except Exception as e:
-        logger.error(f"Erreur search_bars: {str(e)}", exc_info=True)
-        return ToolResponse(success=False, error=str(e))
+    return await execute_tool("search_bars", request.arguments)
 
 @app.post("/tools/get_weather_forecast", response_model=ToolResponse)
 async def tool_weather(request: ToolRequest):
     """
     Tool: Récupère les prévisions météo
     """
-    try:
-        args = request.arguments
-        days = args.get("days", 3)
-        logger.info(f"Tool appelé: get_weather_forecast pour {days} jours")
-        
-        result = get_weather_forecast(days=days)
-        
-        logger.info("Météo récupérée avec succès")
-        return ToolResponse(success=True, data=result)
-    except Exception as e:
-        logger.error(f"Erreur get_weather_forecast: {str(e)}", exc_info=True)
-        return ToolResponse(success=False, error=str(e))
+    return await execute_tool("get_weather_forecast", request.arguments)
 
 @app.post("/tools/get_indoor_activities", response_model=ToolResponse)
 async def tool_indoor_activities(request: ToolRequest):
     """
     Tool: Récupère les activités en intérieur
     """
-    try:
-        logger.info("Tool appelé: get_indoor_activities")
-        result = get_indoor_activities()
-        logger.info(f"Résultat: {len(result)} activités trouvées")
-        return ToolResponse(success=True, data=result)
-    except Exception as e:
-        logger.error(f"Erreur get_indoor_activities: {str(e)}", exc_info=True)
-        return ToolResponse(success=False, error=str(e))
+    return await execute_tool("get_indoor_activities", request.arguments)
 
 @app.post("/tools/get_outdoor_activities", response_model=ToolResponse)
 async def tool_outdoor_activities(request: ToolRequest):
     """
     Tool: Récupère les activités en extérieur
     """
-    try:
-        logger.info("Tool appelé: get_outdoor_activities")
-        result = get_outdoor_activities()
-        logger.info(f"Résultat: {len(result)} activités trouvées")
-        return ToolResponse(success=True, data=result)
-    except Exception as e:
-        logger.error(f"Erreur get_outdoor_activities: {str(e)}", exc_info=True)
-        return ToolResponse(success=False, error=str(e))
+    return await execute_tool("get_outdoor_activities", request.arguments)
 
 # ====================================
 # LANCEMENT
@@ -0,0 +1,20 @@
+"""
+Configuration des tests du serveur MCP (lancés depuis mcp_server/: python -m pytest)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Imports du serveur (tools, utils) comme au lancement de server.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+@pytest.fixture
+def fixture_bytes():
+    """Contenu d'une page HTML enregistrée dans tests/fixtures"""
+    def read(name: str) -> bytes:
+        return (FIXTURES / name).read_bytes()
+    return read
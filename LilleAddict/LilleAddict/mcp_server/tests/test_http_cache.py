@@ -0,0 +1,175 @@
+"""
+Tests du cache HTTP sur disque (requêtes conditionnelles, copie de secours,
+réutilisation du parsing)
+"""
+
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+from utils.http_cache import HTTPCache
+
+URL = "https://lilleaddict.fr/que-faire-a-lille-ce-week-end/"
+
+class FakeSite:
+    """Serveur simulé: une page, ses validateurs et les requêtes reçues"""
+
+    def __init__(self, content: bytes, etag: str = '"v1"', last_modified: str = "Sat, 10 Jan 2026 08:00:00 GMT"):
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.down = False
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.down:
+            raise httpx.ConnectError("site injoignable", request=request)
+
+        headers = {}
+        if self.etag:
+            headers["ETag"] = self.etag
+        if self.last_modified:
+            headers["Last-Modified"] = self.last_modified
+
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, content=self.content, headers=headers)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+def counting_parser():
+    """Parseur qui compte ses appels (parser.calls)"""
+    def parser(content: bytes, url: str) -> dict:
+        parser.calls += 1
+        return {"length": len(content)}
+    parser.calls = 0
+    return parser
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+def test_first_fetch_downloads_and_stores(tmp_path):
+    site = FakeSite(b"<html>v1</html>")
+    cache = HTTPCache(tmp_path, http_client=site.client())
+
+    page = run(cache.fetch(URL))
+
+    assert page.content == b"<html>v1</html>"
+    assert not page.from_cache
+    assert "If-None-Match" not in site.requests[0].headers
+    assert len(list(tmp_path.glob("*.cache"))) == 1
+
+def test_unchanged_page_costs_a_304_and_no_reparse(tmp_path):
+    site = FakeSite(b"<html>v1</html>")
+    cache = HTTPCache(tmp_path, http_client=site.client())
+    parser = counting_parser()
+
+    first = run(cache.fetch_parsed(URL, parser))
+    second = run(cache.fetch_parsed(URL, parser))
+
+    assert first == second == {"length": 15}
+    assert parser.calls == 1
+    assert site.requests[1].headers["If-None-Match"] == '"v1"'
+    assert site.requests[1].headers["If-Modified-Since"] == site.last_modified
+
+def test_changed_page_is_reparsed(tmp_path):
+    site = FakeSite(b"<html>v1</html>")
+    cache = HTTPCache(tmp_path, http_client=site.client())
+    parser = counting_parser()
+
+    run(cache.fetch_parsed(URL, parser))
+    site.content, site.etag = b"<html>version 2</html>", '"v2"'
+    result = run(cache.fetch_parsed(URL, parser))
+
+    assert result == {"length": 22}
+    assert parser.calls == 2
+
+def test_cache_survives_restart(tmp_path):
+    site = FakeSite(b"<html>v1</html>")
+    run(HTTPCache(tmp_path, http_client=site.client()).fetch(URL))
+
+    page = run(HTTPCache(tmp_path, http_client=site.client()).fetch(URL))
+
+    assert page.from_cache
+    assert page.content == b"<html>v1</html>"
+
+def test_unreachable_site_serves_stale_copy(tmp_path):
+    site = FakeSite(b"<html>v1</html>")
+    cache = HTTPCache(tmp_path, http_client=site.client())
+    run(cache.fetch(URL))
+
+    site.down = True
+    page = run(cache.fetch(URL))
+
+    assert page.from_cache
+    assert page.content == b"<html>v1</html>"
+
+def test_unreachable_site_without_copy_raises(tmp_path):
+    site = FakeSite(b"<html>v1</html>")
+    site.down = True
+    cache = HTTPCache(tmp_path, http_client=site.client())
+
+    with pytest.raises(httpx.ConnectError):
+        run(cache.fetch(URL))
+
+def test_page_without_validators_is_kept_as_fallback(tmp_path):
+    site = FakeSite(b"<html>v1</html>", etag=None, last_modified=None)
+    cache = HTTPCache(tmp_path, http_client=site.client())
+    run(cache.fetch(URL))
+
+    # Revalidation impossible: nouvelle requête inconditionnelle
+    page = run(cache.fetch(URL))
+    assert not page.from_cache
+    assert "If-None-Match" not in site.requests[1].headers
+    assert "If-Modified-Since" not in site.requests[1].headers
+
+    site.down = True
+    page = run(cache.fetch(URL))
+    assert page.from_cache
+    assert page.content == b"<html>v1</html>"
+
+@pytest.mark.parametrize("corruption", [
+    lambda raw: b"pas du json\n" + raw,
+    lambda raw: raw[:-3],
+    lambda raw: b""
+])
+def test_corrupt_cache_file_is_ignored(tmp_path, corruption):
+    site = FakeSite(b"<html>v1</html>")
+    cache = HTTPCache(tmp_path, http_client=site.client())
+    run(cache.fetch(URL))
+
+    path = next(tmp_path.glob("*.cache"))
+    path.write_bytes(corruption(path.read_bytes()))
+
+    page = run(cache.fetch(URL))
+
+    assert not page.from_cache
+    assert "If-None-Match" not in site.requests[1].headers
+    # Le fichier est réécrit et de nouveau utilisable
+    assert run(cache.fetch(URL)).from_cache
+
+def test_failed_store_keeps_previous_copy(tmp_path, monkeypatch):
+    site = FakeSite(b"<html>v1</html>")
+    cache = HTTPCache(tmp_path, http_client=site.client())
+    run(cache.fetch(URL))
+    path = next(tmp_path.glob("*.cache"))
+    previous = path.read_bytes()
+
+    write_bytes = Path.write_bytes
+
+    def fail(self, data):
+        # Écriture interrompue: fichier temporaire partiel
+        write_bytes(self, data[:10])
+        raise OSError("disque plein")
+
+    monkeypatch.setattr(Path, "write_bytes", fail)
+    site.content, site.etag = b"<html>version 2</html>", '"v2"'
+    page = run(cache.fetch(URL))
+
+    assert page.content == b"<html>version 2</html>"
+    assert path.read_bytes() == previous
+    assert list(tmp_path.glob("*.tmp")) == []
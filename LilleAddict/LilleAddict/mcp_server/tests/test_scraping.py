@@ -0,0 +1,97 @@
+"""
+Tests du scraping des événements du week-end (parsing lxml des pages enregistrées)
+"""
+
+import asyncio
+
+import httpx
+
+from tools import scraping
+from utils.http_cache import HTTPCache
+
+LISTING_URL = "https://lilleaddict.fr/que-faire-a-lille-ce-week-end/"
+ARTICLE_URL = "https://lilleaddict.fr/que-faire-a-lille-ce-week-end-9-15-janvier-2026/"
+
+# ====================================
+# PARSING
+# ====================================
+
+def test_latest_article_url_is_first_article_link(fixture_bytes):
+    url = scraping.parse_latest_article_url(fixture_bytes("weekend_listing.html"), LISTING_URL)
+    assert url == ARTICLE_URL
+
+def test_latest_article_url_without_article():
+    assert scraping.parse_latest_article_url(b"<html><body><p>Rien</p></body></html>", LISTING_URL) is None
+
+def test_weekend_article_events(fixture_bytes):
+    article = scraping.parse_weekend_article(fixture_bytes("weekend_article.html"), ARTICLE_URL)
+
+    assert article["week_dates"] == "9-15 janvier 2026"
+    assert article["events"] == [
+        {
+            "title": "Concert Jazz au Mood",
+            "description": "Le trio local revient pour une soirée feutrée.",
+            "dates": "Samedi 11 janvier",
+            "price": "Gratuit",
+            "location": "Le Mood, Lille",
+            "hours": "20h-23h"
+        },
+        {
+            "title": "Marché créateurs",
+            "description": "Artisans locaux et créateurs lillois, à partir de 5 € l'atelier.",
+            "dates": "Dimanche 12 janvier",
+            "price": "5€",
+            "location": "Grand Place, Lille",
+            "hours": "10h-18h"
+        }
+    ]
+
+def test_weekend_article_without_charset_is_read_as_utf8():
+    content = "<h1>Sorties du 22 au 28 décembre</h1><h2>Cirque de Noël</h2><p>Où : Le Chapitô</p>".encode("utf-8")
+    article = scraping.parse_weekend_article(content, ARTICLE_URL)
+
+    assert article["week_dates"] == "22 au 28 décembre"
+    assert article["events"][0]["title"] == "Cirque de Noël"
+    assert article["events"][0]["location"] == "Le Chapitô"
+
+# ====================================
+# GET_WEEKEND_EVENTS
+# ====================================
+
+def use_site(monkeypatch, tmp_path, pages):
+    """Site simulé derrière le cache des pages du scraping"""
+    monkeypatch.setattr(scraping, "BASE_URL", "https://lilleaddict.fr")
+    monkeypatch.setattr(scraping, "SCRAPING_ENABLED", True)
+    monkeypatch.setattr(scraping, "PAGE_CACHE", HTTPCache(tmp_path, http_client=site(pages)))
+
+def site(pages):
+    """Client HTTP simulé servant les pages données (url -> contenu)"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        content = pages.get(str(request.url))
+        if content is None:
+            return httpx.Response(404)
+        return httpx.Response(200, content=content, headers={"ETag": '"v1"'})
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+def test_get_weekend_events_scrapes_latest_article(monkeypatch, tmp_path, fixture_bytes):
+    use_site(monkeypatch, tmp_path, {
+        LISTING_URL: fixture_bytes("weekend_listing.html"),
+        ARTICLE_URL: fixture_bytes("weekend_article.html")
+    })
+
+    result = asyncio.run(scraping.get_weekend_events())
+
+    assert result["week_dates"] == "9-15 janvier 2026"
+    assert [event["title"] for event in result["events"]] == ["Concert Jazz au Mood", "Marché créateurs"]
+
+def test_get_weekend_events_falls_back_to_demo_data(monkeypatch, tmp_path, fixture_bytes):
+    # Article introuvable (404) et pas de copie en cache
+    use_site(monkeypatch, tmp_path, {LISTING_URL: fixture_bytes("weekend_listing.html")})
+
+    result = asyncio.run(scraping.get_weekend_events())
+
+    assert result == scraping.mock_weekend_events()
+
+def test_get_weekend_events_disabled(monkeypatch):
+    monkeypatch.setattr(scraping, "SCRAPING_ENABLED", False)
+    assert asyncio.run(scraping.get_weekend_events()) == scraping.mock_weekend_events()
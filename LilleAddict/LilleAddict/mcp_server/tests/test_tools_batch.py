@@ -0,0 +1,69 @@
+"""
+Tests de la route /tools/batch (ordre des résultats, erreurs isolées par
+appel, timeout par appel, limite du nombre d'appels)
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+
+@pytest.fixture
+def client(monkeypatch):
+    async def bars(arguments):
+        await asyncio.sleep(0.02)
+        return {"bars": [{"nom": "Le Capitole"}], **arguments}
+
+    async def broken(arguments):
+        raise RuntimeError("site indisponible")
+
+    async def slow(arguments):
+        await asyncio.sleep(1)
+        return {}
+
+    monkeypatch.setitem(server.TOOL_HANDLERS, "search_bars", bars)
+    monkeypatch.setitem(server.TOOL_HANDLERS, "get_weekend_events", broken)
+    monkeypatch.setitem(server.TOOL_HANDLERS, "get_weather_forecast", slow)
+    return TestClient(server.app)
+
+def test_results_in_call_order_with_errors_isolated(client):
+    response = client.post("/tools/batch", json={"calls": [
+        {"name": "search_bars", "arguments": {"quartier": "Wazemmes"}},
+        {"name": "get_weekend_events", "arguments": {}},
+        {"name": "tool_inconnu", "arguments": {}},
+        {"name": "search_bars", "arguments": {}}
+    ]})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["name"] for result in results] == ["search_bars", "get_weekend_events", "tool_inconnu", "search_bars"]
+    assert [result["success"] for result in results] == [True, False, False, True]
+    assert results[0]["data"]["quartier"] == "Wazemmes"
+    assert results[1]["error"] == "site indisponible"
+    assert "Tool inconnu" in results[2]["error"]
+    # Durée mesurée pour chaque appel
+    assert results[0]["duration_ms"] >= 20
+    assert results[2]["duration_ms"] < 20
+
+def test_each_call_has_its_own_timeout(client):
+    response = client.post("/tools/batch", json={"timeout": 0.1, "calls": [
+        {"name": "get_weather_forecast", "arguments": {}},
+        {"name": "search_bars", "arguments": {}}
+    ]})
+
+    slow, bars = response.json()["results"]
+    assert slow["success"] is False
+    assert "Timeout" in slow["error"]
+    assert bars["success"] is True
+
+def test_batch_over_the_limit_is_rejected_with_413(client, monkeypatch):
+    monkeypatch.setattr(server, "TOOL_BATCH_MAX_CALLS", 2)
+    calls = [{"name": "search_bars", "arguments": {}}] * 3
+
+    response = client.post("/tools/batch", json={"calls": calls})
+
+    assert response.status_code == 413
+    assert "3 > 2" in response.json()["detail"]
+    assert client.post("/tools/batch", json={"calls": calls[:2]}).status_code == 200
@@ -0,0 +1,140 @@
+"""
+Manifeste des tools - Définitions (schémas JSON au format Ollama) publiées
+par le serveur MCP, avec une empreinte de contenu
+"""
+
+import hashlib
+import json
+from typing import Dict, Any, List
+
+TOOL_DEFINITIONS: List[Dict[str, Any]] = [
+    {
+        "type": "function",
+        "function": {
+            "name": "get_weekend_events",
+            "description": "Récupère la liste des événements à faire à Lille ce week-end. Utilise ce tool quand l'utilisateur demande ce qu'il peut faire ce week-end, les événements de la semaine, ou les sorties à Lille.",
+            "parameters": {
+                "type": "object",
+                "properties": {},
+                "required": []
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "search_restaurants",
+            "description": "Recherche des restaurants à Lille selon des critères spécifiques. Utilise ce tool quand l'utilisateur cherche un restaurant avec des préférences de cuisine, régime alimentaire ou gamme de prix.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "cuisine": {
+                        "type": "string",
+                        "description": "Type de cuisine recherchée (ex: italien, japonais, français, mexicain, indien, chinois, thaï, coréen, végétarien, etc.)"
+                    },
+                    "diet": {
+                        "type": "string",
+                        "description": "Régime alimentaire spécifique (ex: végétarien, vegan, sans gluten, halal)"
+                    },
+                    "price_range": {
+                        "type": "string",
+                        "description": "Gamme de prix (€ pour pas cher, €€ pour moyen, €€€ pour cher)"
+                    },
+                    "atmosphere": {
+                        "type": "string",
+                        "description": "Type d'ambiance recherchée (ex: terrasse, romantique, groupe, familial, branché)"
+                    },
+                    "location": {
+                        "type": "string",
+                        "description": "Quartier ou ville spécifique (ex: Vieux-Lille, Wazemmes, Roubaix)"
+                    }
+                }
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "search_bars",
+            "description": "Recherche des bars à Lille selon des critères. Utilise ce tool quand l'utilisateur cherche un bar, un endroit pour boire un verre, ou une activité de soirée.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "drink_type": {
+                        "type": "string",
+                        "description": "Type de boisson (ex: cocktail, bière, vin, café, thé, chocolat chaud)"
+                    },
+                    "activity": {
+                        "type": "string",
+                        "description": "Activité disponible (ex: billard, babyfoot, fléchettes, jeux de société, karaoké, concert, quiz)"
+                    },
+                    "atmosphere": {
+                        "type": "string",
+                        "description": "Ambiance recherchée (ex: calme, animé, terrasse, cosy, branché, jazz, rock)"
+                    },
+                    "location": {
+                        "type": "string",
+                        "description": "Quartier ou ville (ex: centre Lille, Vieux-Lille, Wazemmes)"
+                    }
+                }
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_weather_forecast",
+            "description": "Récupère les prévisions météo pour Lille. Utilise ce tool quand l'utilisateur pose une question sur la météo ou demande des activités adaptées au temps qu'il va faire.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "days": {
+                        "type": "integer",
+                        "description": "Nombre de jours de prévisions (1-7)",
+                        "default": 3
+                    }
+                }
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_indoor_activities",
+            "description": "Récupère les activités en intérieur à Lille. Utilise ce tool quand l'utilisateur demande quoi faire s'il pleut, ou des activités à l'abri.",
+            "parameters": {
+                "type": "object",
+                "properties": {},
+                "required": []
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_outdoor_activities",
+            "description": "Récupère les activités en extérieur à Lille. Utilise ce tool quand l'utilisateur demande des activités de plein air, parcs, terrasses.",
+            "parameters": {
+                "type": "object",
+                "properties": {},
+                "required": []
+            }
+        }
+    }
+]
+
+def build_manifest() -> Dict[str, Any]:
+    """
+    Manifeste des tools: {"version", "tools"}
+
+    La version est l'empreinte du contenu: elle ne change que si une
+    définition change, ce qui permet au backend de ne recharger les tools
+    que lorsque c'est nécessaire.
+    """
+    canonical = json.dumps(TOOL_DEFINITIONS, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    version = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+    return {"version": version, "tools": TOOL_DEFINITIONS}
+
+def tool_names() -> List[str]:
+    """Noms des tools publiés"""
+    return [tool["function"]["name"] for tool in TOOL_DEFINITIONS]
@@ -2,24 +2,39 @@
 Tools de scraping pour Lille Addict
 """
 
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Any, Tuple
+from urllib.parse import urljoin
+import lxml.html
+import os
 import re
 import logging
 
+from utils.http_cache import HTTPCache
+
 logger = logging.getLogger(__name__)
 
-BASE_URL = "https://lilleaddict.fr"
+BASE_URL = os.getenv("LILLEADDICT_URL", "https://lilleaddict.fr").rstrip("/")
+WEEKEND_PATH = "/que-faire-a-lille-ce-week-end/"
+# Désactivé par défaut: aucune requête vers le site sans l'avoir demandé
+SCRAPING_ENABLED = os.getenv("SCRAPING_ENABLED", "false").strip().lower() in ("1", "true", "yes", "on")
+
+# Pages du site en cache disque, revalidées par requêtes conditionnelles
+PAGE_CACHE = HTTPCache()
 
 # ====================================
 # USE CASE 1: ÉVÉNEMENTS DU WEEK-END
 # ====================================
 
-def get_weekend_events() -> Dict:
+async def get_weekend_events() -> Dict:
     """
     Scrape les événements du week-end depuis Lille Addict
     
+    La page des sorties donne l'article de la semaine, dont chaque section
+    H2 est un événement. Les deux pages passent par le cache HTTP: un
+    article inchangé ne coûte qu'une réponse 304, sans nouveau parsing.
+    Si le scraping échoue (site injoignable sans copie en cache, structure
+    inattendue), les données de démonstration sont renvoyées.
+    
     Returns:
         {
             "week_dates": "22-28 décembre",
@@ -35,95 +50,62 @@ def get_weekend_events() -> Dict:
             ]
         }
     """
+    if not SCRAPING_ENABLED:
+        return mock_weekend_events()
+    
     try:
         logger.info("Scraping événements du week-end...")
         
-        # TODO: Implémente le scraping réel
-        # Pour le MVP, retour de données mock
-        
-        return {
-            "week_dates": "9-15 janvier 2026",
-            "events": [
-                {
-                    "title": "Concert Jazz au Mood",
-                    "description": "Soirée jazz avec le trio local",
-                    "dates": "Samedi 11 janvier",
-                    "price": "Gratuit",
-                    "location": "Le Mood, Lille",
-                    "hours": "20h-23h"
-                },
-                {
-                    "title": "Marché créateurs",
-                    "description": "Artisans locaux et créateurs lillois",
-                    "dates": "Dimanche 12 janvier",
-                    "price": "Entrée libre",
-                    "location": "Grand Place, Lille",
-                    "hours": "10h-18h"
-                },
-                {
-                    "title": "Escape Game en plein air",
-                    "description": "Parcours énigmes dans le Vieux-Lille",
-                    "dates": "Tout le week-end",
-                    "price": "15€/personne",
-                    "location": "Départ Place du Théâtre",
-                    "hours": "14h-17h"
-                }
-            ]
-        }
-        
-        # VERSION RÉELLE À IMPLÉMENTER:
-        """
-        # 1. Récupérer la page principale
-        response = requests.get(f"{BASE_URL}/que-faire-a-lille-ce-week-end/")
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # 2. Trouver l'article le plus récent
-        latest_article = soup.find('article')
-        article_link = latest_article.find('a', href=True)
-        article_url = article_link['href']
-        
-        # 3. Récupérer l'article complet
-        article_response = requests.get(article_url)
-        article_soup = BeautifulSoup(article_response.content, 'html.parser')
-        
-        # 4. Extraire les événements (sections H2)
-        events = []
-        event_sections = article_soup.find_all('h2')
+        # 1. Article le plus récent de la page des sorties
+        article_url = await PAGE_CACHE.fetch_parsed(f"{BASE_URL}{WEEKEND_PATH}", parse_latest_article_url)
+        if not article_url:
+            raise ValueError("aucun article sur la page des sorties")
         
-        for h2 in event_sections:
-            event = {
-                'title': h2.get_text().strip(),
-                'description': '',
-                'dates': '',
-                'price': '',
-                'location': '',
-                'hours': ''
-            }
-            
-            # Parser les infos des éléments suivants
-            for sibling in h2.find_next_siblings():
-                if sibling.name == 'h2':
-                    break
-                
-                text = sibling.get_text().strip()
-                
-                # Identifier dates, prix, lieu...
-                # TODO: logique de parsing
-                
-                events.append(event)
+        # 2. Événements de l'article (sections H2)
+        article = await PAGE_CACHE.fetch_parsed(article_url, parse_weekend_article)
+        if not article["events"]:
+            raise ValueError(f"aucun événement dans {article_url}")
         
         return {
-            "week_dates": extracted_dates,
-            "events": events
+            "week_dates": article["week_dates"],
+            "events": list(article["events"])
         }
-        """
         
     except Exception as e:
-        logger.error(f"Erreur scraping événements: {str(e)}")
-        return {
-            "week_dates": "",
-            "events": []
-        }
+        logger.error(f"Erreur scraping événements: {str(e) or type(e).__name__}, données de démonstration utilisées")
+        return mock_weekend_events()
+
+def mock_weekend_events() -> Dict:
+    """Données de démonstration (scraping désactivé ou en échec)"""
+    return {
+        "week_dates": "9-15 janvier 2026",
+        "events": [
+            {
+                "title": "Concert Jazz au Mood",
+                "description": "Soirée jazz avec le trio local",
+                "dates": "Samedi 11 janvier",
+                "price": "Gratuit",
+                "location": "Le Mood, Lille",
+                "hours": "20h-23h"
+            },
+            {
+                "title": "Marché créateurs",
+                "description": "Artisans locaux et créateurs lillois",
+                "dates": "Dimanche 12 janvier",
+                "price": "Entrée libre",
+                "location": "Grand Place, Lille",
+                "hours": "10h-18h"
+            },
+            {
+                "title": "Escape Game en plein air",
+                "description": "Parcours énigmes dans le Vieux-Lille",
+                "dates": "Tout le week-end",
+                "price": "15€/personne",
+                "location": "Départ Place du Théâtre",
+                "hours": "14h-17h"
+            }
+        ]
+    }
 
 # ====================================
 # USE CASE 2: RESTAURANTS
@@ -174,15 +156,7 @@ def search_restaurants(
         ]
         
         # Filtrer selon critères
-        results = []
-        for resto in restaurants_mock:
-            if cuisine and cuisine.lower() not in resto['cuisine'].lower():
-                continue
-            if diet and diet.lower() not in resto.get('dietary', '').lower():
-                continue
-            results.append(resto)
-        
-        return results
+        return filter_restaurants(restaurants_mock, cuisine=cuisine, diet=diet)
         
     except Exception as e:
         logger.error(f"Erreur recherche restaurants: {str(e)}")
@@ -225,15 +199,7 @@ def search_bars(
         ]
         
         # Filtrer
-        results = []
-        for bar in bars_mock:
-            if drink_type and drink_type.lower() not in bar['drink_type'].lower():
-                continue
-            if atmosphere and atmosphere.lower() not in bar.get('atmosphere', '').lower():
-                continue
-            results.append(bar)
-        
-        return results
+        return filter_bars(bars_mock, drink_type=drink_type, atmosphere=atmosphere)
         
     except Exception as e:
         logger.error(f"Erreur recherche bars: {str(e)}")
@@ -300,6 +266,163 @@ def get_outdoor_activities() -> List[Dict]:
 # HELPERS
 # ====================================
 
+def filter_restaurants(
+    restaurants: List[Dict],
+    cuisine: Optional[str] = None,
+    diet: Optional[str] = None
+) -> List[Dict]:
+    """
+    Restaurants correspondant aux critères (sous-chaîne, sans casse).
+    Un critère vide ne filtre pas.
+    """
+    cuisine = cuisine.lower() if cuisine else None
+    diet = diet.lower() if diet else None
+    
+    return [
+        resto for resto in restaurants
+        if (not cuisine or cuisine in resto['cuisine'].lower())
+        and (not diet or diet in resto.get('dietary', '').lower())
+    ]
+
+def filter_bars(
+    bars: List[Dict],
+    drink_type: Optional[str] = None,
+    atmosphere: Optional[str] = None
+) -> List[Dict]:
+    """
+    Bars correspondant aux critères (sous-chaîne, sans casse).
+    Un critère vide ne filtre pas.
+    """
+    drink_type = drink_type.lower() if drink_type else None
+    atmosphere = atmosphere.lower() if atmosphere else None
+    
+    return [
+        bar for bar in bars
+        if (not drink_type or drink_type in bar['drink_type'].lower())
+        and (not atmosphere or atmosphere in bar.get('atmosphere', '').lower())
+    ]
+
+MONTHS = "janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre"
+
+# "9-15 janvier 2026", "du 22 au 28 décembre", "31 décembre - 4 janvier"
+WEEK_DATES_PATTERN = re.compile(
+    rf"(\d{{1,2}}(?:er)?(?:\s+(?:{MONTHS}))?\s*(?:-|–|au)\s*\d{{1,2}}(?:er)?\s+(?:{MONTHS})(?:\s+\d{{4}})?)",
+    re.IGNORECASE
+)
+
+# Lignes "Libellé : valeur" des fiches événement, par champ
+EVENT_FIELDS = {
+    "dates": ("date", "dates", "quand"),
+    "price": ("prix", "tarif", "tarifs", "entrée"),
+    "location": ("lieu", "où", "adresse"),
+    "hours": ("horaire", "horaires", "heure", "heures")
+}
+EVENT_FIELD_PATTERN = re.compile(r"^\W*([^\W\d_]+)\s*:\s*(.+)$")
+
+def html_document(content: bytes) -> lxml.html.HtmlElement:
+    """Document lxml, décodé en UTF-8 si possible (sans <meta charset>, lxml supposerait du Latin-1)"""
+    try:
+        return lxml.html.fromstring(content.decode("utf-8"))
+    except UnicodeDecodeError:
+        return lxml.html.fromstring(content)
+
+def parse_latest_article_url(content: bytes, url: str) -> Optional[str]:
+    """URL de l'article le plus récent de la page des sorties (premier <article>)"""
+    document = html_document(content)
+    
+    for article in document.iter("article"):
+        links = article.xpath(".//*[self::h1 or self::h2 or self::h3]//a[@href]") or article.xpath(".//a[@href]")
+        if links:
+            return urljoin(url, links[0].get("href"))
+    
+    return None
+
+def parse_weekend_article(content: bytes, url: str) -> Dict[str, Any]:
+    """
+    Événements d'un article "que faire ce week-end": chaque H2 du contenu
+    est un événement, les paragraphes qui suivent donnent sa fiche
+    ("Dates : ...", "Prix : ...", "Lieu : ...", "Horaires : ...") et sa
+    description.
+    """
+    document = html_document(content)
+    
+    title = clean_text(document.xpath("string(//h1)")) or clean_text(document.xpath("string(//title)"))
+    week_dates = WEEK_DATES_PATTERN.search(title)
+    
+    containers = (
+        document.xpath("//*[contains(concat(' ', normalize-space(@class), ' '), ' entry-content ')]")
+        or document.xpath("//article")
+        or [document]
+    )
+    
+    # Les <br> séparent les lignes de la fiche
+    for br in containers[0].iter("br"):
+        br.tail = "\n" + (br.tail or "")
+    
+    events = []
+    current = None
+    description: List[str] = []
+    
+    def close_event():
+        if current is not None:
+            current["description"] = clean_text(" ".join(description))
+            if not current["price"]:
+                current["price"] = extract_price(current["description"])
+            events.append(current)
+    
+    for element in containers[0].iter("h2", "p", "li"):
+        if element.tag == "h2":
+            close_event()
+            current = None
+            description = []
+            event_title = clean_text(element.text_content())
+            if event_title:
+                current = {
+                    "title": event_title,
+                    "description": "",
+                    "dates": "",
+                    "price": "",
+                    "location": "",
+                    "hours": ""
+                }
+            continue
+        
+        if current is None:
+            continue
+        
+        for line in element.text_content().split("\n"):
+            line = clean_text(line)
+            if not line:
+                continue
+            field = parse_event_field(line)
+            if field is not None and not current[field[0]]:
+                current[field[0]] = field[1]
+            else:
+                description.append(line)
+    
+    close_event()
+    
+    return {
+        "week_dates": week_dates.group(1) if week_dates else "",
+        "events": events
+    }
+
+def parse_event_field(line: str) -> Optional[Tuple[str, str]]:
+    """("dates" | "price" | "location" | "hours", valeur) pour une ligne de fiche, sinon None"""
+    match = EVENT_FIELD_PATTERN.match(line)
+    if not match:
+        return None
+    
+    label = match.group(1).lower()
+    for field, labels in EVENT_FIELDS.items():
+        if label in labels:
+            value = clean_text(match.group(2))
+            if field == "price":
+                value = extract_price(value) or value
+            return field, value
+    
+    return None
+
 def clean_text(text: str) -> str:
     """Nettoie un texte"""
     if not text:
@@ -325,10 +448,12 @@ def extract_price(text: str) -> str:
 # ====================================
 
 if __name__ == "__main__":
+    import asyncio
+    
     print("Test scraping...")
     
     print("\n=== Événements ===")
-    events = get_weekend_events()
+    events = asyncio.run(get_weekend_events())
     print(f"Trouvé {len(events['events'])} événements")
     for event in events['events'][:2]:
         print(f"  - {event['title']}")
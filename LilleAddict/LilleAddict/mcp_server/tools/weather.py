@@ -2,14 +2,16 @@
 Tool météo - Prévisions météo pour Lille
 """
 
-import requests
+import httpx
 from typing import Dict
 import logging
 import os
 
+from utils.http import get_http_client
+
 logger = logging.getLogger(__name__)
 
-def get_weather_forecast(days: int = 3) -> Dict:
+async def get_weather_forecast(days: int = 3) -> Dict:
     """
     Récupère les prévisions météo pour Lille
     
@@ -55,7 +57,7 @@ def get_weather_forecast(days: int = 3) -> Dict:
             "cnt": days * 8  # 8 prévisions par jour (toutes les 3h)
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = await get_http_client().get(url, params=params, timeout=10)
         
         if response.status_code != 200:
             logger.error(f"Erreur API météo: {response.status_code}")
@@ -86,6 +88,10 @@ def get_weather_forecast(days: int = 3) -> Dict:
             "forecast": forecast
         }
         
+    except httpx.TimeoutException:
+        logger.error("Timeout de l'API météo")
+        return get_mock_weather(days)
+    
     except Exception as e:
         logger.error(f"Erreur récupération météo: {str(e)}")
         return get_mock_weather(days)
@@ -171,9 +177,11 @@ def interpret_weather(forecast: Dict) -> str:
 # ====================================
 
 if __name__ == "__main__":
+    import asyncio
+    
     print("Test météo...")
     
-    forecast = get_weather_forecast(days=3)
+    forecast = asyncio.run(get_weather_forecast(days=3))
     print(f"\nActuellement: {forecast['current']['temp']}°C - {forecast['current']['description']}")
     
     print("\nPrévisions:")
@@ -0,0 +1,40 @@
+"""
+Exécution des tools synchrones - Pool de threads borné, pour qu'un tool
+lent ou CPU-bound ne bloque pas la boucle d'événements du serveur
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        workers = int(os.getenv("TOOL_EXECUTOR_WORKERS", "4"))
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tool")
+        logger.info(f"Exécuteur des tools synchrones - workers: {workers}")
+    return _executor
+
+async def run_sync(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Exécute une fonction synchrone dans le pool et attend son résultat
+
+    Au-delà de TOOL_EXECUTOR_WORKERS appels simultanés, les suivants
+    attendent un thread libre sans bloquer les tools asynchrones.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
+
+def shutdown_executor():
+    """Arrête le pool (arrêt du serveur)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
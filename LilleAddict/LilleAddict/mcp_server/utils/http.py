@@ -0,0 +1,44 @@
+"""
+Utilitaires HTTP - Client httpx asynchrone partagé par les tools
+(pool de connexions, ouvert et fermé par le lifespan du serveur)
+"""
+
+from typing import Optional
+import httpx
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Client partagé des tools (créé au premier appel)
+
+    Configuration par variables d'environnement:
+    - TOOLS_HTTP_TIMEOUT: timeout par défaut des requêtes en s (défaut 10)
+    - TOOLS_HTTP_MAX_CONNECTIONS: connexions simultanées max (défaut 20)
+    - TOOLS_HTTP_MAX_KEEPALIVE: connexions gardées ouvertes (défaut 10)
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        limits = httpx.Limits(
+            max_connections=int(os.getenv("TOOLS_HTTP_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("TOOLS_HTTP_MAX_KEEPALIVE", "10"))
+        )
+        _client = httpx.AsyncClient(
+            timeout=float(os.getenv("TOOLS_HTTP_TIMEOUT", "10")),
+            limits=limits,
+            follow_redirects=True,
+            headers={"User-Agent": "LilleAddictBot/1.0"}
+        )
+        logger.info(f"Client HTTP des tools - max_connections: {limits.max_connections}")
+    return _client
+
+async def close_http_client():
+    """Ferme le client partagé (arrêt du serveur)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,155 @@
+"""
+Utilitaires cache HTTP - Pages scrapées gardées sur disque avec leurs
+validateurs (ETag / Last-Modified) et revalidées par requêtes conditionnelles
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+import httpx
+
+from utils.http import get_http_client
+from utils.executor import run_sync
+from utils.metrics import HTTP_CACHE_RESPONSES, PAGE_PARSES
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CachedPage:
+    url: str
+    content: bytes
+    digest: str         # Empreinte du contenu (réutilisation du parsing)
+    from_cache: bool    # True si le contenu vient du disque (304 ou site injoignable)
+
+class HTTPCache:
+    """
+    Cache HTTP sur disque: une page par fichier (métadonnées JSON sur la
+    première ligne, puis le contenu). Chaque lecture envoie une requête
+    conditionnelle; un 304 ne coûte ni téléchargement ni parsing. Une page
+    sans ETag ni Last-Modified est aussi gardée (copie de secours si le
+    site devient injoignable) mais retéléchargée à chaque lecture.
+    """
+
+    def __init__(self, directory: str = None, max_parsed: int = None, http_client: httpx.AsyncClient = None):
+        self.directory = Path(directory or os.getenv(
+            "SCRAPING_CACHE_DIR",
+            os.path.join(tempfile.gettempdir(), "lilleaddict-http-cache")
+        ))
+
+        # Résultats de parsing en mémoire: (parseur, URL) -> (empreinte, résultat)
+        self.max_parsed = max_parsed or int(os.getenv("SCRAPING_CACHE_MAX_PARSED", "32"))
+        self._parsed: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+
+        # Client HTTP (défaut: client partagé des tools)
+        self._http_client = http_client
+
+    def _path(self, url: str) -> Path:
+        return self.directory / (hashlib.sha256(url.encode("utf-8")).hexdigest()[:32] + ".cache")
+
+    def _load(self, url: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """Métadonnées et contenu en cache, None si absent ou illisible (corrompu, tronqué)"""
+        try:
+            raw = self._path(url).read_bytes()
+            header, _, content = raw.partition(b"\n")
+            meta = json.loads(header)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(meta, dict) or meta.get("url") != url:
+            return None
+        if meta.get("digest") != hashlib.sha256(content).hexdigest():
+            logger.warning(f"Cache HTTP corrompu pour {url}, ignoré")
+            return None
+        return meta, content
+
+    def _store(self, url: str, meta: Dict[str, Any], content: bytes):
+        """Écriture atomique (fichier temporaire puis renommage): l'ancienne copie reste intacte en cas d'échec"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(url)
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            temporary.write_bytes(json.dumps(meta).encode("utf-8") + b"\n" + content)
+            os.replace(temporary, path)
+        except OSError:
+            temporary.unlink(missing_ok=True)
+            raise
+
+    async def fetch(self, url: str) -> CachedPage:
+        """
+        Récupère une page, revalidée auprès du serveur si elle est en cache
+
+        Si le site est injoignable, la copie en cache est renvoyée; sans
+        copie, l'erreur httpx est propagée.
+        """
+        cached = await run_sync(self._load, url)
+
+        headers = {}
+        if cached is not None:
+            meta, _ = cached
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            response = await (self._http_client or get_http_client()).get(url, headers=headers)
+            if response.status_code == 304 and cached is not None:
+                HTTP_CACHE_RESPONSES.labels("not_modified").inc()
+                return CachedPage(url, cached[1], cached[0]["digest"], from_cache=True)
+            response.raise_for_status()
+
+        except httpx.HTTPError as e:
+            if cached is None:
+                raise
+            logger.warning(f"{url} injoignable ({str(e) or type(e).__name__}), copie en cache utilisée")
+            HTTP_CACHE_RESPONSES.labels("stale").inc()
+            return CachedPage(url, cached[1], cached[0]["digest"], from_cache=True)
+
+        content = response.content
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "digest": hashlib.sha256(content).hexdigest(),
+            "fetched_at": time.time()
+        }
+
+        try:
+            await run_sync(self._store, url, meta, content)
+        except OSError as e:
+            logger.warning(f"Cache HTTP non écrit pour {url}: {str(e)}")
+
+        HTTP_CACHE_RESPONSES.labels("fetched").inc()
+        return CachedPage(url, content, meta["digest"], from_cache=False)
+
+    async def fetch_parsed(self, url: str, parse: Callable[[bytes, str], Any]) -> Any:
+        """
+        Récupère une page et la parse avec parse(contenu, url), exécuté
+        dans le pool des tools. Un contenu inchangé réutilise le résultat
+        précédent sans re-parser: il est partagé, ne pas le modifier.
+        """
+        page = await self.fetch(url)
+        key = f"{parse.__module__}.{parse.__qualname__}:{url}"
+
+        memo = self._parsed.get(key)
+        if memo is not None and memo[0] == page.digest:
+            self._parsed.move_to_end(key)
+            PAGE_PARSES.labels("reused").inc()
+            return memo[1]
+
+        result = await run_sync(parse, page.content, url)
+        PAGE_PARSES.labels("parsed").inc()
+
+        self._parsed[key] = (page.digest, result)
+        self._parsed.move_to_end(key)
+        while len(self._parsed) > self.max_parsed:
+            self._parsed.popitem(last=False)
+
+        return result
@@ -0,0 +1,46 @@
+"""
+Utilitaires métriques - Métriques Prometheus du serveur MCP
+"""
+
+from prometheus_client import Counter, Histogram, CONTENT_TYPE_LATEST, generate_latest
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "lilleaddict_mcp_http_request_duration_seconds",
+    "Durée des requêtes HTTP par route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+
+TOOL_DURATION = Histogram(
+    "lilleaddict_mcp_server_tool_duration_seconds",
+    "Durée d'exécution des tools",
+    ["tool"],
+    buckets=LATENCY_BUCKETS
+)
+TOOL_CALLS = Counter(
+    "lilleaddict_mcp_server_tool_calls_total",
+    "Exécutions des tools par résultat (success, error)",
+    ["tool", "outcome"]
+)
+
+HTTP_CACHE_RESPONSES = Counter(
+    "lilleaddict_mcp_http_cache_responses_total",
+    "Pages scrapées par provenance (fetched, not_modified, stale)",
+    ["outcome"]
+)
+PAGE_PARSES = Counter(
+    "lilleaddict_mcp_page_parses_total",
+    "Parsing des pages scrapées (parsed, reused si contenu inchangé)",
+    ["outcome"]
+)
+
+def observe_tool(name: str, duration: float, success: bool):
+    """Durée et succès/erreur d'une exécution de tool (route dédiée ou batch)"""
+    TOOL_DURATION.labels(name).observe(duration)
+    TOOL_CALLS.labels(name, "success" if success else "error").inc()
+
+def metrics_payload():
+    """Exposition au format texte Prometheus: (contenu, content-type)"""
+    return generate_latest(), CONTENT_TYPE_LATEST